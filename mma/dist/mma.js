@@ -1,6 +1,6 @@
 async function loadCards() {
     try {
-        const response = await fetch('./db/cards.json');
+        const response = await fetch('./db/cards-index.json');
         const data = await response.json();
         displayTopRated(data.cards);
         displayRecapCards(data.cards);
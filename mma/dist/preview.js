@@ -3,9 +3,8 @@ async function loadPreviewHeader() {
         const pageUrl = window.location.pathname;
         const filename = pageUrl.split('/').pop() ?? '';
         const cardId = filename.replace('.html', '');
-        const response = await fetch('../cards.json');
-        const data = await response.json();
-        const card = data.cards.find(c => c.id === cardId);
+        const response = await fetch(`../cards/${cardId}.json`);
+        const card = response.ok ? await response.json() : undefined;
         if (card) {
             const titleElement = document.querySelector('h1');
             if (titleElement) {
@@ -0,0 +1,164 @@
+"""
+Archive — record network exchanges to a directory and replay them offline.
+
+In record mode every exchange that actually goes out (Scraper requests,
+Selenium page loads, the fightodds GraphQL POST) is saved as it completes.
+In replay mode the same exchanges are served back from the directory, and
+nothing touches the network. Runs on replayed data are deterministic, so
+the parsing and merging stages can be benchmarked, profiled and
+regression-tested on real pages.
+
+An exchange is keyed by method, URL and request body. Layout:
+
+    <dir>/index.json             — {key: {method, url, status, headers, body}}
+    <dir>/bodies/<sha256>.gz     — gzip-compressed response body, by content hash
+
+Identical bodies are stored once. Only the response headers the scrapers
+read are kept (constants.ARCHIVE_HEADERS). When the same exchange is
+recorded twice, the later response wins.
+
+Public API:
+    Archive(directory, mode)     — mode: 'record' | 'replay'
+    Archive.replaying
+    Archive.replay(method, url, body=None)        → requests.Response
+    Archive.record(method, url, body, response)   — response: requests.Response
+    Archive.record_content(method, url, body, content)  — bodies with no HTTP response (driver pages)
+    Archive.close()              — write the index (record mode)
+    Archive.exchanges()          → iterator of (method, url, status, content)
+    ReplayMiss
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from scraping import constants
+
+_INDEX_FILE = 'index.json'
+_BODIES_DIR = 'bodies'
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when an exchange was never recorded."""
+
+
+def _exchange_key(method: str, url: str, body: str | None) -> str:
+    digest = hashlib.sha256((body or '').encode('utf-8')).hexdigest()[:16]
+    return f'{method} {url} {digest}' if body else f'{method} {url}'
+
+
+class Archive:
+    def __init__(self, directory: str, mode: str = 'replay'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"unknown archive mode {mode!r}; expected 'record' or 'replay'")
+        self.directory = directory
+        self.mode = mode
+        self._index: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        index_path = os.path.join(directory, _INDEX_FILE)
+        if mode == 'replay':
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                raise FileNotFoundError(f'no recorded archive at {directory} (missing {_INDEX_FILE})')
+        else:
+            os.makedirs(os.path.join(directory, _BODIES_DIR), exist_ok=True)
+            # Re-recording into an existing archive adds to it
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    # ------------------------------------------------------------------
+    # Replay / record
+    # ------------------------------------------------------------------
+
+    def replay(self, method: str, url: str, body: str | None = None):
+        """Return the recorded response for this exchange, as a requests.Response."""
+        import requests
+        import requests.utils
+
+        entry = self._index.get(_exchange_key(method, url, body))
+        if entry is None:
+            raise ReplayMiss(f'{method} {url} was not recorded in {self.directory}')
+        with gzip.open(self._body_path(entry['body']), 'rb') as f:
+            content = f.read()
+
+        resp = requests.Response()
+        resp.status_code = entry['status']
+        resp.headers.update(entry['headers'])
+        resp.url = url
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp._content = content
+        return resp
+
+    def record(self, method: str, url: str, body: str | None, response) -> None:
+        """Save one completed HTTP exchange."""
+        headers = {
+            name: response.headers[name]
+            for name in constants.ARCHIVE_HEADERS
+            if name in response.headers
+        }
+        self._store(method, url, body, response.status_code, headers, response.content)
+
+    def record_content(self, method: str, url: str, body: str | None, content: bytes) -> None:
+        """Save a body obtained without an HTTP response, e.g. a Selenium page load."""
+        self._store(method, url, body, 200, {}, content)
+
+    def exchanges(self):
+        """Yield every recorded exchange as (method, url, status, content), sorted by key."""
+        for key in sorted(self._index):
+            entry = self._index[key]
+            with gzip.open(self._body_path(entry['body']), 'rb') as f:
+                yield entry['method'], entry['url'], entry['status'], f.read()
+
+    def close(self) -> None:
+        """Write the index to disk; a no-op in replay mode."""
+        if self.replaying:
+            return
+        index_path = os.path.join(self.directory, _INDEX_FILE)
+        tmp_path = f'{index_path}.{os.getpid()}.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, index_path)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _store(
+        self,
+        method: str,
+        url: str,
+        body: str | None,
+        status: int,
+        headers: dict,
+        content: bytes,
+    ) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            tmp_path = f'{body_path}.{threading.get_ident()}.tmp'
+            # mtime=0 keeps archives byte-identical across recordings
+            with gzip.GzipFile(tmp_path, 'wb', mtime=0) as f:
+                f.write(content)
+            os.replace(tmp_path, body_path)
+
+        with self._lock:
+            self._index[_exchange_key(method, url, body)] = {
+                'method':  method,
+                'url':     url,
+                'status':  status,
+                'headers': headers,
+                'body':    digest,
+            }
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, _BODIES_DIR, f'{digest}.gz')
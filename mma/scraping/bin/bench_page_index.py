@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for Wikipedia target lookup — the one-pass page index
+against the per-lookup tree searches it replaced.
+
+Every page is parsed once up front (not timed). Each round then resolves
+everything the parsers need from that page:
+
+  • fighter pages — the fight-by-fight record table and its header
+  • event pages   — the infobox (read twice: event name and location) and
+                    the fight-card table
+
+'legacy' runs the earlier searches (an h2 scan with a sibling walk and a
+document-wide wikitable fallback, one soup.find per infobox read) and
+'index' builds a _PageIndex and reads its targets. Both must resolve the
+same elements, or the benchmark stops.
+
+Usage:
+    python3 -m scraping.bin.bench_page_index PAGE_OR_DIR [...]
+    python3 -m scraping.bin.bench_page_index ./pages --repeat 50 --targeted
+
+Pages may be plain or gzip-compressed HTML files; directories are read
+recursively. A page with a 'toccolours' table counts as an event page.
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+
+from scraping import constants
+from scraping import scraper
+from scraping import wikipedia
+
+
+def _legacy_record_table(soup):
+    content = soup.find(id='mw-content-text') or soup
+    for h2 in content.find_all('h2'):
+        if 'mixed martial arts record' not in h2.get_text(strip=True).lower():
+            continue
+        sibling = h2.parent.find_next_sibling()
+        while sibling:
+            if sibling.name == 'table' and 'wikitable' in (sibling.get('class') or []):
+                header = sibling.find('tr')
+                if header:
+                    cols = [c.get_text(strip=True).lower() for c in header.find_all(['th', 'td'])]
+                    if cols and cols[0] == 'res.':
+                        return sibling
+            if sibling.name == 'div' and 'mw-heading2' in (sibling.get('class') or []):
+                break
+            sibling = sibling.find_next_sibling()
+        break
+    for table in content.find_all('table', class_='wikitable'):
+        header = table.find('tr')
+        if header:
+            cols = [c.get_text(strip=True).lower() for c in header.find_all(['th', 'td'])]
+            if cols and cols[0] == 'res.':
+                return table
+    return None
+
+
+def _legacy_fighter(soup):
+    table = _legacy_record_table(soup)
+    if table is None:
+        return None
+    header = [c.get_text(strip=True).lower() for c in table.find('tr').find_all(['th', 'td'])]
+    return table, tuple(header)
+
+
+def _index_fighter(soup):
+    page = wikipedia._PageIndex(soup)
+    table = page.record_table
+    if table is None:
+        return None
+    return table, page.signature(table)
+
+
+def _legacy_event(soup):
+    name_box = soup.find('table', class_='infobox')
+    location_box = soup.find('table', class_='infobox')
+    return name_box, location_box, soup.find('table', class_='toccolours')
+
+
+def _index_event(soup):
+    page = wikipedia._PageIndex(soup)
+    return page.infobox, page.infobox, page.fight_card
+
+
+def _read_pages(paths: list[str]) -> list[tuple[str, bytes]]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+    pages = []
+    for path in files:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            pages.append((path, f.read()))
+    return pages
+
+
+def _time_per_page(func, soups, repeat: int) -> float:
+    """Median over `repeat` rounds of the mean µs per page."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for soup in soups:
+            func(soup)
+        rounds.append((time.perf_counter() - start) / len(soups) * 1e6)
+    return statistics.median(rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Page-index vs legacy lookup micro-benchmark')
+    parser.add_argument('paths', nargs='+', metavar='PAGE_OR_DIR', help='Saved Wikipedia pages')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed rounds (default: 20)')
+    parser.add_argument('--parser', choices=constants.PARSER_BACKENDS, default=constants.HTML_PARSER,
+                        help='HTML parser backend used to build the trees (default: fastest installed)')
+    parser.add_argument('--targeted', action='store_true',
+                        help="Parse only the scrapers' page regions, as the scrapers do by default")
+    args = parser.parse_args()
+
+    backend = scraper.resolve_parser(args.parser)
+    groups = {'fighter': [], 'event': []}
+    for path, markup in _read_pages(args.paths):
+        kind = 'event' if b'toccolours' in markup else 'fighter'
+        regions = wikipedia._EVENT_REGIONS if kind == 'event' else wikipedia._FIGHTER_REGIONS
+        groups[kind].append(scraper.parse_html(markup, backend, regions if args.targeted else None))
+
+    funcs = {'fighter': (_legacy_fighter, _index_fighter), 'event': (_legacy_event, _index_event)}
+    print(f'{"pages":<8} {"count":>6} {"legacy µs":>10} {"index µs":>10} {"speedup":>8}')
+    for kind, soups in groups.items():
+        if not soups:
+            continue
+        legacy, index = funcs[kind]
+        for soup in soups:
+            if legacy(soup) != index(soup):
+                sys.exit(f'{kind} page: index and legacy lookups disagree')
+        legacy_us = _time_per_page(legacy, soups, args.repeat)
+        index_us = _time_per_page(index, soups, args.repeat)
+        print(f'{kind:<8} {len(soups):>6} {legacy_us:>10.1f} {index_us:>10.1f} {legacy_us / index_us:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for scraping_main — import time per CLI mode.
+
+Each mode is measured in fresh interpreters: the time to import
+scraping_main plus the modules that mode loads (interpreter startup itself
+is not counted). The package's bytecode is compiled first, so a module
+edited since the last run is timed importing rather than compiling.
+
+The median over --runs is checked against the mode's budget, and modes
+that must stay light are checked for heavy modules (requests, bs4, ...)
+that should never be imported on their path.
+
+Usage:
+    python3 -m scraping.bin.bench_startup
+    python3 -m scraping.bin.bench_startup --runs 20 --mode fightodds
+
+Exits non-zero when a mode is over budget or imports a forbidden module.
+"""
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_EVENT_STACK = ('scraping.cache', 'scraping.scraper', 'scraping.wikipedia')
+
+# mode → (modules imported on that path, budget in ms, modules it must not load)
+_MODES = {
+    'fightodds': (('scraping.fightodds',), 40.0, ('requests', 'bs4', 'asyncio', 'selenium', 'cloudscraper')),
+    'preview':   (_EVENT_STACK + ('scraping.preview',), 150.0, ('selenium',)),
+    'recap':     (_EVENT_STACK + ('scraping.recap',), 150.0, ('selenium',)),
+    'research':  (_EVENT_STACK + ('scraping.research',), 150.0, ('selenium',)),
+}
+
+_PROBE = '''
+import importlib, json, sys, time
+t = time.perf_counter()
+importlib.import_module('scraping.bin.scraping_main')
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - t
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {forbidden!r} if m in sys.modules]}}))
+'''
+
+
+def _probe(modules: tuple[str, ...], forbidden: tuple[str, ...]) -> dict:
+    code = _PROBE.format(modules=modules, forbidden=forbidden)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time benchmark for scraping_main')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per mode (default: 10)')
+    parser.add_argument('--mode', choices=sorted(_MODES), action='append',
+                        help='Mode to measure; repeatable (default: all)')
+    args = parser.parse_args()
+
+    # Fresh .pyc files first: with PYTHONDONTWRITEBYTECODE set, every probe would recompile edited modules
+    compileall.compile_dir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), quiet=1)
+
+    failed = False
+    print(f'{"mode":<10} {"median ms":>10} {"budget ms":>10}  status')
+    for mode in args.mode or _MODES:
+        modules, budget, forbidden = _MODES[mode]
+        samples = [_probe(modules, forbidden) for _ in range(args.runs)]
+        median = statistics.median(s['ms'] for s in samples)
+        loaded = sorted({m for s in samples for m in s['loaded']})
+
+        status = 'ok'
+        if median > budget:
+            status = 'OVER BUDGET'
+        if loaded:
+            status = f'loads {", ".join(loaded)}'
+        failed = failed or status != 'ok'
+        print(f'{mode:<10} {median:>10.1f} {budget:>10.1f}  {status}')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
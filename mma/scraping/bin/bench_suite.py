@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the parsers and cards.json storage over a synthetic corpus.
+
+The corpus (scraping/corpus/, gzip-compressed) holds:
+
+    wikipedia_event/    — Wikipedia event articles
+    wikipedia_fighter/  — Wikipedia fighter articles
+    sherdog_event/      — Sherdog event pages
+    sherdog_fighter/    — Sherdog fighter pages
+    fightodds/          — fightodds.io GraphQL responses, named <card-id>.json.gz
+    cards.json.gz       — a cards.json snapshot the odds are written into
+
+The checked-in pages are synthetic: they were built offline in each site's
+markup (as the parsers read it) from the cards, fighters and odds in
+db/cards.json, with filler prose, navigation and scripts standing in for
+the rest of a real page. Timings and the regression thresholds therefore
+measure that markup, not the live sites'; --import-archive adds pages from
+real --record runs.
+
+Every case runs over all of its corpus items per round. Input is prepared
+up front and not timed; parser cases get trees built the way the scrapers
+build them (--parser, region-only unless --full-parse). For each case the
+suite reports the best and median per-item time over --rounds, throughput
+in items and input MB per second (from the best round), and the peak
+traced memory of one round.
+
+--json PATH saves the results, and --baseline PATH compares a run against
+saved results on best time, the figure least disturbed by other load on the
+machine: a case whose best time or peak memory grew by more than
+--threshold (a fraction, default 0.15) is a regression, and the suite
+exits non-zero. Runs are only comparable on the same machine, Python,
+parser backend and JSON backend.
+
+The codec cases time JSON alone on the cards.json snapshot (decode,
+indented encode, and the streaming writer, whose peak memory is the point),
+so serialization is measured apart from the storage cases that include it.
+--codec json runs everything on stdlib json instead of orjson, to see what
+the faster codec is worth.
+
+--import-archive DIR copies the pages and odds responses of a --record
+archive into the corpus, so it can be refreshed from real runs. Imported
+odds responses are numbered; rename one after its card ID to include it
+in the update_odds_in_json case.
+
+Usage:
+    python3 -m scraping.bin.bench_suite
+    python3 -m scraping.bin.bench_suite --case wikipedia --rounds 30
+    python3 -m scraping.bin.bench_suite --case codec --case cards --codec json
+    python3 -m scraping.bin.bench_suite --json bench.json
+    python3 -m scraping.bin.bench_suite --baseline bench.json
+    python3 -m scraping.bin.bench_suite --import-archive runs/ufc-329
+"""
+import argparse
+import contextlib
+import copy
+import gc
+import gzip
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from scraping import constants
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'corpus')
+
+_DEFAULT_THRESHOLD = 0.15
+
+
+@dataclass
+class _Case:
+    name: str
+    run: Callable[[Any], Any]
+    items: list
+    bytes: int  # input bytes per round; 0 when the input is not a document
+
+
+# ----------------------------------------------------------------------
+# Corpus
+# ----------------------------------------------------------------------
+
+def _read_corpus(kind: str) -> list[tuple[str, bytes]]:
+    directory = os.path.join(CORPUS_DIR, kind)
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), 'rb') as f:
+            files.append((name.split('.', 1)[0], f.read()))
+    return files
+
+
+def _build_cases(backend: str, targeted: bool, workdir: str) -> list[_Case]:
+    from scraping import card_store
+    from scraping import codec
+    from scraping import fightodds
+    from scraping import scraper
+    from scraping import sherdog
+    from scraping import wikipedia
+    from scraping.card_db import CardDatabase
+    from scraping.card_store import CardStore
+    from scraping.models import Card
+
+    def trees(kind: str, regions: str) -> tuple[list, int]:
+        pages = _read_corpus(kind)
+        soups = [scraper.parse_html(markup, backend, regions if targeted else None) for _, markup in pages]
+        return soups, sum(len(markup) for _, markup in pages)
+
+    ws = wikipedia.WikipediaEventScraper(None)
+    ss = sherdog.SherdogEventScraper(None)
+    cases = []
+
+    html_pages = [
+        (markup, regions if targeted else None)
+        for kind, regions in (
+            ('wikipedia_event', wikipedia._EVENT_REGIONS),
+            ('wikipedia_fighter', wikipedia._FIGHTER_REGIONS),
+            ('sherdog_event', None),
+            ('sherdog_fighter', sherdog._FIGHTER_REGIONS),
+        )
+        for _, markup in _read_corpus(kind)
+    ]
+    cases.append(_Case(
+        'html.parse',
+        lambda page: scraper.parse_html(page[0], backend, page[1]),
+        html_pages,
+        sum(len(markup) for markup, _ in html_pages),
+    ))
+
+    soups, size = trees('wikipedia_event', wikipedia._EVENT_REGIONS)
+    cases.append(_Case(
+        'wikipedia.parse_fights',
+        lambda soup: ws._parse_fights(wikipedia._PageIndex(soup), mode='recap', research=False),
+        soups, size,
+    ))
+    soups, size = trees('wikipedia_fighter', wikipedia._FIGHTER_REGIONS)
+    cases.append(_Case(
+        'wikipedia.parse_fighter_profile',
+        lambda soup: ws._parse_fighter_profile(wikipedia._PageIndex(soup)),
+        soups, size,
+    ))
+    soups, size = trees('sherdog_event', None)
+    cases.append(_Case('sherdog.parse_event', lambda soup: ss._parse_event(soup, 'recap'), soups, size))
+    soups, size = trees('sherdog_fighter', sherdog._FIGHTER_REGIONS)
+    cases.append(_Case(
+        'sherdog.parse_fighter',
+        lambda soup: (ss._parse_record(soup), ss._parse_fight_table(soup)),
+        soups, size,
+    ))
+
+    responses = _read_corpus('fightodds')
+    cases.append(_Case(
+        'fightodds.parse_offers',
+        lambda raw: fightodds._parse_offers(json.loads(raw)['data']['eventOfferTable'], 0),
+        [raw for _, raw in responses],
+        sum(len(raw) for _, raw in responses),
+    ))
+
+    cards_path = os.path.join(workdir, 'cards.json')
+    with gzip.open(os.path.join(CORPUS_DIR, 'cards.json.gz'), 'rb') as src, open(cards_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    cards_size = os.path.getsize(cards_path)
+    # Only responses named after a card in the snapshot have somewhere to go
+    store = CardStore(cards_path)
+    card_ids = {card['id'] for card in store.cards()}
+    offers = [
+        (card_id, fightodds._parse_offers(json.loads(raw)['data']['eventOfferTable'], 0))
+        for card_id, raw in responses
+        if card_id in card_ids
+    ]
+    cases.append(_Case(
+        'fightodds.update_odds_in_json',
+        lambda item: fightodds.update_odds_in_json(item[0], item[1], CardStore(cards_path)),
+        offers,
+        cards_size * len(offers),
+    ))
+    all_fights = [Card.from_json(copy.deepcopy(card)).fights or {} for card in store.cards()]
+    cases.append(_Case('fightodds.compute_best_odds', fightodds.compute_best_odds, all_fights, 0))
+
+    # Reading cards into models and writing them back, over the whole snapshot
+    cards = store.cards()
+    cases.append(_Case('models.card_from_json', Card.from_json, cards, cards_size))
+    cases.append(_Case('models.card_to_json', Card.to_json, [Card.from_json(card) for card in cards], cards_size))
+
+    cases.append(_Case('cards.load', CardStore, [cards_path], cards_size))
+    dump_path = os.path.join(workdir, 'cards-dump.json')
+    shutil.copyfile(cards_path, dump_path)
+    # Serialize and write unconditionally; save() itself would skip an unchanged store
+    cases.append(_Case(
+        'cards.dump',
+        lambda store: card_store.write_cards_json(dump_path, store._dumps()),
+        [CardStore(dump_path)],
+        cards_size,
+    ))
+
+    with open(cards_path, 'rb') as f:
+        cards_bytes = f.read()
+    cards_text = cards_bytes.decode('utf-8')
+    document = codec.loads(cards_bytes)
+    stream_path = os.path.join(workdir, 'cards-stream.json')
+
+    def stream(doc):
+        with open(stream_path, 'wb') as f:
+            codec.write_stream(f, doc, indent=2)
+
+    cases.append(_Case('codec.loads', codec.loads, [cards_bytes], cards_size))
+    cases.append(_Case('codec.dumps', lambda doc: codec.dumpb(doc, indent=2), [document], cards_size))
+    cases.append(_Case('codec.write_stream', stream, [document], cards_size))
+
+    # No cards.json of its own, so opening it imports nothing; the import case fills it
+    database = CardDatabase(os.path.join(workdir, 'cards.sqlite3'), os.path.join(workdir, 'carddb-export.json'))
+    cases.append(_Case('carddb.import', database._import, [cards_text], cards_size))
+    cases.append(_Case('carddb.export', lambda db: db.export(), [database], cards_size))
+    export_path = os.path.join(workdir, 'carddb-stream.json')
+    cases.append(_Case('carddb.export_to', lambda db: db.export_to(export_path), [database], cards_size))
+
+    return [case for case in cases if case.items]
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+
+def _run_round(case: _Case) -> float:
+    start = time.perf_counter()
+    for item in case.items:
+        case.run(item)
+    return time.perf_counter() - start
+
+
+def _measure(case: _Case, rounds: int) -> dict:
+    # Like timeit: no collector pauses inside the timed rounds
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        _run_round(case)  # warm-up
+        gc.collect()
+        gc.disable()
+        try:
+            times = [_run_round(case) for _ in range(rounds)]
+        finally:
+            gc.enable()
+
+        tracemalloc.start()
+        try:
+            _run_round(case)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'items':       len(case.items),
+        'best_us':     round(best / len(case.items) * 1e6, 1),
+        'median_us':   round(statistics.median(times) / len(case.items) * 1e6, 1),
+        'items_per_s': round(len(case.items) / best, 1),
+        'mb_per_s':    round(case.bytes / best / 1e6, 2) if case.bytes else None,
+        'peak_kb':     peak // 1024,
+    }
+
+
+def _compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases that got slower or hungrier than baseline by more than threshold."""
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ('best_us', 'peak_kb'):
+            if before[metric] and now[metric] > before[metric] * (1 + threshold):
+                regressions.append(f'{name}: {metric} {before[metric]} → {now[metric]}')
+    return regressions
+
+
+# ----------------------------------------------------------------------
+# Corpus import
+# ----------------------------------------------------------------------
+
+def _import_archive(directory: str) -> int:
+    """Copy the pages and odds responses of a --record archive into the corpus."""
+    from scraping.archive import Archive
+
+    imported = 0
+    for method, url, status, content in Archive(directory, 'replay').exchanges():
+        parts = urlsplit(url)
+        if status != 200:
+            continue
+        if method == 'POST' and url == constants.FIGHTODDS_GQL:
+            kind, name = 'fightodds', f'odds-{imported}'
+        elif 'wikipedia.org' in parts.netloc and (parts.path.startswith('/wiki/') or 'oldid=' in parts.query):
+            kind = 'wikipedia_event' if b'toccolours' in content else 'wikipedia_fighter'
+            match = re.search(r'title=([^&]+)', parts.query)
+            name = unquote(match.group(1) if match else parts.path.rsplit('/', 1)[-1])
+        elif 'sherdog.com' in parts.netloc and parts.path.startswith(('/events/', '/fighter/')):
+            kind = 'sherdog_event' if parts.path.startswith('/events/') else 'sherdog_fighter'
+            name = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        else:
+            continue
+        extension = 'json' if kind == 'fightodds' else 'html'
+        os.makedirs(os.path.join(CORPUS_DIR, kind), exist_ok=True)
+        path = os.path.join(CORPUS_DIR, kind, f'{re.sub(r"[^A-Za-z0-9_.-]+", "_", name)}.{extension}.gz')
+        with gzip.GzipFile(path, 'wb', mtime=0) as f:
+            f.write(content)
+        print(f'{kind:<18} {os.path.basename(path)}')
+        imported += 1
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parser and storage benchmarks over the synthetic corpus')
+    parser.add_argument('--rounds', type=int, default=15, help='Timed rounds per case (default: 15)')
+    parser.add_argument('--case', action='append', metavar='PREFIX',
+                        help='Run only cases whose name starts with PREFIX; repeatable')
+    parser.add_argument('--parser', choices=constants.PARSER_BACKENDS, default=constants.HTML_PARSER,
+                        help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--full-parse', dest='full_parse', action='store_true',
+                        help='Build whole page trees instead of the regions each scraper reads')
+    parser.add_argument('--codec', choices=('orjson', 'json'),
+                        help='JSON backend (default: orjson when installed)')
+    parser.add_argument('--json', metavar='PATH', help='Save the results as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against results saved with --json')
+    parser.add_argument('--threshold', type=float, default=_DEFAULT_THRESHOLD,
+                        help=f'Allowed fractional growth over --baseline (default: {_DEFAULT_THRESHOLD})')
+    parser.add_argument('--import-archive', dest='import_archive', metavar='DIR',
+                        help='Add the pages of a --record archive to the corpus and exit')
+    args = parser.parse_args()
+
+    if args.import_archive:
+        print(f'Imported {_import_archive(args.import_archive)} items into {CORPUS_DIR}')
+        return
+
+    from scraping import codec
+    from scraping import scraper
+
+    if args.codec:
+        codec.use_backend(args.codec)
+    backend = scraper.resolve_parser(args.parser)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = _build_cases(backend, not args.full_parse, workdir)
+        if args.case:
+            cases = [c for c in cases if c.name.startswith(tuple(args.case))]
+        print(f'{"case":<34} {"items":>6} {"best µs":>10} {"median µs":>10} {"items/s":>10} {"MB/s":>8} {"peak KB":>9}')
+        for case in cases:
+            row = results[case.name] = _measure(case, args.rounds)
+            mb = '-' if row['mb_per_s'] is None else f'{row["mb_per_s"]:.2f}'
+            print(f'{case.name:<34} {row["items"]:>6} {row["best_us"]:>10.1f} {row["median_us"]:>10.1f} {row["items_per_s"]:>10.1f} '
+                  f'{mb:>8} {row["peak_kb"]:>9,}')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'python':   platform.python_version(),
+                    'machine':  platform.machine(),
+                    'parser':   backend,
+                    'codec':    codec.BACKEND,
+                    'targeted': not args.full_parse,
+                    'rounds':   args.rounds,
+                },
+                'cases': results,
+            }, f, indent=2)
+        print(f'Results written to {args.json}')
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = _compare(results, json.load(f)['cases'], args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions beyond {args.threshold:.0%} of {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Publish the site's card files from cards.json (or the card database).
+
+Writes, minified and with .gz / .br siblings (see site_data.py):
+
+    db/cards.min.json     — the whole of cards.json
+    db/cards-index.json   — every card's summary fields
+    db/cards/<id>.json    — one file per card
+
+and removes the files of cards that are gone. --preview, --recap and
+--fightodds keep them current on their own; run this after editing
+cards.json by hand (predictions, ratings) so the pages pick the edit up.
+It ends with a size report: each artifact pretty-printed (as cards.json
+is written) against minified, gzip and brotli.
+
+Usage:
+    python3 -m scraping.bin.build_site_data
+    python3 -m scraping.bin.build_site_data --card-db
+"""
+import argparse
+import contextlib
+import os
+
+from scraping import constants
+from scraping import site_data
+from scraping.card_store import dump_cards_json
+from scraping.card_store import open_cards
+
+
+def _pretty_size(document) -> int:
+    return len(dump_cards_json(document).encode('utf-8'))
+
+
+def _print_report(rows: list[tuple[str, int, dict]]):
+    def fmt(n):
+        return f'{n:,}' if n is not None else '-'
+
+    print(f'\n{"artifact":<22} {"pretty":>10} {"minified":>10} {"gzip":>9} {"brotli":>9} {"gzip/pretty":>12}')
+    for name, pretty, sizes in rows:
+        ratio = f'{sizes["gz"] / pretty:.1%}' if pretty else '-'
+        print(f'{name:<22} {fmt(pretty):>10} {fmt(sizes["json"]):>10} {fmt(sizes["gz"]):>9} {fmt(sizes["br"]):>9} {ratio:>12}')
+    if not site_data._HAS_BROTLI:
+        print('\nbrotli is not installed; no .br files written (pip install brotli)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish cards.min.json, cards-index.json and the per-card JSON files')
+    parser.add_argument('--json', dest='json_path', default=constants.JSON_PATH,
+                        help=f'cards.json to read (default: {constants.JSON_PATH})')
+    parser.add_argument('--card-db', dest='card_db', metavar='PATH', nargs='?', const=constants.CARD_DB_PATH,
+                        help=f'Read cards from the SQLite card database (default path: {constants.CARD_DB_PATH})')
+    parser.add_argument('--index', dest='index_path', default=constants.CARDS_INDEX_PATH,
+                        help=f'Index file to write (default: {constants.CARDS_INDEX_PATH})')
+    parser.add_argument('--shard-dir', dest='shard_dir', default=constants.CARDS_SHARD_DIR,
+                        help=f'Directory of per-card files (default: {constants.CARDS_SHARD_DIR})')
+    args = parser.parse_args()
+
+    with contextlib.closing(open_cards(args.json_path, args.card_db)) as store:
+        written = site_data.write_site_data(store, None, args.index_path, args.shard_dir)
+        cards = store.cards()
+    print(f'{len(cards)} cards; {written} files written')
+
+    shard_totals = {'json': 0, 'gz': 0, 'br': 0}
+    for card in cards:
+        sizes = site_data.artifact_sizes(os.path.join(args.shard_dir, f'{card["id"]}.json'))
+        for key in shard_totals:
+            shard_totals[key] = None if shard_totals[key] is None or sizes[key] is None else shard_totals[key] + sizes[key]
+    _print_report([
+        (os.path.basename(args.json_path), os.path.getsize(args.json_path),
+         site_data.artifact_sizes(site_data.minified_path(args.json_path))),
+        (os.path.basename(args.index_path), _pretty_size({'cards': [site_data.card_summary(c) for c in cards]}),
+         site_data.artifact_sizes(args.index_path)),
+        (f'{len(cards)} card files', sum(_pretty_size(c) for c in cards), shard_totals),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Convert every card's odds in cards.json (or the card database) to the column format.
+
+Before the sportsbook registry, odds were keyed by book name and then by
+fighter name. --preview, --recap and --fightodds convert a card's odds
+whenever they rewrite that card. This script converts every remaining card
+in one pass and normalizes the bestOdds platform names to each book's
+canonical name ('BookMaker' → 'Bookmaker'). It then republishes the site
+data and reports how much the odds shrank, measured as minified JSON.
+
+Running it again on a converted file changes nothing.
+
+Usage:
+    python3 -m scraping.bin.migrate_odds
+    python3 -m scraping.bin.migrate_odds --card-db
+"""
+import argparse
+import contextlib
+
+from scraping import codec
+from scraping import constants
+from scraping import sportsbooks
+from scraping.card_store import open_cards
+from scraping.card_store import read_cards_json
+from scraping.models import Card
+from scraping.site_data import write_site_data
+
+
+def _odds_bytes(cards: list[dict]) -> int:
+    return sum(
+        len(codec.dumpb(fight['odds']))
+        for card in cards
+        for fight in (card.get('fights') or {}).values()
+        if fight.get('odds') is not None
+    )
+
+
+def _migrated(card: dict) -> dict:
+    model = Card.from_json(card)
+    for fight in (model.fights or {}).values():
+        best = fight.best_odds
+        book = sportsbooks.book_id(best.platform) if best and best.platform else None
+        if book is not None:
+            best.platform = sportsbooks.book_name(book)
+    return model.to_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert cards.json odds to the column format')
+    parser.add_argument('--json', dest='json_path', default=constants.JSON_PATH,
+                        help=f'cards.json to convert (default: {constants.JSON_PATH})')
+    parser.add_argument('--card-db', dest='card_db', metavar='PATH', nargs='?', const=constants.CARD_DB_PATH,
+                        help=f'Convert through the SQLite card database (default path: {constants.CARD_DB_PATH})')
+    args = parser.parse_args()
+
+    with contextlib.closing(open_cards(args.json_path, args.card_db)) as store:
+        with store.transaction():
+            # Compared with the file rather than the store: the card database converts on import
+            on_disk = codec.loads(read_cards_json(args.json_path) or '{"cards": []}')['cards']
+            previous = {card['id']: card for card in on_disk}
+            converted = 0
+            for card in store.cards():
+                migrated = _migrated(card)
+                if migrated != previous.get(card['id']):
+                    store.put(migrated)
+                    converted += 1
+        written = write_site_data(store)
+        before, after = _odds_bytes(on_disk), _odds_bytes(store.cards())
+
+    print(f'{converted} of {len(previous)} cards converted; {written} site files written')
+    if converted and after:
+        print(f'odds: {before:,} → {after:,} bytes minified ({before / after:.1f}x smaller)')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,50 @@ Usage:
     python3 -m scraping.bin.scraping_main --recap <wikipedia_url> --rating <rating>
     python3 -m scraping.bin.scraping_main --research <wikipedia_url>
     python3 -m scraping.bin.scraping_main --fightodds <event_pk_or_url> --card-id <card_id>
+    python3 -m scraping.bin.scraping_main --fighters <name> [<name> ...]
 
-    Add --driver to any command to use Selenium (Firefox) instead of requests.
+    Re-running --research on a card only refetches fighters who are new or
+    whose Wikipedia page has changed since the last run; --full-refresh
+    refetches everyone.
+
+    Fighter profiles scraped by --research are kept in a store shared across
+    events (./mma/.cache/fighters.sqlite3; --fighter-store PATH), so a fighter
+    already researched for another card is not refetched while their profile
+    is current. --no-fighter-store disables it, and --fighters prints stored
+    profiles by name without scraping anything.
+
+    Add --card-db to --preview, --recap or --fightodds to keep cards, fights,
+    predictions, results and odds in a SQLite database
+    (./mma/.cache/cards.sqlite3; --card-db PATH) and export cards.json from it.
+    cards.json edited by hand since the last export is re-imported first.
+
+    Add --wiki-api to fetch only the needed article sections through the
+    Wikipedia parse API instead of whole rendered pages, and --wiki-batch to
+    fetch every fighter on the card through a few batched API requests.
+
+    Add --driver to any command to use Selenium (Firefox) instead of requests;
+    --driver-pool N sets how many browsers are kept open for concurrent fetches.
+
+    Fetched pages are cached on disk (./mma/.cache/http by default) and
+    revalidated with ETag / Last-Modified once older than --cache-ttl.
+    Add --offline to serve pages only from the cache, or --no-cache to bypass it.
+
+    Requests are paced by a token bucket per host (constants.RATE_LIMITS);
+    override one with --rate-limit HOST=RATE[:BURST], e.g.
+    --rate-limit www.sherdog.com=0.5:1
+
+    Failed requests (connection errors, 429, 5xx) are retried with jittered
+    exponential backoff, up to --retries attempts; a host that keeps failing
+    is skipped for a while instead of stalling the run.
+
+    Add --record DIR to save every network exchange of a run to DIR, and
+    --replay DIR to rerun it later from DIR alone, with no network. Both
+    bypass the page cache so that every exchange is captured or replayed.
+
+    Add --profile to time every stage (fetch, HTTP, parse, scraper methods,
+    cards.json I/O, template rendering) with bytes and peak memory, print a
+    summary table, and write a Chrome trace to --profile PATH
+    (default ./mma/.cache/profile.json).
 
 Examples:
     python3 -m scraping.bin.scraping_main --preview https://en.wikipedia.org/wiki/UFC_329
@@ -20,12 +62,17 @@ Examples:
 import argparse
 from types import SimpleNamespace
 
-from scraping import fightodds
-from scraping import preview
-from scraping import recap
-from scraping import research
-from scraping.scraper import Scraper
-from scraping.wikipedia import WikipediaEventScraper
+from scraping import constants
+
+
+def _parse_rate_limit(value: str) -> tuple[str, tuple[float, int]]:
+    """'www.sherdog.com=0.5:1' → ('www.sherdog.com', (0.5, 1)); burst defaults to 1."""
+    try:
+        host, spec = value.split('=', 1)
+        rate, _, burst = spec.partition(':')
+        return host.strip(), (float(rate), int(burst or 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected HOST=RATE[:BURST], got {value!r}')
 
 
 def main():
@@ -39,36 +86,165 @@ def main():
     mode.add_argument('--recap', metavar='URL', help='Generate recap template from Wikipedia event URL')
     mode.add_argument('--research', metavar='URL', help='Scrape fighter profiles and save research notes to ./mma/notes/')
     mode.add_argument('--fightodds', metavar='EVENT', help='Scrape odds from fightodds.io (event PK or URL)')
+    mode.add_argument('--fighters', metavar='NAME', nargs='+', help='Print stored fighter profiles as JSON')
 
     parser.add_argument('--rating', type=float, help='Event rating 0.0–10.0 (required for --recap)')
     parser.add_argument('--card-id', dest='card_id', help='Card ID in cards.json (required for --fightodds)')
+    parser.add_argument('--card-db', dest='card_db', metavar='PATH', nargs='?', const=constants.CARD_DB_PATH,
+                        help='Write cards through a SQLite database and export cards.json from it '
+                             f'(default path: {constants.CARD_DB_PATH})')
     parser.add_argument('--driver', action='store_true', help='Use Selenium (Firefox) instead of requests')
+    parser.add_argument('--wiki-api', dest='wiki_api', action='store_true',
+                        help='Fetch only the needed Wikipedia sections through the parse API')
+    parser.add_argument('--full-refresh', dest='full_refresh', action='store_true',
+                        help='--research: refetch every fighter, even if their page is unchanged since the last run')
+    parser.add_argument('--fighter-store', dest='fighter_store', default=constants.FIGHTER_STORE_PATH,
+                        help=f'Cross-event fighter profile store (default: {constants.FIGHTER_STORE_PATH})')
+    parser.add_argument('--no-fighter-store', dest='no_fighter_store', action='store_true',
+                        help='--research: neither reuse nor save profiles in the fighter store')
+    parser.add_argument('--wiki-batch', dest='wiki_batch', action='store_true',
+                        help='Fetch all fighter profiles through batched Wikipedia query/parse requests')
+    parser.add_argument('--driver-pool', dest='driver_pool', type=int, default=constants.DRIVER_POOL_SIZE,
+                        help=f'Number of pooled Firefox drivers for --driver (default: {constants.DRIVER_POOL_SIZE})')
+    parser.add_argument('--parser', choices=constants.PARSER_BACKENDS, default=constants.HTML_PARSER,
+                        help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--full-parse', dest='full_parse', action='store_true',
+                        help='Build the whole page tree instead of only the regions each scraper reads')
+    parser.add_argument('--cache-dir', dest='cache_dir', default=constants.CACHE_DIR,
+                        help=f'On-disk page cache directory (default: {constants.CACHE_DIR})')
+    parser.add_argument('--cache-ttl', dest='cache_ttl', type=float, default=constants.CACHE_TTL,
+                        help='Seconds before a cached page is revalidated')
+    parser.add_argument('--offline', action='store_true', help='Serve pages from the cache only; never hit the network')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true', help='Disable the on-disk page cache')
+    parser.add_argument('--rate-limit', dest='rate_limits', metavar='HOST=RATE[:BURST]', action='append',
+                        type=_parse_rate_limit, default=[],
+                        help='Override the request rate (per second) and burst for a host; repeatable')
+    parser.add_argument('--retries', type=int, default=constants.RETRY_MAX_ATTEMPTS,
+                        help=f'Attempts per request before giving up (default: {constants.RETRY_MAX_ATTEMPTS})')
+    archiving = parser.add_mutually_exclusive_group()
+    archiving.add_argument('--record', metavar='DIR', help='Record every network exchange of this run to DIR')
+    archiving.add_argument('--replay', metavar='DIR', help='Serve every exchange from a --record archive; no network')
+    parser.add_argument('--profile', metavar='PATH', nargs='?', const=constants.PROFILE_TRACE_PATH,
+                        help='Print per-stage timings and write a JSON trace '
+                             f'(default path: {constants.PROFILE_TRACE_PATH})')
 
     args = parser.parse_args()
+    if args.offline and args.no_cache:
+        parser.error('--offline requires the cache; drop --no-cache')
+    if args.offline and (args.record or args.replay):
+        parser.error('--offline cannot be combined with --record / --replay')
+    if args.recap and args.rating is None:
+        parser.error('--rating is required when using --recap')
+    if args.fightodds and not args.card_id:
+        parser.error('--card-id is required when using --fightodds')
+    if args.fighters and args.no_fighter_store:
+        parser.error('--fighters reads the fighter store; drop --no-fighter-store')
+
+    if args.fighters:
+        _print_fighters(args.fighters, args.fighter_store)
+        return
+
+    # Backends are imported per mode: --fightodds never loads bs4, the page
+    # scrapers or the cache
+    from scraping import profiling
+    from scraping.archive import Archive
+    from scraping.ratelimit import RateLimiter
+    from scraping.resilience import Resilience
+    from scraping.resilience import RetryPolicy
+
+    archive = None
+    if args.record:
+        archive = Archive(args.record, 'record')
+    elif args.replay:
+        archive = Archive(args.replay, 'replay')
+    rate_limiter = RateLimiter(dict(args.rate_limits))
+    resilience = Resilience(RetryPolicy(max_attempts=max(1, args.retries)))
+
+    if args.profile:
+        profiling.enable()
+    mode = next(name for name in ('preview', 'recap', 'research', 'fightodds') if getattr(args, name))
+
+    try:
+        with profiling.span(f'run.{mode}'):
+            if args.fightodds:
+                from scraping import fightodds
+
+                fightodds.run(SimpleNamespace(event=args.fightodds, card_id=args.card_id, card_db=args.card_db), rate_limiter, resilience, archive)
+            else:
+                _run_event_mode(args, rate_limiter, resilience, archive)
+    finally:
+        if archive is not None:
+            archive.close()
+        if args.profile:
+            profiling.print_summary()
+            profiling.write_trace(args.profile)
+            print(f'Profile trace written to {args.profile}')
+
 
-    http_client = Scraper(use_driver=args.driver)
-    event_scraper = WikipediaEventScraper(http_client)
+def _print_fighters(names: list[str], store_path: str):
+    """Print the stored profiles matching names, as a JSON list."""
+    import json
+
+    from scraping.fighter_store import FighterStore
+
+    store = FighterStore(store_path)
+    try:
+        found = store.find(names=names)
+    finally:
+        store.close()
+    print(json.dumps([stored.profile.to_json() for stored in found], indent=2, ensure_ascii=False))
+    if not found:
+        print(f'No stored profiles for {", ".join(names)} in {store_path}')
+
+
+def _run_event_mode(args, rate_limiter, resilience, archive):
+    """Build the page scraping stack and run --preview, --recap or --research."""
+    from scraping.cache import HttpCache
+    from scraping.scraper import Scraper
+    from scraping.wikipedia import WikipediaEventScraper
+
+    cache = None
+    if not args.no_cache and archive is None:
+        cache = HttpCache(args.cache_dir, ttl=args.cache_ttl, offline=args.offline)
+    http_client = Scraper(
+        use_driver=args.driver,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        resilience=resilience,
+        archive=archive,
+        driver_pool_size=args.driver_pool,
+        parser=args.parser,
+        targeted=not args.full_parse,
+    )
+    event_scraper = WikipediaEventScraper(http_client, use_api=args.wiki_api, batch=args.wiki_batch)
 
     try:
         if args.preview:
-            preview.run(SimpleNamespace(url=args.preview), event_scraper)
+            from scraping import preview
+
+            preview.run(SimpleNamespace(url=args.preview, card_db=args.card_db), event_scraper)
 
         elif args.recap:
-            if args.rating is None:
-                parser.error('--rating is required when using --recap')
-            recap.run(SimpleNamespace(url=args.recap, rating=args.rating), event_scraper)
+            from scraping import recap
 
-        elif args.research:
-            research.run(SimpleNamespace(url=args.research), event_scraper)
+            recap.run(SimpleNamespace(url=args.recap, rating=args.rating, card_db=args.card_db), event_scraper)
 
-        elif args.fightodds:
-            if not args.card_id:
-                parser.error('--card-id is required when using --fightodds')
-            fightodds.run(SimpleNamespace(event=args.fightodds, card_id=args.card_id))
+        elif args.research:
+            from scraping import research
+            from scraping.fighter_store import FighterStore
+
+            # Recording and replaying need every profile fetched, like the page cache
+            store = None
+            if not args.no_fighter_store and archive is None:
+                store = FighterStore(args.fighter_store)
+            try:
+                research.run(SimpleNamespace(url=args.research, full_refresh=args.full_refresh), event_scraper, store)
+            finally:
+                if store is not None:
+                    store.close()
 
     finally:
         http_client.close()
 
-
 if __name__ == '__main__':
     main()
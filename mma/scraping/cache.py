@@ -0,0 +1,192 @@
+"""
+HttpCache — persistent on-disk content cache for Scraper.fetch.
+
+Each entry is keyed by URL and stored as two files under the cache directory:
+
+    <sha256(url)>.body  — raw response bytes
+    <sha256(url)>.json  — metadata: url, etag, last_modified, fetched_at, size
+
+Entries younger than `ttl` seconds are served without touching the network.
+Older entries are revalidated with If-None-Match / If-Modified-Since; a 304
+response refreshes the entry's timestamp and the cached body is reused.
+
+When the total body size exceeds `max_bytes`, the least recently used entries
+are evicted (access time is tracked via the metadata file's mtime).
+
+In offline mode every lookup is served from disk regardless of age, and a
+missing entry raises CacheMiss instead of going to the network.
+
+Public API:
+    HttpCache(cache_dir, ttl, max_bytes, offline)
+    CacheEntry
+    CacheMiss
+"""
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+
+from scraping import constants
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has no cached entry."""
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+    def conditional_headers(self) -> dict:
+        """Return the revalidation headers for this entry (may be empty)."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    def __init__(
+        self,
+        cache_dir: str = constants.CACHE_DIR,
+        ttl: float = constants.CACHE_TTL,
+        max_bytes: int = constants.CACHE_MAX_BYTES,
+        offline: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for url, or None if there is none."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        # Touch the metadata file so LRU eviction sees this as recently used
+        try:
+            os.utime(meta_path, None)
+        except OSError:
+            pass
+        return CacheEntry(
+            url=url,
+            body=body,
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            fetched_at=meta.get('fetched_at', 0.0),
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """Store body for url and evict old entries if the cache is over budget."""
+        entry = CacheEntry(url, body, etag, last_modified, time.time())
+        meta_path, body_path = self._paths(url)
+        self._write_atomic(body_path, body)
+        self._write_meta(meta_path, entry)
+        self._evict()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """Mark entry as freshly validated (after a 304 Not Modified)."""
+        entry.fetched_at = time.time()
+        meta_path, _ = self._paths(entry.url)
+        self._write_meta(meta_path, entry)
+        return entry
+
+    def clear(self) -> None:
+        """Remove every entry from the cache directory."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.json', '.body')):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _write_meta(self, meta_path: str, entry: CacheEntry) -> None:
+        meta = {
+            'url':           entry.url,
+            'etag':          entry.etag,
+            'last_modified': entry.last_modified,
+            'fetched_at':    entry.fetched_at,
+            'size':          len(entry.body),
+        }
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        # A unique temp file per write: fetch_many's worker threads may store the same URL at once
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the total body size fits max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                size = os.path.getsize(body_path)
+                atime = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((atime, size, meta_path, body_path))
+            total += size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, meta_path, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
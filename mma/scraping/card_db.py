@@ -0,0 +1,509 @@
+"""
+CardDatabase — optional SQLite backend for cards, fights, predictions, results and odds.
+
+cards.json nests cards → fights keyed by 'A vs. B' → odds columns (book
+IDs, fighter1's and fighter2's moneylines). Here the same data is
+normalized into:
+
+    cards        — one row per card; seq orders cards that share a date
+    fights       — one row per bout, with both fighter names and the bout's
+                   position on the card; the derived bestOdds block is kept
+                   in best_* columns
+    predictions  — the pick for a bout, when it has one
+    results      — the outcome of a bout, once it has one
+    odds_quotes  — one row per (bout, book): the book's sportsbook registry
+                   ID and its American moneylines on fighter1 and fighter2
+
+and indexed by card id, card date and fighter name, so cross-card
+questions (every bout a fighter was on, every quote for them through a
+join on fights) are SQL queries instead of scans over the whole file.
+
+The site still reads cards.json, which becomes an export: save() writes it
+from the database, in the exact shape and order the JSON-only CardStore
+produces, and only when the text changed. Optional keys the site tolerates
+either way (a card without 'fights', a fight without 'odds' or 'bestOdds',
+a result without 'time') are tracked with has_* / *_key columns so the
+export round-trips today's file byte for byte.
+
+cards.json stays editable by hand (predictions are written there). The
+database remembers the digest of the file it last imported or exported;
+when the file on disk differs, it is re-imported in full on open. An import
+that would not export back to the same cards raises UnsupportedCards
+before anything is written. Cards whose odds are still keyed by book and
+fighter name are converted to the columns on import (models.OddsTable),
+so the next export writes them in the current shape.
+
+The schema is versioned (PRAGMA user_version). A database built by an
+older version is dropped and rebuilt from cards.json when it is opened;
+cards.json is exported after every change, so nothing is lost.
+
+Writes take the same advisory lock on <cards.json>.lock as CardStore.
+Processes sharing one database see each other's rows directly, so put()
+three-way merges (merge_cards) a card another process changed since this
+store's get() returned it, and save() does the same with edits made to
+cards.json itself while the store was open.
+
+export_to() writes the same export to any path without holding it in
+memory: cards are assembled CARD_EXPORT_BATCH at a time and streamed out
+through codec.write_stream, for backfills and archives too large to build
+as one document.
+
+Like CardStore, get / cards return plain dicts; a caller that changes one
+must pass it back through upsert or put.
+
+Public API:
+    CardDatabase(path, json_path)
+    CardDatabase.get(card_id)            → card dict or None
+    CardDatabase.cards(since=None, until=None)  → [card], newest first
+    CardDatabase.upsert(card_id, fields) → card
+    CardDatabase.put(card)               → card
+    CardDatabase.save()                  → True when cards.json was rewritten
+    CardDatabase.transaction()           — context manager: locked, refreshed read-modify-write
+    CardDatabase.export()                → cards.json document
+    CardDatabase.export_to(path, trailing_newline=True)  → bytes written, streamed batch by batch
+    CardDatabase.fighter_fights(name)    → [bout dict], newest first
+    CardDatabase.close()
+    UnsupportedCards
+"""
+import contextlib
+import copy
+import hashlib
+import itertools
+import os
+import sqlite3
+
+from scraping import codec
+from scraping import constants
+from scraping import profiling
+from scraping.card_store import CardsLock
+from scraping.card_store import dump_cards_json
+from scraping.card_store import merge_cards
+from scraping.card_store import read_cards_json
+from scraping.card_store import write_cards_json
+from scraping.models import Card
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cards (
+    id          TEXT PRIMARY KEY,
+    seq         INTEGER NOT NULL,
+    title       TEXT,
+    subtitle    TEXT,
+    date        TEXT NOT NULL,
+    rating      REAL,
+    poster      TEXT,
+    recap_url   TEXT,
+    preview_url TEXT,
+    location    TEXT,
+    event_time  TEXT,
+    has_fights  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_date ON cards (date, seq);
+
+CREATE TABLE IF NOT EXISTS fights (
+    card_id       TEXT NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+    matchup       TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    fighter1      TEXT NOT NULL,
+    fighter2      TEXT NOT NULL,
+    odds_key      INTEGER NOT NULL,
+    best_odds_key INTEGER NOT NULL,
+    best_prob     REAL,
+    best_platform TEXT,
+    best_price    INTEGER,
+    best_ev       REAL,
+    PRIMARY KEY (card_id, matchup)
+);
+CREATE INDEX IF NOT EXISTS fights_fighter1 ON fights (fighter1);
+CREATE INDEX IF NOT EXISTS fights_fighter2 ON fights (fighter2);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    card_id TEXT NOT NULL,
+    matchup TEXT NOT NULL,
+    winner  TEXT,
+    method  TEXT,
+    PRIMARY KEY (card_id, matchup),
+    FOREIGN KEY (card_id, matchup) REFERENCES fights (card_id, matchup) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    card_id  TEXT NOT NULL,
+    matchup  TEXT NOT NULL,
+    winner   TEXT,
+    method   TEXT,
+    time     TEXT,
+    has_time INTEGER NOT NULL,
+    PRIMARY KEY (card_id, matchup),
+    FOREIGN KEY (card_id, matchup) REFERENCES fights (card_id, matchup) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS odds_quotes (
+    card_id       TEXT NOT NULL,
+    matchup       TEXT NOT NULL,
+    book          INTEGER NOT NULL,
+    book_position INTEGER NOT NULL,
+    odds1         INTEGER,
+    odds2         INTEGER,
+    PRIMARY KEY (card_id, matchup, book),
+    FOREIGN KEY (card_id, matchup) REFERENCES fights (card_id, matchup) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+# Bumped whenever a table changes shape; see the module docstring
+_SCHEMA_VERSION = 2
+
+_TABLES = ('odds_quotes', 'results', 'predictions', 'fights', 'cards', 'meta')
+
+# fights.odds_key / best_odds_key: how the key appears in the fight's JSON
+_KEY_ABSENT, _KEY_NULL, _KEY_SET = 0, 1, 2
+
+
+class UnsupportedCards(Exception):
+    """cards.json holds data the normalized schema cannot represent; nothing was imported."""
+
+
+class CardDatabase:
+    def __init__(self, path: str = constants.CARD_DB_PATH, json_path: str = constants.JSON_PATH):
+        self.path = path
+        self.json_path = json_path
+        self.lock = CardsLock(json_path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        # Under the lock, so processes opening a new database together set it up once
+        with self.lock:
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != _SCHEMA_VERSION:
+                # New, or built by another version: start over, cards.json is re-imported below
+                self._conn.executescript(''.join(f'DROP TABLE IF EXISTS {table};\n' for table in _TABLES))
+                self._conn.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+            self._conn.executescript(_SCHEMA)
+        self._saved_text = read_cards_json(json_path)
+        self._dirty = False
+        # The version of each card get() last handed out, for merging in put()
+        self._bases: dict[str, dict] = {}
+        if self._saved_text and _digest(self._saved_text) != self._meta('json_digest'):
+            self._import(self._saved_text)
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+
+    def __contains__(self, card_id: str) -> bool:
+        return self._conn.execute('SELECT 1 FROM cards WHERE id = ?', (card_id,)).fetchone() is not None
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, card_id: str) -> dict | None:
+        card = self._get(card_id)
+        if card is not None:
+            self._bases[card_id] = copy.deepcopy(card)
+        return card
+
+    def cards(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """Cards dated within [since, until] (ISO dates, both optional), newest first."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append('date >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('date <= ?')
+            params.append(until)
+        return self._assemble(f'WHERE {" AND ".join(clauses)}' if clauses else '', tuple(params))
+
+    def fighter_fights(self, name: str) -> list[dict]:
+        """Every bout with name on either side, newest card first, with its pick and result."""
+        rows = self._conn.execute(
+            '''
+            SELECT c.id, c.date, f.matchup, p.card_id IS NOT NULL, p.winner, p.method,
+                   r.card_id IS NOT NULL, r.winner, r.method, r.time
+            FROM fights f
+            JOIN cards c ON c.id = f.card_id
+            LEFT JOIN predictions p ON p.card_id = f.card_id AND p.matchup = f.matchup
+            LEFT JOIN results r ON r.card_id = f.card_id AND r.matchup = f.matchup
+            WHERE f.fighter1 = ? OR f.fighter2 = ?
+            ORDER BY c.date DESC, c.seq DESC, f.position
+            ''',
+            (name, name),
+        ).fetchall()
+        return [
+            {
+                'cardId': card_id,
+                'date': date,
+                'matchup': matchup,
+                'prediction': {'winner': p_winner, 'method': p_method} if has_prediction else None,
+                'result': {'winner': r_winner, 'method': r_method, 'time': r_time} if has_result else None,
+            }
+            for card_id, date, matchup, has_prediction, p_winner, p_method, has_result, r_winner, r_method, r_time in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def upsert(self, card_id: str, fields: dict) -> dict:
+        """Merge fields into the card, or add {'id': card_id, **fields} if it is new."""
+        with self.lock:
+            card = self.get(card_id)
+            if card is None:
+                return self.put({'id': card_id, **fields})
+            card.update(fields)
+            return self.put(card)
+
+    def put(self, card: dict) -> dict:
+        """
+        Store card as given, replacing any card with the same id (in its place,
+        if the date is unchanged). If another process changed the card since
+        this store's get() returned it, the two versions are three-way merged.
+        """
+        with self.lock, self._conn:
+            base = self._bases.get(card['id'])
+            current = self._get(card['id']) if base is not None else None
+            if current is not None and current != base:
+                merged, conflicts = merge_cards([base], [card], [current])
+                for path in conflicts:
+                    print(f'  Warning: {path} was also changed by another process; keeping this run\'s value')
+                card = merged[0]
+            row = self._conn.execute('SELECT seq, date FROM cards WHERE id = ?', (card['id'],)).fetchone()
+            if row is not None and row[1] == card['date']:
+                seq = row[0]
+            else:
+                seq = self._conn.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM cards').fetchone()[0]
+            self._conn.execute('DELETE FROM cards WHERE id = ?', (card['id'],))
+            self._insert(card, seq)
+        self._bases[card['id']] = copy.deepcopy(card)
+        self._dirty = True
+        return card
+
+    def save(self) -> bool:
+        """Export cards.json if anything changed, merging in edits made to the file since it was read."""
+        if not self._dirty:
+            return False
+        with self.lock:
+            self._refresh()
+            self._dirty = False
+            text = dump_cards_json(self.export(), self._saved_text.endswith('\n'))
+            if text == self._saved_text:
+                return False
+            write_cards_json(self.json_path, text)
+            self._saved_text = text
+            self._set_meta('json_digest', _digest(text))
+            return True
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Hold the cards.json lock over a read-modify-write: catch up with the file, run the block, save."""
+        with self.lock:
+            self._refresh()
+            yield self
+            self.save()
+
+    def export(self) -> dict:
+        """The whole database in cards.json's shape, newest card first."""
+        with profiling.span('carddb.export', path=self.path):
+            return {'cards': self._assemble('', ())}
+
+    def export_to(self, path: str, trailing_newline: bool = True) -> int:
+        """Stream the export to path (atomically, in cards.json's format); returns the bytes written."""
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        # The lock keeps other writers out between batches, so the export is one consistent snapshot
+        with self.lock, profiling.span('carddb.export_to', path=path) as sp:
+            with open(tmp_path, 'wb') as f:
+                written = codec.write_stream(f, {'cards': self._iter_cards(constants.CARD_EXPORT_BATCH)}, indent=2)
+                if trailing_newline:
+                    written += f.write(b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            sp.add_bytes(written)
+        return written
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get(self, card_id: str) -> dict | None:
+        found = self._assemble('WHERE id = ?', (card_id,))
+        return found[0] if found else None
+
+    def _iter_cards(self, batch: int):
+        """Every card, newest first, assembled batch cards at a time."""
+        for offset in itertools.count(0, batch):
+            cards = self._assemble(
+                'WHERE id IN (SELECT id FROM cards ORDER BY date DESC, seq DESC LIMIT ? OFFSET ?)', (batch, offset)
+            )
+            yield from cards
+            if len(cards) < batch:
+                return
+
+    def _import(self, text: str, cards: list[dict] | None = None) -> None:
+        """
+        Replace every row with cards (default: the ones in text, cards.json's
+        content), check they export back unchanged, and record text as synced.
+        """
+        merging = cards is not None
+        with profiling.span('carddb.import', path=self.json_path):
+            document = codec.loads(text)
+            if cards is None:
+                cards = document.get('cards', [])
+            try:
+                # Through the models: validates every card and brings older odds to the columns
+                cards = [Card.from_json(card).to_json() for card in cards]
+                # Stable newest-first order, as CardStore writes it: earlier in the file wins a tie
+                expected = sorted(cards, key=lambda c: c['date'], reverse=True)
+                with self._conn:
+                    self._conn.execute('DELETE FROM cards')
+                    for seq, card in enumerate(reversed(expected), start=1):
+                        self._insert(card, seq)
+                    if self.export() != {**document, 'cards': expected}:
+                        raise UnsupportedCards(
+                            f'{self.json_path} has fields the card database cannot store; '
+                            'run without --card-db or extend card_db.py'
+                        )
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO meta VALUES (?, ?)', ('json_digest', _digest(text))
+                    )
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                raise UnsupportedCards(f'{self.json_path} does not match the cards.json schema: {e!r}') from e
+        if not merging:
+            print(f'Imported {len(cards)} cards from {self.json_path} into {self.path}')
+
+    def _refresh(self) -> None:
+        """Catch up with a cards.json edited outside the database, keeping this run's changes."""
+        current = read_cards_json(self.json_path)
+        if current == self._saved_text:
+            return
+        if not current or _digest(current) == self._meta('json_digest'):
+            # Exported by another process from this same database: its rows are already here
+            self._saved_text = current
+            return
+        if not self._dirty:
+            self._import(current)
+        else:
+            base = codec.loads(self._saved_text)['cards'] if self._saved_text else []
+            merged, conflicts = merge_cards(base, self.export()['cards'], codec.loads(current)['cards'])
+            for path in conflicts:
+                print(f'  Warning: {path} was also changed in {self.json_path}; keeping this run\'s value')
+            self._import(current, merged)
+        self._saved_text = current
+
+    def _insert(self, card: dict, seq: int) -> None:
+        self._conn.execute(
+            'INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                card['id'], seq, card.get('title'), card.get('subtitle'), card['date'], card.get('rating'),
+                card.get('poster'), card.get('recapUrl'), card.get('previewUrl'), card.get('location'),
+                card.get('eventTime'), 'fights' in card,
+            ),
+        )
+        fights, predictions, results, quotes = [], [], [], []
+        for position, (matchup, fight) in enumerate((card.get('fights') or {}).items()):
+            fighter1, _, fighter2 = matchup.partition(' vs. ')
+            best = fight.get('bestOdds')
+            fights.append((
+                card['id'], matchup, position, fighter1, fighter2,
+                _key_state(fight, 'odds'), _key_state(fight, 'bestOdds'),
+                best['groundTruthProb'] if best else None,
+                best['bestOdds']['platform'] if best else None,
+                best['bestOdds']['odds'] if best else None,
+                best['bestEv'] if best else None,
+            ))
+            prediction = fight.get('prediction')
+            if prediction is not None:
+                predictions.append((card['id'], matchup, prediction['winner'], prediction['method']))
+            result = fight.get('result')
+            if result is not None:
+                results.append((card['id'], matchup, result['winner'], result['method'], result.get('time'), 'time' in result))
+            odds = fight.get('odds')
+            if odds is not None:
+                for book_position, quote in enumerate(zip(odds['books'], odds['odds1'], odds['odds2'])):
+                    quotes.append((card['id'], matchup, quote[0], book_position, quote[1], quote[2]))
+        self._conn.executemany('INSERT INTO fights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', fights)
+        self._conn.executemany('INSERT INTO predictions VALUES (?, ?, ?, ?)', predictions)
+        self._conn.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)', results)
+        self._conn.executemany('INSERT INTO odds_quotes VALUES (?, ?, ?, ?, ?, ?)', quotes)
+
+    def _assemble(self, where: str, params: tuple) -> list[dict]:
+        """Build the cards matching `where` (a clause over cards), newest first, with one query per table."""
+        scope = f'card_id IN (SELECT id FROM cards {where})'
+        cards = {}
+        for row in self._conn.execute(
+            f'SELECT id, title, subtitle, date, rating, poster, recap_url, preview_url, location, event_time, has_fights '
+            f'FROM cards {where} ORDER BY date DESC, seq DESC',
+            params,
+        ):
+            card = {
+                'id': row[0], 'title': row[1], 'subtitle': row[2], 'date': row[3], 'rating': row[4],
+                'poster': row[5], 'recapUrl': row[6], 'previewUrl': row[7], 'location': row[8], 'eventTime': row[9],
+            }
+            if row[10]:
+                card['fights'] = {}
+            cards[row[0]] = card
+
+        fights = {}
+        for card_id, matchup, odds_key, best_key, prob, platform, price, ev in self._conn.execute(
+            f'SELECT card_id, matchup, odds_key, best_odds_key, best_prob, best_platform, best_price, best_ev '
+            f'FROM fights WHERE {scope} ORDER BY card_id, position',
+            params,
+        ):
+            fight = {'prediction': None, 'result': None}
+            if odds_key != _KEY_ABSENT:
+                fight['odds'] = {'books': [], 'odds1': [], 'odds2': []} if odds_key == _KEY_SET else None
+            if best_key != _KEY_ABSENT:
+                fight['bestOdds'] = {
+                    'groundTruthProb': prob,
+                    'bestOdds': {'platform': platform, 'odds': price},
+                    'bestEv': ev,
+                } if best_key == _KEY_SET else None
+            cards[card_id]['fights'][matchup] = fight
+            fights[card_id, matchup] = fight
+
+        for card_id, matchup, winner, method in self._conn.execute(
+            f'SELECT card_id, matchup, winner, method FROM predictions WHERE {scope}', params
+        ):
+            fights[card_id, matchup]['prediction'] = {'winner': winner, 'method': method}
+        for card_id, matchup, winner, method, time, has_time in self._conn.execute(
+            f'SELECT card_id, matchup, winner, method, time, has_time FROM results WHERE {scope}', params
+        ):
+            result = {'winner': winner, 'method': method}
+            if has_time:
+                result['time'] = time
+            fights[card_id, matchup]['result'] = result
+        for card_id, matchup, book, odds1, odds2 in self._conn.execute(
+            f'SELECT card_id, matchup, book, odds1, odds2 FROM odds_quotes WHERE {scope} '
+            f'ORDER BY card_id, matchup, book_position',
+            params,
+        ):
+            odds = fights[card_id, matchup]['odds']
+            odds['books'].append(book)
+            odds['odds1'].append(odds1)
+            odds['odds2'].append(odds2)
+
+        return list(cards.values())
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+
+def _key_state(fight: dict, key: str) -> int:
+    if key not in fight:
+        return _KEY_ABSENT
+    return _KEY_NULL if fight[key] is None else _KEY_SET
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
@@ -0,0 +1,355 @@
+"""
+CardStore — indexed, load-once view of cards.json with atomic, change-only saves.
+
+The file is read once when the store is opened. Cards are then indexed two
+ways:
+
+  • by id   — a dict, so get / upsert never scan the card list
+  • by date — a list kept in date order with bisect, so inserting a card or
+              moving one to a new date never re-sorts the archive
+
+cards() returns the cards newest first, the order cards.json is written in;
+among cards on the same date the most recently added comes first, as it did
+when new cards were inserted at the top and the list re-sorted.
+
+save() serializes the document in the repo's format (2-space indent, UTF-8
+kept as-is, the file's trailing newline preserved) and writes it only when
+the text differs from what is on disk — through a temp file and os.replace,
+so a crash mid-write never leaves a truncated cards.json behind.
+
+Concurrent writers (odds polling from cron next to a --recap, say) are
+serialized by an advisory lock on <cards.json>.lock. save() takes the lock,
+re-reads the file and, if another process rewrote it since this store read
+it, three-way merges the two versions against the one this store started
+from before writing: per card, then per fight, then per fight key
+(prediction, result, odds, bestOdds). Whatever only one side changed is
+kept; when both changed the same value differently, this store's value wins
+and the clash is reported. transaction() holds the lock across a whole
+read-modify-write and refreshes the store on entry, so the block works on
+the current file and nothing can land in between.
+
+Cards returned by get / cards are the stored dicts themselves. A caller that
+edits one in place must still pass it through upsert (or put) so that the
+next save() knows to compare it against the file.
+
+Public API:
+    open_cards(json_path, db_path=None)  → CardStore, or a CardDatabase when db_path is given
+    read_cards_json(json_path)           → file text ('' when missing)
+    dump_cards_json(document, trailing_newline)  → text in the repo's format
+    write_cards_json(json_path, text)    — atomic replace
+    merge_cards(base, ours, theirs)      → (merged cards, conflicts)
+    CardsLock(json_path, timeout)        — reentrant advisory lock on <json_path>.lock
+    CardStore(json_path)
+    CardStore.get(card_id)            → card dict or None
+    CardStore.cards(since=None, until=None)  → [card], newest first
+    CardStore.upsert(card_id, fields) → card (partial update, or a new card)
+    CardStore.put(card)               → card (whole-card replace, or a new card)
+    CardStore.save()                  → True when the file was rewritten
+    CardStore.transaction()           — context manager: locked, refreshed read-modify-write
+    CardStore.close()
+"""
+import bisect
+import contextlib
+import os
+import time
+
+from scraping import codec
+from scraping import constants
+from scraping import profiling
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; save() still merges
+    fcntl = None
+
+# Nesting depth below which merge_cards combines dicts key by key:
+# card fields → fights by matchup → fight keys. Deeper values are atomic.
+_MERGE_DEPTH = 3
+_MISSING = object()
+
+
+def open_cards(json_path: str = constants.JSON_PATH, db_path: str | None = None):
+    """The card store commands read and write through: cards.json alone, or the SQLite backend."""
+    if db_path is None:
+        return CardStore(json_path)
+    from scraping.card_db import CardDatabase
+
+    return CardDatabase(db_path, json_path)
+
+
+def read_cards_json(json_path: str) -> str:
+    """cards.json as text; a missing file reads as ''."""
+    if not os.path.exists(json_path):
+        return ''
+    with profiling.span('cards.load', path=json_path) as sp:
+        with open(json_path, 'rb') as f:
+            data = f.read()
+        sp.add_bytes(len(data))
+        return data.decode('utf-8')
+
+
+def dump_cards_json(document: dict, trailing_newline: bool = False) -> str:
+    """Serialize in the repo's format: 2-space indent, UTF-8 kept as-is."""
+    text = codec.dumps(document, indent=2)
+    return text + '\n' if trailing_newline else text
+
+
+def write_cards_json(json_path: str, text: str) -> None:
+    """Replace json_path with text through a synced temp file, so it is never left half-written."""
+    tmp_path = f'{json_path}.{os.getpid()}.tmp'
+    with profiling.span('cards.dump', path=json_path) as sp:
+        data = text.encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, json_path)
+        sp.add_bytes(len(data))
+
+
+def merge_cards(base: list[dict], ours: list[dict], theirs: list[dict]) -> tuple[list[dict], list[str]]:
+    """
+    Three-way merge of card lists by id. Cards, fights and fight keys that
+    only one side changed (added, edited or removed) take that side's
+    version; values both sides changed differently keep ours and are listed
+    in conflicts as 'card-id/fights/matchup/key'. Returns the cards only
+    ours added (in ours' order), then the rest in theirs' order.
+    """
+    base_by_id = {card['id']: card for card in base}
+    ours_by_id = {card['id']: card for card in ours}
+    theirs_by_id = {card['id']: card for card in theirs}
+    conflicts = []
+    merged = []
+    for card_id in [i for i in ours_by_id if i not in theirs_by_id] + list(theirs_by_id):
+        card = _merge3(
+            base_by_id.get(card_id, _MISSING),
+            ours_by_id.get(card_id, _MISSING),
+            theirs_by_id.get(card_id, _MISSING),
+            card_id, 0, conflicts,
+        )
+        if card is not _MISSING:
+            merged.append(card)
+    return merged, conflicts
+
+
+def _merge3(base, ours, theirs, path: str, depth: int, conflicts: list[str]):
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    if depth < _MERGE_DEPTH and all(isinstance(v, dict) for v in (base, ours, theirs)):
+        merged = {}
+        for key in list(theirs) + [k for k in ours if k not in theirs]:
+            value = _merge3(
+                base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING),
+                f'{path}/{key}', depth + 1, conflicts,
+            )
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+    conflicts.append(path)
+    return ours
+
+
+class CardsLock:
+    """
+    Exclusive advisory lock on <json_path>.lock, shared by every process
+    that writes cards.json. Reentrant within one store; waits up to timeout
+    seconds for another holder before raising TimeoutError.
+    """
+
+    def __init__(self, json_path: str, timeout: float = constants.CARDS_LOCK_TIMEOUT):
+        self.path = f'{json_path}.lock'
+        self.timeout = timeout
+        self._file = None
+        self._depth = 0
+
+    def __enter__(self):
+        if self._depth == 0 and fcntl is not None:
+            self._file = open(self.path, 'a')
+            deadline = time.monotonic() + self.timeout
+            delay = 0.01
+            with profiling.span('cards.lock', path=self.path):
+                while True:
+                    try:
+                        fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            self._file.close()
+                            self._file = None
+                            raise TimeoutError(f'{self.path} still held by another process after {self.timeout:.0f}s')
+                        time.sleep(delay)
+                        delay = min(delay * 2, 0.5)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class CardStore:
+    def __init__(self, json_path: str = constants.JSON_PATH):
+        self.json_path = json_path
+        self.lock = CardsLock(json_path)
+        stamp = _stamp(json_path)
+        self._load(read_cards_json(json_path), stamp)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self._by_id
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, card_id: str) -> dict | None:
+        return self._by_id.get(card_id)
+
+    def cards(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """Cards dated within [since, until] (ISO dates, both optional), newest first."""
+        lo = 0 if since is None else bisect.bisect_left(self._dates, since)
+        hi = len(self._dates) if until is None else bisect.bisect_right(self._dates, until)
+        return self._by_date[lo:hi][::-1]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def upsert(self, card_id: str, fields: dict) -> dict:
+        """Merge fields into the card, or add {'id': card_id, **fields} if it is new."""
+        card = self._by_id.get(card_id)
+        if card is None:
+            return self._add({'id': card_id, **fields})
+        old_date = card['date']
+        card.update(fields)
+        if card['date'] != old_date:
+            self._unindex(card, old_date)
+            self._index(card)
+        self._dirty = True
+        return card
+
+    def put(self, card: dict) -> dict:
+        """Store card as given, replacing any card with the same id (in its place, if the date is unchanged)."""
+        old = self._by_id.get(card['id'])
+        if old is None:
+            return self._add(card)
+        if card['date'] == old['date']:
+            self._by_date[self._position(old)] = card
+        else:
+            self._unindex(old)
+            self._index(card)
+        self._by_id[card['id']] = card
+        self._dirty = True
+        return card
+
+    def save(self) -> bool:
+        """Write cards.json if anything changed, merging in other processes' writes since it was read."""
+        if not self._dirty:
+            return False
+        with self.lock:
+            self._refresh()
+            self._dirty = False
+            text = self._dumps()
+            if text == self._saved_text:
+                return False
+            write_cards_json(self.json_path, text)
+            self._saved_text = text
+            self._stamp = _stamp(self.json_path)
+            return True
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Hold the lock over a read-modify-write: refresh from disk, run the block, save."""
+        with self.lock:
+            self._refresh()
+            yield self
+            self.save()
+
+    def close(self) -> None:
+        """Nothing to release; commands close whichever store open_cards gave them."""
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load(self, text: str, stamp: tuple | None, cards: list[dict] | None = None) -> None:
+        """
+        Index cards (default: the ones in text); text becomes what is known to
+        be on disk, as of a stat taken before it was read.
+        """
+        self._saved_text = text
+        self._stamp = stamp
+        self._document = codec.loads(text) if text else {'cards': []}
+        if cards is None:
+            cards = self._document['cards']
+        # Oldest first; cards() reverses it. Ties keep insertion order, so the
+        # newest card on a date is last here and first in the file.
+        self._by_date = sorted(cards, key=lambda c: c['date'], reverse=True)[::-1]
+        self._dates = [card['date'] for card in self._by_date]
+        self._by_id = {card['id']: card for card in self._by_date}
+        self._dirty = False
+
+    def _refresh(self) -> None:
+        """Catch up with cards.json if another process rewrote it, keeping this store's changes."""
+        # Every write replaces the file (a new inode), so an unchanged stamp means unchanged content
+        stamp = _stamp(self.json_path)
+        if stamp is not None and stamp == self._stamp:
+            return
+        current = read_cards_json(self.json_path)
+        if current == self._saved_text:
+            self._stamp = stamp
+            return
+        if not self._dirty:
+            self._load(current, stamp)
+            return
+        base = codec.loads(self._saved_text)['cards'] if self._saved_text else []
+        theirs = codec.loads(current)['cards'] if current else []
+        # Cards this store added come first, so they stay newest among cards on their date
+        merged, conflicts = merge_cards(base, self.cards(), theirs)
+        for path in conflicts:
+            print(f'  Warning: {path} was also changed by another process; keeping this run\'s value')
+        self._load(current, stamp, merged)
+        self._dirty = True
+
+    def _add(self, card: dict) -> dict:
+        self._by_id[card['id']] = card
+        self._index(card)
+        self._dirty = True
+        return card
+
+    def _index(self, card: dict) -> None:
+        pos = bisect.bisect_right(self._dates, card['date'])
+        self._dates.insert(pos, card['date'])
+        self._by_date.insert(pos, card)
+
+    def _position(self, card: dict, date: str | None = None) -> int:
+        """Index of card in the date list, looked up under date (default: its own)."""
+        date = card['date'] if date is None else date
+        lo = bisect.bisect_left(self._dates, date)
+        hi = bisect.bisect_right(self._dates, date)
+        return next(i for i in range(lo, hi) if self._by_date[i] is card)
+
+    def _unindex(self, card: dict, date: str | None = None) -> None:
+        pos = self._position(card, date)
+        del self._dates[pos]
+        del self._by_date[pos]
+
+    def _dumps(self) -> str:
+        # The date index is authoritative; the loaded card list is only a placeholder for key order
+        document = {**self._document, 'cards': self.cards()}
+        return dump_cards_json(document, self._saved_text.endswith('\n'))
+
+
+def _stamp(path: str) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
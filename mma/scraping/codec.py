@@ -0,0 +1,157 @@
+"""
+Codec — JSON encoding and decoding through orjson when it is installed, stdlib json otherwise.
+
+cards.json, the research notes, the site data files and the API responses
+the scrapers read all go through here. Output is the same text whichever
+backend runs: keys in insertion order (or sorted with sort_keys), UTF-8
+kept as-is, and either compact (no spaces after separators) or indented
+with indent spaces and ', ' / ': ' separators exactly as json.dumps writes
+them. orjson only indents by 2 and only encodes str keys and 64-bit ints,
+so other indents and documents it rejects are handed to stdlib json; input
+orjson refuses to parse (NaN, say) is retried with stdlib json too, which
+raises json.JSONDecodeError if it is really malformed. What still differs
+is confined to floats: orjson writes NaN and infinities as null and drops
+the '+' from exponents (1e16 against 1e+16). No file here holds either.
+
+write_stream() writes a document to a binary file piece by piece instead
+of building the whole text first: the top-level container and the
+containers directly inside it are written element by element, and any
+iterator among them (a generator over database rows, say) is consumed
+lazily and written as a list. The bytes are those dumpb() would produce
+for the same document with its iterators turned into lists, so a streamed
+export can replace an in-memory one without changing the file.
+
+Decoding and encoding are recorded as json.decode / json.encode spans, so
+they show up in --profile runs next to the file reads and writes.
+
+Public API:
+    BACKEND                                   → 'orjson' or 'json'
+    use_backend(name)                         — switch backends (benchmarks); 'orjson' must be installed
+    loads(data)                               → object (data: str or bytes)
+    dumps(document, indent=None, sort_keys=False)  → str
+    dumpb(document, indent=None, sort_keys=False)  → bytes (UTF-8)
+    write_stream(f, document, indent=None)    → bytes written to binary file f
+"""
+import importlib.util
+import json
+from collections.abc import Iterator
+
+from scraping import profiling
+
+# Probed here, imported on first use, so importing this module stays cheap
+_HAS_ORJSON = importlib.util.find_spec('orjson') is not None
+
+BACKEND = 'orjson' if _HAS_ORJSON else 'json'
+
+# How many container levels write_stream() writes element by element
+_STREAM_DEPTH = 2
+
+
+def use_backend(name: str) -> None:
+    global BACKEND, _HAS_ORJSON
+    if name not in ('orjson', 'json'):
+        raise ValueError(f'Unknown JSON backend: {name}')
+    if name == 'orjson' and importlib.util.find_spec('orjson') is None:
+        raise ValueError('orjson is not installed (pip install orjson)')
+    BACKEND, _HAS_ORJSON = name, name == 'orjson'
+
+
+def loads(data: str | bytes):
+    with profiling.span('json.decode', backend=BACKEND) as sp:
+        sp.add_bytes(len(data))
+        if _HAS_ORJSON:
+            import orjson
+
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+
+
+def dumpb(document, indent: int | None = None, sort_keys: bool = False) -> bytes:
+    with profiling.span('json.encode', backend=BACKEND) as sp:
+        data = _encode(document, indent, sort_keys)
+        sp.add_bytes(len(data))
+        return data
+
+
+def dumps(document, indent: int | None = None, sort_keys: bool = False) -> str:
+    return dumpb(document, indent, sort_keys).decode('utf-8')
+
+
+def write_stream(f, document, indent: int | None = None) -> int:
+    """Write document to the binary file f as dumpb(document, indent) would, without holding the whole text."""
+    with profiling.span('json.encode', backend=BACKEND, stream=True) as sp:
+        written = _stream(f.write, document, indent, 0)
+        sp.add_bytes(written)
+        return written
+
+
+# ----------------------------------------------------------------------
+# Internals
+# ----------------------------------------------------------------------
+
+def _encode(document, indent: int | None, sort_keys: bool) -> bytes:
+    if _HAS_ORJSON and indent in (None, 2):
+        import orjson
+
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(document, option=option)
+        except orjson.JSONEncodeError:
+            pass
+    separators = (',', ': ') if indent is not None else (',', ':')
+    return json.dumps(
+        document, indent=indent, separators=separators, sort_keys=sort_keys, ensure_ascii=False,
+    ).encode('utf-8')
+
+
+def _stream(write, value, indent: int | None, level: int) -> int:
+    """Write value at nesting level; returns bytes written."""
+    if isinstance(value, dict):
+        items = iter(value.items())
+        is_object = True
+    elif isinstance(value, (list, tuple, Iterator)):
+        items = iter(value)
+        is_object = False
+    else:
+        items = None
+    if items is None or (level >= _STREAM_DEPTH and not isinstance(value, Iterator)):
+        return _write_encoded(write, value, indent, level)
+
+    opener, closer = (b'{', b'}') if is_object else (b'[', b']')
+    if indent is None:
+        separator, inner, outer, colon = b',', b'', b'', b':'
+    else:
+        separator = b','
+        inner = b'\n' + b' ' * (indent * (level + 1))
+        outer = b'\n' + b' ' * (indent * level)
+        colon = b': '
+
+    written = write(opener)
+    first = True
+    for item in items:
+        if not first:
+            written += write(separator)
+        written += write(inner)
+        if is_object:
+            key, item = item
+            if not isinstance(key, str):
+                raise TypeError(f'write_stream() object keys must be str, not {type(key).__name__}')
+            written += write(_encode(key, None, False) + colon)
+        written += _stream(write, item, indent, level + 1)
+        first = False
+    if not first:
+        written += write(outer)
+    return written + write(closer)
+
+
+def _write_encoded(write, value, indent: int | None, level: int) -> int:
+    data = _encode(value, indent, False)
+    if indent and level:
+        # Strings never hold a raw newline, so every newline is indentation to shift
+        data = data.replace(b'\n', b'\n' + b' ' * (indent * level))
+    return write(data)
@@ -9,19 +9,98 @@ HEADERS = {
         'Chrome/120.0.0.0 Safari/537.36'
     )
 }
-REQUEST_DELAY = 1.2  # seconds between fighter profile fetches
+# Per-source token buckets: host -> (requests per second, burst)
+RATE_LIMITS = {
+    'en.wikipedia.org': (2.0, 4),
+    'www.sherdog.com':  (0.8, 2),
+    'api.fightodds.io': (0.5, 1),
+}
+DEFAULT_RATE_LIMIT = (1.0, 2)
+
+# Retries with full-jitter exponential backoff (see resilience.py)
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0   # seconds; doubled per attempt before jitter
+RETRY_MAX_DELAY = 30.0
+
+# Per-host circuit breaker: open after this many consecutive failures
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60.0  # seconds before a trial request is let through
+
+# Max in-flight requests per host for Scraper.fetch_many
+HOST_CONCURRENCY = {
+    'en.wikipedia.org': 4,
+    'www.sherdog.com':  2,
+}
+DEFAULT_HOST_CONCURRENCY = 2
+
+PARSER_BACKENDS = ('auto', 'html.parser', 'lxml', 'selectolax')
+HTML_PARSER = 'auto'  # 'auto' | 'html.parser' | 'lxml' | 'selectolax' (see scraper.py)
+TARGETED_PARSING = True  # build only the page regions each scraper declares
+
+DRIVER_POOL_SIZE = 2  # headless Firefox instances for --driver
+
+CACHE_DIR = './mma/.cache/http'
+CACHE_TTL = 6 * 60 * 60              # seconds before a cached page is revalidated
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU-evict cached bodies beyond this total
+
+# Cross-event store of scraped fighter profiles (see fighter_store.py)
+FIGHTER_STORE_PATH = './mma/.cache/fighters.sqlite3'
+FIGHTER_STORE_MAX_AGE = 7 * 24 * 60 * 60  # seconds a profile without a known page revision stays current
+
+# Optional SQLite backend for cards.json (see card_db.py); cards.json is exported from it
+CARD_DB_PATH = './mma/.cache/cards.sqlite3'
+CARD_EXPORT_BATCH = 200  # cards assembled per query while CardDatabase.export_to streams an export
+
+# Default trace file for --profile (Chrome trace-event JSON, see profiling.py)
+PROFILE_TRACE_PATH = './mma/.cache/profile.json'
+
+# Response headers kept by --record archives (see archive.py)
+ARCHIVE_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
 
 FIGHTODDS_GQL = 'https://api.fightodds.io/gql'
 GROUND_TRUTH_BOOK = 'DraftKings'
 
 JSON_PATH = './mma/db/cards.json'
+CARDS_LOCK_TIMEOUT = 60.0  # seconds to wait for another process's write to cards.json
+
+# Sharded copies of cards.json the site loads (see site_data.py)
+CARDS_INDEX_PATH = './mma/db/cards-index.json'
+CARDS_SHARD_DIR = './mma/db/cards'
+
+# Sportsbook registry (see sportsbooks.py): ID → (canonical name, other spellings).
+# cards.json stores these IDs in its odds columns, so an ID is never reused
+# or renumbered; add new books at the end.
+SPORTSBOOKS = {
+    1: ('BetOnline', ()),
+    2: ('Bovada', ()),
+    3: ('MyBookie', ()),
+    4: ('BetUS', ()),
+    5: ('Bet105', ()),
+    6: ('Bookmaker', ('BookMaker',)),
+    7: ('DraftKings', ()),
+    8: ('FanDuel', ()),
+    9: ('4Cx', ()),
+    10: ('BetAnything', ()),
+    11: ('Circa', ()),
+    12: ('BetRivers', ()),
+    13: ('HardRockBet', ('HardRocketBet',)),
+    14: ('BetMGM', ()),
+    15: ('Caesars', ()),
+    16: ('Jazz', ()),
+    17: ('Polymarket', ()),
+    18: ('Pinnacle', ()),
+    19: ('Betway', ()),
+    20: ('Stake', ()),
+    21: ('Cloudbet', ()),
+    22: ('4casters', ()),
+    23: ('SXBet', ()),
+    24: ('ProphetX', ()),
+    25: ('YouWager', ()),
+    26: ('Kalshi', ()),
+}
 
-PLATFORMS = [
-    'BetOnline', 'Bovada', 'MyBookie', 'BetUS', 'Bet105', 'BookMaker',
-    'DraftKings', 'FanDuel', '4Cx', 'BetAnything', 'Circa', 'BetRivers',
-    'HardRocketBet', 'BetMGM', 'Caesars', 'Jazz', 'Polymarket', 'Pinnacle',
-    'Betway', 'Stake', 'Cloudbet', '4casters', 'SXBet',
-]
+# Books a new preview card gets empty odds columns for
+PREVIEW_BOOKS = tuple(range(1, 24))
 
 WEIGHT_CLASS = {
     115: 'Strawweight',
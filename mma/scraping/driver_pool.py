@@ -0,0 +1,144 @@
+"""
+DriverPool — a pool of reusable, resource-trimmed headless Firefox drivers.
+
+Drivers are launched lazily, up to `size`, and handed out one caller at a
+time via lease(); concurrent fetches block until a driver is free. Each
+driver is configured to do as little work as possible per page:
+
+  • page-load strategy "eager" — return at DOMContentLoaded, not after
+    every subresource has finished loading
+  • images, web fonts and audio/video are blocked through Firefox prefs
+
+A driver whose page load or script raised may have lost its browser, so it
+is quit and its slot freed rather than handed to the next caller; the next
+checkout launches a fresh one.
+
+get_html() can also pull just the elements matching a CSS selector list
+via script execution (their outerHTML, in document order), instead of
+serializing the whole DOM through page_source.
+
+Public API:
+    DriverPool(size)
+    DriverPool.get_html(url, regions=None)  — page HTML, or only matching regions
+    DriverPool.close()
+"""
+import contextlib
+import importlib.util
+import queue
+import threading
+
+# selenium is heavy; it is imported only when the first driver is launched
+_HAS_SELENIUM = importlib.util.find_spec('selenium') is not None
+
+_FIREFOX_BINARY = '/snap/firefox/current/usr/lib/firefox/firefox'
+_GECKODRIVER_PATH = '/snap/bin/geckodriver'
+
+# Firefox prefs that stop the browser fetching resources the scrapers never read
+_BLOCKING_PREFS = {
+    'permissions.default.image':       2,      # block all images
+    'gfx.downloadable_fonts.enabled':  False,  # no web fonts
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default':          5,      # block audio and video autoplay
+    'media.play-stand-alone':          False,
+    'media.hls.enabled':               False,
+    'media.mediasource.enabled':       False,
+}
+
+_REGIONS_SCRIPT = '''
+return Array.from(document.querySelectorAll(arguments[0]))
+    .map(function (el) { return el.outerHTML; })
+    .join('\\n');
+'''
+
+
+class DriverPool:
+    def __init__(self, size: int = 1):
+        if not _HAS_SELENIUM:
+            raise RuntimeError('selenium is not installed; cannot use --driver')
+        self.size = max(1, size)
+        self._idle: queue.Queue = queue.Queue()
+        self._drivers: list = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get_html(self, url: str, regions: str | None = None) -> str:
+        """
+        Load url in a pooled driver and return its HTML.
+
+        With regions (a CSS selector list such as 'table.infobox, table.toccolours'),
+        only the matching elements are returned, wrapped in a minimal document.
+        """
+        with self._lease() as driver:
+            driver.get(url)
+            if regions is None:
+                return driver.page_source
+            fragments = driver.execute_script(_REGIONS_SCRIPT, regions)
+            return f'<html><body>{fragments}</body></html>'
+
+    def close(self) -> None:
+        """Quit every driver the pool has launched; callers waiting for one get RuntimeError."""
+        with self._lock:
+            self._closed = True
+            for driver in self._drivers:
+                with contextlib.suppress(Exception):
+                    driver.quit()
+            self._drivers.clear()
+        # Wake a caller blocked in _checkout(); each one passes the wake-up on
+        self._idle.put(None)
+
+    @contextlib.contextmanager
+    def _lease(self):
+        driver = self._checkout()
+        try:
+            yield driver
+        except BaseException:
+            self._discard(driver)
+            raise
+        with self._lock:
+            if self._closed:
+                return
+        self._idle.put(driver)
+
+    def _checkout(self):
+        while True:
+            if self._closed:
+                self._idle.put(None)
+                raise RuntimeError('DriverPool is closed')
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if len(self._drivers) < self.size:
+                        driver = self._launch()
+                        self._drivers.append(driver)
+                        return driver
+                driver = self._idle.get()
+            # None wakes a waiter when a slot frees up or the pool closes: look again
+            if driver is not None:
+                return driver
+
+    def _discard(self, driver) -> None:
+        """Quit a driver that failed mid-fetch and free its slot for a fresh launch."""
+        with contextlib.suppress(Exception):
+            driver.quit()
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        self._idle.put(None)
+
+    @staticmethod
+    def _launch():
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options
+        from selenium.webdriver.firefox.service import Service
+
+        opts = Options()
+        opts.add_argument('--headless')
+        opts.binary_location = _FIREFOX_BINARY
+        opts.page_load_strategy = 'eager'
+        for name, value in _BLOCKING_PREFS.items():
+            opts.set_preference(name, value)
+        return webdriver.Firefox(
+            service=Service(_GECKODRIVER_PATH),
+            options=opts,
+        )
@@ -1,14 +1,24 @@
 """
 EventScraper — abstract base class for MMA event scrapers.
 
-Concrete implementations: SherdogEventScraper (sherdog.py).
+Concrete implementations: SherdogEventScraper (sherdog.py),
+WikipediaEventScraper (wikipedia.py). Both return the typed records of
+models.py; to_json() on any of them gives the dict shape research notes
+and the fighter store keep on disk.
 """
 from abc import ABC, abstractmethod
 
+from scraping.models import Bout
+from scraping.models import Event
+from scraping.models import FighterProfile
+
 
 class EventScraper(ABC):
+    # Short source name recorded with stored fighter profiles
+    source: str = ''
+
     @abstractmethod
-    def scrape_event(self, url: str, mode: str = 'both') -> dict:
+    def scrape_event(self, url: str, mode: str = 'both') -> Event:
         """
         Scrape an event page for preview or recap use.
 
@@ -17,52 +27,54 @@ class EventScraper(ABC):
             mode: 'preview' omits result fields; 'recap' or 'both' includes them.
 
         Returns:
-            {
-                event_name: str,
-                date:       str,   # ISO YYYY-MM-DD
-                location:   str,
-                fights: [{
-                    card_placement:    str,        # 'Main Card' | 'Prelims' | 'Early Prelims'
-                    fighter1:          str,
-                    fighter2:          str,
-                    method_of_victory: str | None, # None when mode == 'preview'
-                    time_of_victory:   str | None,
-                }]
-            }
+            Event(event_name, date, location, fights), date as ISO YYYY-MM-DD.
+            Each Fight has card_placement ('Main Card' | 'Prelims' |
+            'Early Prelims'), fighter1, fighter2, and method_of_victory /
+            time_of_victory, which are None when mode == 'preview'.
         """
 
     @abstractmethod
-    def scrape_event_research(self, url: str) -> tuple[str, list[dict]]:
+    def scrape_event_research(self, url: str) -> tuple[str, list[Bout]]:
         """
         Scrape an event page for research, returning fighter profile URLs.
 
-        Returns: (event_name, bouts) where each bout dict contains:
-            {
-                fighter1_name:  str,
-                fighter1_url:   str,
-                fighter2_name:  str,
-                fighter2_url:   str,
-                weight_class:   str,
-                card_placement: str,
-            }
+        Returns: (event_name, bouts). Each Bout holds fighter1_name,
+        fighter1_url, fighter2_name, fighter2_url, weight_class and
+        card_placement.
         """
 
     @abstractmethod
-    def scrape_fighter(self, name: str, url: str) -> dict:
+    def scrape_fighter(self, name: str, url: str) -> FighterProfile:
         """
         Scrape a fighter profile page.
 
-        Returns:
-            {
-                name:          str,
-                profile_url:   str,
-                record:        str | None,  # e.g. '22-7-0'
-                streak:        str | None,  # e.g. '3 Win'
-                recent_fights: [{
-                    result:   str,  # 'Win' | 'Loss' | 'Draw' | 'NC'
-                    opponent: str,
-                    method:   str,
-                    date:     str,  # e.g. 'December 13, 2025'
-                }]
-            }
+        Returns a FighterProfile:
+            name, profile_url
+            record         — e.g. '22-7-0', or None
+            streak         — e.g. '3 Win', or None
+            recent_fights  — [RecentFight(result, opponent, method, date)],
+                             result 'Win' | 'Loss' | 'Draw' | 'NC'
+            history        — Sherdog only: every bout, {fields, rows}, see sherdog.py
+            error          — set only when the profile could not be scraped
+        """
+
+    def scrape_fighters(self, fighters: list[tuple[str, str | None]]) -> list[FighterProfile]:
+        """
+        Scrape a batch of fighter profiles given as (name, url) pairs.
+
+        Returns one FighterProfile per input pair, in input order, as
+        scrape_fighter would. The default implementation is serial;
+        scrapers override it to fetch pages concurrently.
+        """
+        return [self.scrape_fighter(name, url) for name, url in fighters]
+
+    def fighter_revisions(self, urls: list[str]) -> dict[str, int]:
+        """
+        Look up the current revision ID of each fighter profile page.
+
+        Used by incremental research to skip fighters whose page has not
+        changed since the last run. Returns {url: revision_id}; URLs whose
+        revision cannot be looked up cheaply are left out, and are always
+        refetched. The default implementation knows no revisions.
         """
+        return {}
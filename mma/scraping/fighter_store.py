@@ -0,0 +1,169 @@
+"""
+FighterStore — persistent SQLite store of scraped fighter profiles, shared across events.
+
+Every profile that research scrapes cleanly is saved here, keyed by its
+profile URL and indexed by normalized name (diacritics folded, lowercased,
+whitespace collapsed). Each row holds the full profile as research writes
+it to the notes (FighterProfile.to_json()), plus:
+
+  • source      — the scraper that produced it ('wikipedia', 'sherdog')
+  • revision    — the page revision it was parsed from, when known
+  • fetched_at  — when it was scraped (Unix time)
+
+Staleness policy (is_current): a stored profile whose page revision is
+known is current exactly while that revision is still the page's latest.
+Without a revision, it is current for `max_age` seconds after fetched_at.
+
+Public API:
+    FighterStore(path, max_age)
+    FighterStore.get_many(urls)            → {url: StoredProfile}
+    FighterStore.find(names=None, urls=None, source=None)  → [StoredProfile]
+    FighterStore.put_many(profiles, source, revisions)
+    FighterStore.is_current(stored, revision=None)
+    FighterStore.close()
+    StoredProfile
+"""
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+
+from scraping import codec
+from scraping import constants
+from scraping import utils
+from scraping.models import FighterProfile
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS fighters (
+    profile_url TEXT PRIMARY KEY,
+    name_key    TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    revision    INTEGER,
+    fetched_at  REAL NOT NULL,
+    profile     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fighters_name_key ON fighters (name_key);
+'''
+
+# SQLite's default limit on host parameters per statement is 999
+_MAX_PARAMS = 900
+
+
+@dataclass
+class StoredProfile:
+    profile: FighterProfile
+    source: str
+    revision: int | None
+    fetched_at: float
+
+
+class FighterStore:
+    def __init__(self, path: str = constants.FIGHTER_STORE_PATH, max_age: float = constants.FIGHTER_STORE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_many(self, urls: list[str]) -> dict[str, StoredProfile]:
+        """Stored profiles for the given profile URLs; unknown URLs are left out."""
+        unique = list(dict.fromkeys(urls))
+        result = {}
+        for start in range(0, len(unique), _MAX_PARAMS):
+            chunk = unique[start:start + _MAX_PARAMS]
+            rows = self._conn.execute(
+                f'SELECT profile_url, source, revision, fetched_at, profile FROM fighters '
+                f'WHERE profile_url IN ({", ".join("?" * len(chunk))})',
+                chunk,
+            )
+            for url, *rest in rows:
+                result[url] = self._stored(*rest)
+        return result
+
+    def find(
+        self,
+        names: list[str] | None = None,
+        urls: list[str] | None = None,
+        source: str | None = None,
+    ) -> list[StoredProfile]:
+        """
+        Bulk query by normalized name and/or profile URL, optionally for one source.
+
+        With neither names nor urls, every stored profile (of that source) is returned.
+        """
+        keys = []
+        if names:
+            keys.append(('name_key', [utils.normalize_name(n) for n in names]))
+        if urls:
+            keys.append(('profile_url', list(urls)))
+        source_clause = ' AND source = ?' if source else ''
+        source_params = [source] if source else []
+        if not keys:
+            rows = self._conn.execute(
+                f'SELECT source, revision, fetched_at, profile FROM fighters '
+                f'WHERE 1{source_clause} ORDER BY name_key',
+                source_params,
+            )
+            return [self._stored(*row) for row in rows]
+
+        # One query per chunk, as in get_many, to stay under SQLite's parameter limit
+        found = {}
+        for column, values in keys:
+            unique = list(dict.fromkeys(values))
+            for start in range(0, len(unique), _MAX_PARAMS):
+                chunk = unique[start:start + _MAX_PARAMS]
+                rows = self._conn.execute(
+                    f'SELECT profile_url, name_key, source, revision, fetched_at, profile FROM fighters '
+                    f'WHERE {column} IN ({", ".join("?" * len(chunk))}){source_clause}',
+                    chunk + source_params,
+                )
+                for url, name_key, *rest in rows:
+                    found[url] = (name_key, rest)
+        return [self._stored(*rest) for _, rest in sorted(found.values(), key=lambda item: item[0])]
+
+    def is_current(self, stored: StoredProfile, revision: int | None = None) -> bool:
+        """Whether stored can stand in for a fresh scrape (see the module docstring)."""
+        if revision is not None and stored.revision is not None:
+            return stored.revision == revision
+        return time.time() - stored.fetched_at < self.max_age
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def put_many(self, profiles: list[FighterProfile], source: str, revisions: dict[str, int] | None = None) -> int:
+        """Save cleanly scraped profiles (those with a URL and no error). Returns how many were saved."""
+        revisions = revisions or {}
+        now = time.time()
+        rows = [
+            (
+                p.profile_url,
+                utils.normalize_name(p.name),
+                source,
+                revisions.get(p.profile_url),
+                now,
+                codec.dumps(p.to_json()),
+            )
+            for p in profiles
+            if p.profile_url and not p.error
+        ]
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO fighters '
+                '(profile_url, name_key, source, revision, fetched_at, profile) VALUES (?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+        return len(rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def _stored(source: str, revision: int | None, fetched_at: float, profile: str) -> StoredProfile:
+        return StoredProfile(FighterProfile.from_json(codec.loads(profile)), source, revision, fetched_at)
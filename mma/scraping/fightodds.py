@@ -5,21 +5,34 @@ Queries the fightodds.io GraphQL API for all sportsbook odds for a given event,
 matches fights to existing card entries by fighter last name, and computes the
 best EV book for each predicted winner.
 
+Books are resolved to their sportsbook registry IDs (sportsbooks.py) as the
+response is parsed, and each bout's odds are written as columns (OddsTable):
+one array of book IDs and the two fighters' moneylines in matching arrays,
+oriented to the card's matchup key. A book the registry does not know is
+left out with a warning naming it, and every known book's odds are still
+written; add it to constants.SPORTSBOOKS to keep its quotes from then on.
+
 Public API:
-    run(args)  — args.event (event PK or URL), args.card_id
+    run(args, rate_limiter=None, resilience=None, archive=None)  — args.event (event PK or URL), args.card_id,
+        args.card_db (SQLite card database path or None)
 """
+import contextlib
 import difflib
 import json
 import re
-import sys
-import time
 import unicodedata
-import requests
 
 from scraping import constants
-
-_MAX_ATTEMPTS = 3
-_RETRY_DELAY = 2  # seconds
+from scraping import profiling
+from scraping import sportsbooks
+from scraping.models import BestOdds
+from scraping.models import Card
+from scraping.models import CardFight
+from scraping.models import OddsQuote
+from scraping.models import OddsTable
+from scraping.ratelimit import RateLimiter
+from scraping.ratelimit import parse_retry_after
+from scraping.resilience import Resilience
 
 
 def _american_to_profit(odds):
@@ -58,47 +71,57 @@ def _names_match(card_name, odds_name):
     return False
 
 
-def compute_best_odds(fights, ground_truth_book=constants.GROUND_TRUTH_BOOK):
+def _pick_column(odds: OddsTable, matchup: str, pick: str) -> list[int | None] | None:
+    """The odds column of the picked fighter, or None when the pick is neither side of matchup."""
+    fighter1, fighter2 = matchup.split(" vs. ", 1)
+    pick_lower = pick.lower()
+    if pick_lower == fighter1.lower():
+        return odds.odds1
+    if pick_lower == fighter2.lower():
+        return odds.odds2
+    return None
+
+
+def compute_best_odds(fights: dict[str, CardFight], ground_truth_book=constants.GROUND_TRUTH_BOOK):
     """Compute and store groundTruthProb + best EV book for each fight with a prediction."""
+    ground_truth = sportsbooks.book_id(ground_truth_book)
     for matchup, entry in fights.items():
-        odds_data = entry.get("odds", {})
-        pick = (entry.get("prediction") or {}).get("winner")
+        odds = entry.odds
+        pick = entry.prediction.winner if entry.prediction else None
+        column = _pick_column(odds, matchup, pick) if pick and odds else None
 
-        if not pick or not odds_data:
-            entry["bestOdds"] = None
+        truth = column[odds.books.index(ground_truth)] if column and ground_truth in odds.books else None
+        if truth is None:
+            entry.best_odds = None
             continue
 
-        gt_lines = odds_data.get(ground_truth_book, {})
-        pick_lower = pick.lower()
-        p_true = None
-        for fighter, odds in gt_lines.items():
-            if fighter.lower() == pick_lower and odds is not None:
-                p_true = _implied_probability(odds)
-                break
+        # EV of a unit stake at every book's price at once; max() keeps the first of equal EVs
+        p_true = _implied_probability(truth)
+        evs = [p_true * _american_to_profit(price) - (1 - p_true) if price is not None else None for price in column]
+        best = max((i for i, ev in enumerate(evs) if ev is not None), key=evs.__getitem__)
 
-        if p_true is None:
-            entry["bestOdds"] = None
-            continue
+        entry.best_odds = BestOdds(
+            ground_truth_prob=round(p_true, 4),
+            platform=sportsbooks.book_name(odds.books[best]),
+            odds=column[best],
+            ev=round(evs[best], 4),
+        )
 
-        best_platform, best_ev, best_odds = None, None, None
-        for platform, lines in odds_data.items():
-            for fighter, odds in lines.items():
-                if fighter.lower() == pick_lower and odds is not None:
-                    ev = p_true * _american_to_profit(odds) - (1 - p_true) * 1
-                    if best_ev is None or ev > best_ev:
-                        best_ev = ev
-                        best_platform = platform
-                        best_odds = odds
-
-        entry["bestOdds"] = {
-            "groundTruthProb": round(p_true, 4),
-            "bestOdds": {"platform": best_platform, "odds": best_odds},
-            "bestEv": round(best_ev, 4) if best_ev is not None else None,
-        }
+
+def _event_offer_table(resp):
+    """Return the eventOfferTable from a GraphQL response, or None if it is missing."""
+    if not resp.ok:
+        return None
+    return (resp.json().get("data") or {}).get("eventOfferTable")
 
 
-def scrape_fightodds(event_pk):
-    """Fetch odds from fightodds.io GraphQL API for the given event PK."""
+@profiling.traced('fightodds.scrape')
+def scrape_fightodds(event_pk, rate_limiter=None, resilience=None, archive=None):
+    """Fetch odds from fightodds.io GraphQL API for the given event PK (archive: an optional Archive)."""
+    import requests
+
+    rate_limiter = rate_limiter or RateLimiter()
+    resilience = resilience or Resilience()
     query = """
     query EventOddsQuery($eventPk: Int!) {
       eventOfferTable(pk: $eventPk) {
@@ -127,35 +150,52 @@ def scrape_fightodds(event_pk):
         "query": query,
         "variables": {"eventPk": int(event_pk)},
     }
-    edges = None
-    for attempt in range(1, _MAX_ATTEMPTS + 1):
+    archive_body = json.dumps(payload, sort_keys=True)
+
+    def _send():
+        rate_limiter.acquire(constants.FIGHTODDS_GQL)
         resp = requests.post(
             constants.FIGHTODDS_GQL,
             json=payload,
             headers={"Content-Type": "application/json"},
             timeout=60,
         )
-        resp.raise_for_status()
-        body = resp.json()
-        event_offer_table = (body.get("data") or {}).get("eventOfferTable")
-        if event_offer_table is not None:
-            edges = (event_offer_table.get("fightOffers") or {}).get("edges", [])
-            break
-        if attempt < _MAX_ATTEMPTS:
-            print(
-                f"  fightodds.io returned no data for event {event_pk} "
-                f"(attempt {attempt}/{_MAX_ATTEMPTS}), retrying...",
-                file=sys.stderr,
-            )
-            time.sleep(_RETRY_DELAY)
-
-    if edges is None:
+        if resp.status_code == 429:
+            # The bucket blocks the next acquire() until Retry-After has passed
+            rate_limiter.throttled(constants.FIGHTODDS_GQL, parse_retry_after(resp.headers.get("Retry-After")))
+        else:
+            rate_limiter.succeeded(constants.FIGHTODDS_GQL)
+        return resp
+
+    if archive is not None and archive.replaying:
+        resp = archive.replay("POST", constants.FIGHTODDS_GQL, archive_body)
+    else:
+        # The API intermittently answers 200 with a null eventOfferTable; retry those too
+        resp = resilience.call(
+            constants.FIGHTODDS_GQL,
+            _send,
+            retry_if=lambda r: r.ok and _event_offer_table(r) is None,
+        )
+        if archive is not None:
+            archive.record("POST", constants.FIGHTODDS_GQL, archive_body, resp)
+    resp.raise_for_status()
+    return _parse_offers(_event_offer_table(resp), event_pk, resilience.policy.max_attempts)
+
+
+def _parse_offers(event_offer_table, event_pk, attempts=1) -> list[OddsQuote]:
+    """
+    Flatten an eventOfferTable into one OddsQuote per bout, its books resolved to registry IDs.
+    Quotes from books the registry does not know are skipped, with one warning naming them.
+    """
+    if event_offer_table is None:
         raise RuntimeError(
             f"fightodds.io returned no eventOfferTable for event PK {event_pk} "
-            f"after {_MAX_ATTEMPTS} attempts (possible transient API issue or invalid PK)."
+            f"after {attempts} attempts (possible transient API issue or invalid PK)."
         )
+    edges = (event_offer_table.get("fightOffers") or {}).get("edges", [])
 
     result = []
+    unknown = {}
     for edge in edges:
         node = edge.get("node", {})
         f1_data = node.get("fighter1", {})
@@ -164,72 +204,71 @@ def scrape_fightodds(event_pk):
             continue
         fo_f1 = f"{f1_data['firstName']} {f1_data['lastName']}"
         fo_f2 = f"{f2_data['firstName']} {f2_data['lastName']}"
-        books = {}
+        odds = OddsTable()
         for offer_edge in node.get("straightOffers", {}).get("edges", []):
             offer = offer_edge.get("node", {})
             short = (offer.get("sportsbook") or {}).get("shortName")
             if not short:
                 continue
+            book = sportsbooks.book_id(short)
+            if book is None:
+                unknown[short] = unknown.get(short, 0) + 1
+                continue
             o1 = (offer.get("outcome1") or {}).get("odds")
             o2 = (offer.get("outcome2") or {}).get("odds")
             if o1 is not None or o2 is not None:
-                books[short] = {fo_f1: o1, fo_f2: o2}
-        if books:
-            result.append({"f1": fo_f1, "f2": fo_f2, "books": books})
+                odds.add(book, o1, o2)
+        if odds:
+            result.append(OddsQuote(fighter1=fo_f1, fighter2=fo_f2, odds=odds))
+    if unknown:
+        names = ", ".join(f"'{short}'" for short in sorted(unknown))
+        print(f"  Warning: skipped {sum(unknown.values())} quotes from sportsbooks not in constants.SPORTSBOOKS: "
+              f"{names}. Add them at the end of the registry (never renumber existing IDs) to keep their odds.")
     return result
 
 
-def update_odds_in_json(card_id, fightodds_fights, json_path=constants.JSON_PATH):
+def update_odds_in_json(card_id, fightodds_fights: list[OddsQuote], store):
     """Match fightodds fights to card fights by last name and write odds into cards.json."""
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    card = next((c for c in data["cards"] if c["id"] == card_id), None)
-    if not card:
-        print(f"Error: Card '{card_id}' not found in {json_path}")
-        return
-
-    fights = card.get("fights", {})
-    matched = 0
-
-    for fo_fight in fightodds_fights:
-        fo_f1, fo_f2 = fo_fight["f1"], fo_fight["f2"]
-
-        matched_key = None
-        for matchup in fights:
-            card_f1, card_f2 = matchup.split(" vs. ", 1)
-            if (_names_match(card_f1, fo_f1) and _names_match(card_f2, fo_f2)) or \
-               (_names_match(card_f1, fo_f2) and _names_match(card_f2, fo_f1)):
-                matched_key = matchup
-                break
-
-        if not matched_key:
-            print(f"  Warning: No match for '{fo_f1} vs {fo_f2}'")
-            continue
-
-        card_f1, card_f2 = matched_key.split(" vs. ", 1)
-        fo_to_card = {fo_f1: card_f1, fo_f2: card_f2} if _names_match(card_f1, fo_f1) \
-                     else {fo_f1: card_f2, fo_f2: card_f1}
-
-        odds = {}
-        for book_name, book_odds in fo_fight["books"].items():
-            odds[book_name] = {
-                fo_to_card[fo_f1]: book_odds.get(fo_f1),
-                fo_to_card[fo_f2]: book_odds.get(fo_f2),
-            }
-        fights[matched_key]["odds"] = odds
-        matched += 1
-        print(f"  {matched_key} — {len(odds)} books")
+    with store.transaction():
+        card = store.get(card_id)
+        if not card:
+            print(f"Error: Card '{card_id}' not found in {store.json_path}")
+            return
+
+        card = Card.from_json(card)
+        fights = card.fights or {}
+        matched = 0
+
+        for fo_fight in fightodds_fights:
+            fo_f1, fo_f2 = fo_fight.fighter1, fo_fight.fighter2
+
+            matched_key = None
+            for matchup in fights:
+                card_f1, card_f2 = matchup.split(" vs. ", 1)
+                if (_names_match(card_f1, fo_f1) and _names_match(card_f2, fo_f2)) or \
+                   (_names_match(card_f1, fo_f2) and _names_match(card_f2, fo_f1)):
+                    matched_key = matchup
+                    break
+
+            if not matched_key:
+                print(f"  Warning: No match for '{fo_f1} vs {fo_f2}'")
+                continue
 
-    compute_best_odds(fights)
+            # Orient the columns to the card's matchup key: odds1 on its first fighter
+            card_f1 = matched_key.split(" vs. ", 1)[0]
+            odds = fo_fight.odds if _names_match(card_f1, fo_f1) else fo_fight.odds.swapped()
+            fights[matched_key].odds = odds
+            matched += 1
+            print(f"  {matched_key} — {len(odds)} books")
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        compute_best_odds(fights)
+        card.fights = fights
+        store.upsert(card_id, {"fights": card.to_json()["fights"]})
 
     print(f"\nOdds written for {matched}/{len(fightodds_fights)} fights in '{card_id}'")
 
 
-def run(args):
+def run(args, rate_limiter=None, resilience=None, archive=None):
     """Execute fightodds scraping based on parsed CLI args."""
     pk_match = re.search(r"(\d+)", args.event)
     if not pk_match:
@@ -238,7 +277,14 @@ def run(args):
     event_pk = pk_match.group(1)
 
     print(f"Scraping odds for event PK {event_pk}...")
-    fightodds_fights = scrape_fightodds(event_pk)
+    fightodds_fights = scrape_fightodds(event_pk, rate_limiter, resilience, archive)
     print(f"Found {len(fightodds_fights)} fights with odds\n")
 
-    update_odds_in_json(args.card_id, fightodds_fights)
+    # Imported here: card storage and site publishing are only needed once odds are in hand,
+    # and keeping them off the module's imports keeps --fightodds startup within budget
+    from scraping.card_store import open_cards
+    from scraping.site_data import write_site_data
+
+    with contextlib.closing(open_cards(db_path=args.card_db)) as store:
+        update_odds_in_json(args.card_id, fightodds_fights, store)
+        write_site_data(store, [args.card_id])
@@ -0,0 +1,562 @@
+"""
+Models — typed, slotted records for what the scrapers return and what cards.json holds.
+
+EventScraper implementations return these instead of free-form dicts:
+
+    Event          — scrape_event(): name, date, location and its Fights
+    Fight          — one bout of an event, with its result in recap mode
+    Bout           — one bout from scrape_event_research(), with profile URLs
+    FighterProfile — scrape_fighter(): record, streak and RecentFights
+    RecentFight    — one of a fighter's most recent bouts
+    OddsQuote      — one bout's moneylines from fightodds.io
+
+and a card from cards.json is read into Card → CardFight → Prediction /
+Result / OddsTable / BestOdds where a command starts working on it. Every class
+declares __slots__: no per-instance __dict__, field names stored once on
+the class instead of as keys in every record, so a backfill holding
+thousands of profiles or fights costs a fraction of the equivalent dicts.
+A misspelt field fails where it is written instead of as a KeyError
+further down. The classes are written out by hand rather than generated
+with @dataclass(slots=True): dataclass code generation at import time
+alone would take fightodds past its startup budget (bench_startup.py).
+
+to_json() returns the record in today's JSON schema (cards.json, research
+notes, the fighter store), keys in the order those files use, so writing a
+model back changes no bytes. from_json() reads that shape and raises
+ModelError naming the path of a missing or unknown key. Keys the files
+sometimes leave out altogether (a card without 'fights', a fight without
+'odds' or 'bestOdds', a result without 'time') read as ABSENT, which is
+falsy and which to_json() leaves out again; None is written as null.
+
+Odds are held by column (OddsTable): the registry IDs of the books quoting
+a bout (sportsbooks.py) and, in the same order, each book's American
+moneyline on fighter1 and on fighter2 of the matchup key, so no fighter or
+book name is repeated per quote. Cards written before the columns keyed
+odds by book name, then fighter name; Card.from_json() still reads that
+shape and converts it (OddsTable.from_books), so the next write stores
+the columns. by_book() gives the old shape back for anything that wants it.
+
+Public API:
+    Event, Fight, Bout, FighterProfile, RecentFight, OddsQuote
+    Card, CardFight, Prediction, Result, OddsTable, BestOdds
+      .to_json()                 → dict in the JSON schema
+      .from_json(data, path)     → record (classmethod; path prefixes ModelError messages)
+      .replace(**changes)        → copy with some fields changed
+    Fight.matchup / Bout.matchup → 'Fighter One vs. Fighter Two', the cards.json fight key
+    OddsTable.from_books(books, fighter1, fighter2, path)  → table from {book name: {fighter: odds}}
+    OddsTable.by_book(fighter1, fighter2)  → {book name: {fighter: odds}}
+    OddsTable.quote(book)        → (odds1, odds2), or None when book has no quote
+    OddsTable.add(book, odds1, odds2) / .swapped() → sides exchanged
+    ABSENT                       — an optional key the JSON leaves out (not the same as null)
+    ModelError
+"""
+from scraping import sportsbooks
+
+
+class ModelError(ValueError):
+    """JSON that does not match the schema a model reads."""
+
+
+class _Absent:
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return 'ABSENT'
+
+    def __reduce__(self) -> str:
+        return 'ABSENT'
+
+
+ABSENT = _Absent()
+
+
+class _Model:
+    """Field-wise repr, equality and replace() over the subclass's __slots__."""
+    __slots__ = ()
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def replace(self, **changes):
+        copy = object.__new__(type(self))
+        for name in self.__slots__:
+            setattr(copy, name, changes.pop(name) if name in changes else getattr(self, name))
+        if changes:
+            raise TypeError(f'{type(self).__name__} has no field {next(iter(changes))!r}')
+        return copy
+
+
+def _check(data, path: str, keys: tuple[str, ...], optional: tuple[str, ...] = ()) -> dict:
+    """data itself, once it is an object holding every key in keys and nothing outside keys + optional."""
+    if not isinstance(data, dict):
+        raise ModelError(f'{path}: expected an object, got {type(data).__name__}')
+    for key in keys:
+        if key not in data:
+            raise ModelError(f'{path}: missing {key!r}')
+    if len(data) > len(keys):
+        for key in data:
+            if key not in keys and key not in optional:
+                raise ModelError(f'{path}: unknown key {key!r}')
+    return data
+
+
+# ----------------------------------------------------------------------
+# Scraped records
+# ----------------------------------------------------------------------
+
+class Fight(_Model):
+    __slots__ = ('card_placement', 'fighter1', 'fighter2', 'method_of_victory', 'time_of_victory')
+
+    def __init__(
+        self,
+        card_placement: str,
+        fighter1: str,
+        fighter2: str,
+        method_of_victory: str | None = None,
+        time_of_victory: str | None = None,
+    ) -> None:
+        self.card_placement = card_placement        # 'Main Card' | 'Prelims' | 'Early Prelims'
+        self.fighter1 = fighter1
+        self.fighter2 = fighter2
+        self.method_of_victory = method_of_victory  # None in preview mode and for bouts not yet fought
+        self.time_of_victory = time_of_victory      # e.g. 'R2 0:15'
+
+    @property
+    def matchup(self) -> str:
+        return f'{self.fighter1} vs. {self.fighter2}'
+
+    def to_json(self) -> dict:
+        return {
+            'card_placement': self.card_placement,
+            'fighter1': self.fighter1,
+            'fighter2': self.fighter2,
+            'method_of_victory': self.method_of_victory,
+            'time_of_victory': self.time_of_victory,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'fight') -> 'Fight':
+        _check(data, path, ('card_placement', 'fighter1', 'fighter2'), ('method_of_victory', 'time_of_victory'))
+        return cls(
+            data['card_placement'], data['fighter1'], data['fighter2'],
+            data.get('method_of_victory'), data.get('time_of_victory'),
+        )
+
+
+class Event(_Model):
+    __slots__ = ('event_name', 'date', 'location', 'fights')
+
+    def __init__(self, event_name: str, date: str, location: str, fights: list[Fight] | None = None) -> None:
+        self.event_name = event_name  # e.g. 'UFC 329: McGregor vs. Holloway 2'
+        self.date = date              # ISO YYYY-MM-DD
+        self.location = location
+        self.fights = fights if fights is not None else []
+
+    def to_json(self) -> dict:
+        return {
+            'event_name': self.event_name,
+            'date': self.date,
+            'location': self.location,
+            'fights': [fight.to_json() for fight in self.fights],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'event') -> 'Event':
+        _check(data, path, ('event_name', 'date', 'location', 'fights'))
+        return cls(
+            data['event_name'], data['date'], data['location'],
+            [Fight.from_json(f, f'{path}/fights/{i}') for i, f in enumerate(data['fights'])],
+        )
+
+
+class Bout(_Model):
+    __slots__ = ('fighter1_name', 'fighter1_url', 'fighter2_name', 'fighter2_url', 'weight_class', 'card_placement')
+
+    def __init__(
+        self,
+        fighter1_name: str,
+        fighter1_url: str | None,
+        fighter2_name: str,
+        fighter2_url: str | None,
+        weight_class: str,
+        card_placement: str,
+    ) -> None:
+        self.fighter1_name = fighter1_name
+        self.fighter1_url = fighter1_url  # profile page, or None when the event page does not link one
+        self.fighter2_name = fighter2_name
+        self.fighter2_url = fighter2_url
+        self.weight_class = weight_class
+        self.card_placement = card_placement
+
+    @property
+    def matchup(self) -> str:
+        return f'{self.fighter1_name} vs. {self.fighter2_name}'
+
+    def to_json(self) -> dict:
+        return {
+            'fighter1_name': self.fighter1_name,
+            'fighter1_url': self.fighter1_url,
+            'fighter2_name': self.fighter2_name,
+            'fighter2_url': self.fighter2_url,
+            'weight_class': self.weight_class,
+            'card_placement': self.card_placement,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'bout') -> 'Bout':
+        _check(data, path, ('fighter1_name', 'fighter1_url', 'fighter2_name', 'fighter2_url',
+                            'weight_class', 'card_placement'))
+        return cls(
+            data['fighter1_name'], data['fighter1_url'], data['fighter2_name'], data['fighter2_url'],
+            data['weight_class'], data['card_placement'],
+        )
+
+
+class RecentFight(_Model):
+    __slots__ = ('result', 'opponent', 'method', 'date')
+
+    def __init__(self, result: str, opponent: str | None, method: str | None, date: str | None) -> None:
+        self.result = result  # 'Win' | 'Loss' | 'Draw' | 'NC'
+        self.opponent = opponent
+        self.method = method
+        self.date = date      # e.g. 'December 13, 2025'
+
+    def to_json(self) -> dict:
+        return {'result': self.result, 'opponent': self.opponent, 'method': self.method, 'date': self.date}
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'recent_fight') -> 'RecentFight':
+        _check(data, path, ('result', 'opponent', 'method', 'date'))
+        return cls(data['result'], data['opponent'], data['method'], data['date'])
+
+
+class FighterProfile(_Model):
+    __slots__ = ('name', 'profile_url', 'record', 'streak', 'recent_fights', 'history', 'error')
+
+    def __init__(
+        self,
+        name: str,
+        profile_url: str | None,
+        record: str | None = None,
+        streak: str | None = None,
+        recent_fights: list[RecentFight] | None = None,
+        history: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.name = name
+        self.profile_url = profile_url
+        self.record = record    # 'W-L-D', e.g. '22-7-0'
+        self.streak = streak    # e.g. '3 Win'
+        self.recent_fights = recent_fights if recent_fights is not None else []
+        self.history = history  # Sherdog only: {fields, rows}, see sherdog.py
+        self.error = error      # why the profile could not be scraped
+
+    def to_json(self) -> dict:
+        data = {
+            'name': self.name,
+            'profile_url': self.profile_url,
+            'record': self.record,
+            'streak': self.streak,
+            'recent_fights': [fight.to_json() for fight in self.recent_fights],
+        }
+        if self.history is not None:
+            data['history'] = self.history
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'profile') -> 'FighterProfile':
+        _check(data, path, ('name', 'profile_url', 'record', 'streak', 'recent_fights'), ('history', 'error'))
+        return cls(
+            data['name'], data['profile_url'], data['record'], data['streak'],
+            [RecentFight.from_json(f, f'{path}/recent_fights/{i}') for i, f in enumerate(data['recent_fights'])],
+            data.get('history'), data.get('error'),
+        )
+
+
+class OddsQuote(_Model):
+    __slots__ = ('fighter1', 'fighter2', 'odds')
+
+    def __init__(self, fighter1: str, fighter2: str, odds: 'OddsTable') -> None:
+        self.fighter1 = fighter1  # names as fightodds.io spells them
+        self.fighter2 = fighter2
+        self.odds = odds          # odds1 on fighter1, odds2 on fighter2
+
+    def to_json(self) -> dict:
+        return {'fighter1': self.fighter1, 'fighter2': self.fighter2, 'odds': self.odds.to_json()}
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'quote') -> 'OddsQuote':
+        _check(data, path, ('fighter1', 'fighter2', 'odds'))
+        return cls(data['fighter1'], data['fighter2'], OddsTable.from_json(data['odds'], f'{path}/odds'))
+
+
+# ----------------------------------------------------------------------
+# cards.json
+# ----------------------------------------------------------------------
+
+class Prediction(_Model):
+    __slots__ = ('winner', 'method')
+
+    def __init__(self, winner: str | None, method: str | None) -> None:
+        self.winner = winner  # '' until the pick is filled in
+        self.method = method
+
+    def to_json(self) -> dict:
+        return {'winner': self.winner, 'method': self.method}
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'prediction') -> 'Prediction':
+        _check(data, path, ('winner', 'method'))
+        return cls(data['winner'], data['method'])
+
+
+class Result(_Model):
+    __slots__ = ('winner', 'method', 'time')
+
+    def __init__(self, winner: str | None, method: str | None, time: str | None | _Absent = ABSENT) -> None:
+        self.winner = winner  # a fighter, 'draw' or 'no contest'
+        self.method = method
+        self.time = time
+
+    def to_json(self) -> dict:
+        data = {'winner': self.winner, 'method': self.method}
+        if self.time is not ABSENT:
+            data['time'] = self.time
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'result') -> 'Result':
+        _check(data, path, ('winner', 'method'), ('time',))
+        return cls(data['winner'], data['method'], data.get('time', ABSENT))
+
+
+class OddsTable(_Model):
+    __slots__ = ('books', 'odds1', 'odds2')
+
+    def __init__(
+        self,
+        books: list[int] | None = None,
+        odds1: list[int | None] | None = None,
+        odds2: list[int | None] | None = None,
+    ) -> None:
+        self.books = books if books is not None else []  # sportsbook registry IDs, one per quote
+        self.odds1 = odds1 if odds1 is not None else []  # American odds on fighter1, None when not offered
+        self.odds2 = odds2 if odds2 is not None else []  # American odds on fighter2
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def add(self, book: int, odds1: int | None, odds2: int | None) -> None:
+        """Append book's quote, or replace it in place if book is already quoted."""
+        if book in self.books:
+            i = self.books.index(book)
+            self.odds1[i], self.odds2[i] = odds1, odds2
+            return
+        self.books.append(book)
+        self.odds1.append(odds1)
+        self.odds2.append(odds2)
+
+    def quote(self, book: int) -> tuple[int | None, int | None] | None:
+        if book not in self.books:
+            return None
+        i = self.books.index(book)
+        return self.odds1[i], self.odds2[i]
+
+    def swapped(self) -> 'OddsTable':
+        """The same quotes with fighter1 and fighter2 exchanged."""
+        return OddsTable(list(self.books), list(self.odds2), list(self.odds1))
+
+    def by_book(self, fighter1: str, fighter2: str) -> dict[str, dict[str, int | None]]:
+        return {
+            sportsbooks.book_name(book): {fighter1: odds1, fighter2: odds2}
+            for book, odds1, odds2 in zip(self.books, self.odds1, self.odds2)
+        }
+
+    @classmethod
+    def from_books(cls, books: dict, fighter1: str, fighter2: str, path: str = 'odds') -> 'OddsTable':
+        """
+        Convert {book name: {fighter: odds}}, the shape cards.json used
+        before the columns. A line that names only one of the fighters
+        exactly gives its other value to the other fighter, and a line
+        naming neither is about another bout and is dropped.
+        """
+        if not isinstance(books, dict):
+            raise ModelError(f'{path}: expected an object, got {type(books).__name__}')
+        table = cls()
+        for name, lines in books.items():
+            book = sportsbooks.book_id(name)
+            if book is None:
+                raise ModelError(f'{path}: unknown sportsbook {name!r} (add it to constants.SPORTSBOOKS)')
+            if not isinstance(lines, dict):
+                raise ModelError(f'{path}/{name}: expected an object, got {type(lines).__name__}')
+            if fighter1 not in lines and fighter2 not in lines:
+                continue
+            others = [odds for fighter, odds in lines.items() if fighter not in (fighter1, fighter2)]
+            odds1 = lines[fighter1] if fighter1 in lines else (others[0] if others else None)
+            odds2 = lines[fighter2] if fighter2 in lines else (others[0] if others else None)
+            table.add(book, odds1, odds2)
+        return table
+
+    def to_json(self) -> dict:
+        return {'books': self.books, 'odds1': self.odds1, 'odds2': self.odds2}
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'odds') -> 'OddsTable':
+        _check(data, path, ('books', 'odds1', 'odds2'))
+        books, odds1, odds2 = data['books'], data['odds1'], data['odds2']
+        if not (isinstance(books, list) and isinstance(odds1, list) and isinstance(odds2, list)):
+            raise ModelError(f'{path}: books, odds1 and odds2 must be arrays')
+        if not len(books) == len(odds1) == len(odds2):
+            raise ModelError(f'{path}: books, odds1 and odds2 differ in length')
+        unknown = sportsbooks.unknown_books(books)
+        if unknown:
+            raise ModelError(f'{path}: unknown sportsbook ID {unknown[0]!r}')
+        return cls(books, odds1, odds2)
+
+
+class BestOdds(_Model):
+    __slots__ = ('ground_truth_prob', 'platform', 'odds', 'ev')
+
+    def __init__(self, ground_truth_prob: float, platform: str | None, odds: int | None, ev: float | None) -> None:
+        self.ground_truth_prob = ground_truth_prob  # the pick's probability implied by the ground-truth book
+        self.platform = platform                    # the book with the best EV for the pick
+        self.odds = odds
+        self.ev = ev
+
+    def to_json(self) -> dict:
+        return {
+            'groundTruthProb': self.ground_truth_prob,
+            'bestOdds': {'platform': self.platform, 'odds': self.odds},
+            'bestEv': self.ev,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'bestOdds') -> 'BestOdds':
+        _check(data, path, ('groundTruthProb', 'bestOdds', 'bestEv'))
+        best = _check(data['bestOdds'], f'{path}/bestOdds', ('platform', 'odds'))
+        return cls(data['groundTruthProb'], best['platform'], best['odds'], data['bestEv'])
+
+
+class CardFight(_Model):
+    __slots__ = ('prediction', 'result', 'odds', 'best_odds')
+
+    def __init__(
+        self,
+        prediction: Prediction | None,
+        result: Result | None = None,
+        odds: OddsTable | None | _Absent = ABSENT,
+        best_odds: BestOdds | None | _Absent = ABSENT,
+    ) -> None:
+        self.prediction = prediction
+        self.result = result
+        self.odds = odds
+        self.best_odds = best_odds
+
+    def to_json(self) -> dict:
+        data = {
+            'prediction': self.prediction.to_json() if self.prediction else None,
+            'result': self.result.to_json() if self.result else None,
+        }
+        if self.odds is not ABSENT:
+            data['odds'] = self.odds.to_json() if self.odds is not None else None
+        if self.best_odds is not ABSENT:
+            data['bestOdds'] = self.best_odds.to_json() if self.best_odds else None
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'fight', matchup: str | None = None) -> 'CardFight':
+        """matchup ('A vs. B') lets odds in the pre-column shape be converted (see OddsTable.from_books)."""
+        _check(data, path, ('prediction', 'result'), ('odds', 'bestOdds'))
+        prediction, result = data['prediction'], data['result']
+        odds, best = data.get('odds', ABSENT), data.get('bestOdds', ABSENT)
+        if odds is not None and odds is not ABSENT:
+            if matchup is not None and isinstance(odds, dict) and 'books' not in odds:
+                odds = OddsTable.from_books(odds, *matchup.split(' vs. ', 1), path=f'{path}/odds')
+            else:
+                odds = OddsTable.from_json(odds, f'{path}/odds')
+        return cls(
+            Prediction.from_json(prediction, f'{path}/prediction') if prediction is not None else None,
+            Result.from_json(result, f'{path}/result') if result is not None else None,
+            odds,
+            best if best is None or best is ABSENT else BestOdds.from_json(best, f'{path}/bestOdds'),
+        )
+
+
+class Card(_Model):
+    __slots__ = (
+        'id', 'title', 'subtitle', 'date', 'rating', 'poster', 'recap_url', 'preview_url', 'location',
+        'event_time', 'fights',
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str | None,
+        subtitle: str | None,
+        date: str,
+        rating: float | None,
+        poster: str | None,
+        recap_url: str | None,
+        preview_url: str | None,
+        location: str | None,
+        event_time: str | None,
+        fights: dict[str, CardFight] | _Absent = ABSENT,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.subtitle = subtitle
+        self.date = date      # ISO YYYY-MM-DD
+        self.rating = rating
+        self.poster = poster
+        self.recap_url = recap_url
+        self.preview_url = preview_url
+        self.location = location
+        self.event_time = event_time
+        self.fights = fights  # keyed by matchup, in card order
+
+    def to_json(self) -> dict:
+        data = {
+            'id': self.id,
+            'title': self.title,
+            'subtitle': self.subtitle,
+            'date': self.date,
+            'rating': self.rating,
+            'poster': self.poster,
+            'recapUrl': self.recap_url,
+            'previewUrl': self.preview_url,
+            'location': self.location,
+            'eventTime': self.event_time,
+        }
+        if self.fights is not ABSENT:
+            data['fights'] = {matchup: fight.to_json() for matchup, fight in self.fights.items()}
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict, path: str = 'card') -> 'Card':
+        _check(data, path, ('id', 'title', 'subtitle', 'date', 'rating', 'poster', 'recapUrl', 'previewUrl',
+                            'location', 'eventTime'), ('fights',))
+        path = f'{path}/{data["id"]}'
+        fights = data.get('fights', ABSENT)
+        if fights is not ABSENT:
+            if not isinstance(fights, dict):
+                raise ModelError(f'{path}/fights: expected an object, got {type(fights).__name__}')
+            fights = {
+                matchup: CardFight.from_json(fight, f'{path}/fights/{matchup}', matchup)
+                for matchup, fight in fights.items()
+            }
+        return cls(
+            data['id'], data['title'], data['subtitle'], data['date'], data['rating'], data['poster'],
+            data['recapUrl'], data['previewUrl'], data['location'], data['eventTime'], fights,
+        )
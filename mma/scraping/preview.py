@@ -1,55 +1,53 @@
-import json
-import os
+import contextlib
 from types import SimpleNamespace
 
 from scraping import constants
+from scraping import profiling
 from scraping import utils
+from scraping.card_store import open_cards
 from scraping.event_scraper import EventScraper
-
-
-def _build_odds_scaffold(fighter1, fighter2):
-    return {platform: {fighter1: None, fighter2: None} for platform in constants.PLATFORMS}
-
-
-def _update_json_with_preview(preview_card, json_path=constants.JSON_PATH):
-    if os.path.exists(json_path):
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    else:
-        data = {"cards": []}
-
-    existing_index = None
-    for i, card in enumerate(data['cards']):
-        if card['id'] == preview_card['id']:
-            existing_index = i
-            break
-
-    if existing_index is not None:
-        data['cards'][existing_index]['previewUrl'] = preview_card['previewUrl']
-        if not data['cards'][existing_index].get('location'):
-            data['cards'][existing_index]['location'] = preview_card['location']
-        if not data['cards'][existing_index].get('eventTime'):
-            data['cards'][existing_index]['eventTime'] = preview_card['eventTime']
-        if not data['cards'][existing_index].get('fights') and preview_card.get('fights'):
-            data['cards'][existing_index]['fights'] = preview_card['fights']
-    else:
-        data['cards'].insert(0, preview_card)
-
-    data['cards'].sort(key=lambda x: x['date'], reverse=True)
-
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-
-def _generate_preview_template(event_data):
+from scraping.models import Card
+from scraping.models import CardFight
+from scraping.models import Event
+from scraping.models import OddsTable
+from scraping.models import Prediction
+from scraping.site_data import write_site_data
+
+
+def _build_odds_scaffold():
+    books = list(constants.PREVIEW_BOOKS)
+    return OddsTable(books, [None] * len(books), [None] * len(books))
+
+
+def _update_json_with_preview(preview_card: Card, store):
+    with store.transaction():
+        existing = store.get(preview_card.id)
+
+        if existing is not None:
+            existing = Card.from_json(existing)
+            new = preview_card.to_json()
+            fields = {'previewUrl': new['previewUrl']}
+            if not existing.location:
+                fields['location'] = new['location']
+            if not existing.event_time:
+                fields['eventTime'] = new['eventTime']
+            if not existing.fights and preview_card.fights:
+                fields['fights'] = new['fights']
+            store.upsert(preview_card.id, fields)
+        else:
+            store.put(preview_card.to_json())
+
+
+@profiling.traced('preview.render')
+def _generate_preview_template(event_data: Event):
     sections = {}
-    for fight in event_data['fights']:
-        section = fight['card_placement']
+    for fight in event_data.fights:
+        section = fight.card_placement
         if section not in sections:
             sections[section] = []
         sections[section].append(fight)
 
-    html = constants.HTML_HEAD.format(title=f"{event_data['event_name']} Preview", js_file='preview.js')
+    html = constants.HTML_HEAD.format(title=f"{event_data.event_name} Preview", js_file='preview.js')
     html += '''\
     <h2 id="table-of-contents">Table of Contents</h2>
     <ul class="toc">
@@ -58,19 +56,19 @@ def _generate_preview_template(event_data):
     for section, fights in sections.items():
         html += f'      <li><strong>{section} Picks</strong>\n        <ul>\n'
         for fight in fights:
-            fight_id = f"{fight['fighter1'].lower().replace(' ', '-')}-vs-{fight['fighter2'].lower().replace(' ', '-')}"
-            html += f'          <li><a href="#{fight_id}">{fight["fighter1"]} vs. {fight["fighter2"]}</a></li>\n'
+            fight_id = f"{fight.fighter1.lower().replace(' ', '-')}-vs-{fight.fighter2.lower().replace(' ', '-')}"
+            html += f'          <li><a href="#{fight_id}">{fight.matchup}</a></li>\n'
         html += '        </ul>\n      </li>\n'
 
     html += constants.PREVIEW_OVERVIEW_SECTION
     for section, fights in sections.items():
         html += f'      <h2 id="{section.lower().replace(" ", "-")}-picks">{section} Picks</h2>\n      \n'
         for fight in fights:
-            fight_id = f"{fight['fighter1'].lower().replace(' ', '-')}-vs-{fight['fighter2'].lower().replace(' ', '-')}"
+            fight_id = f"{fight.fighter1.lower().replace(' ', '-')}-vs-{fight.fighter2.lower().replace(' ', '-')}"
             html += constants.PREVIEW_FIGHT_DIV.format(
                 fight_id=fight_id,
-                fighter1=fight['fighter1'],
-                fighter2=fight['fighter2'],
+                fighter1=fight.fighter1,
+                fighter2=fight.fighter2,
             )
     html += constants.PREVIEW_BETTING
     return html
@@ -81,39 +79,40 @@ def run(args: SimpleNamespace, event_scraper: EventScraper):
     print("Scraping event data...")
     event_data = event_scraper.scrape_event(args.url, mode='preview')
 
-    print(f"\nEvent: {event_data['event_name']}")
-    print(f"Date: {event_data['date']}")
-    print(f"Location: {event_data['location']}")
-    print(f"Fights found: {len(event_data['fights'])}\n")
+    print(f"\nEvent: {event_data.event_name}")
+    print(f"Date: {event_data.date}")
+    print(f"Location: {event_data.location}")
+    print(f"Fights found: {len(event_data.fights)}\n")
 
-    card_id = utils.generate_card_id(event_data['event_name'])
+    card_id = utils.generate_card_id(event_data.event_name)
     print(f"Generated card ID: {card_id}\n")
 
     fights = {}
-    for fight in event_data['fights']:
-        matchup = f"{fight['fighter1']} vs. {fight['fighter2']}"
-        fights[matchup] = {
-            "prediction": {"winner": "", "method": ""},
-            "result": None,
-            "odds": _build_odds_scaffold(fight['fighter1'], fight['fighter2']),
-        }
-
-    title, subtitle = utils.extract_title(event_data['event_name'])
-    preview_card = {
-        "id": card_id,
-        "title": title,
-        "subtitle": subtitle,
-        "date": event_data['date'],
-        "rating": None,
-        "poster": f"/mma/db/img/{card_id.replace('-', '_')}_poster.jpg",
-        "recapUrl": None,
-        "previewUrl": f"db/previews/{card_id}.html",
-        "location": event_data['location'],
-        "eventTime": event_data['date'],
-        "fights": fights,
-    }
-
-    _update_json_with_preview(preview_card)
+    for fight in event_data.fights:
+        fights[fight.matchup] = CardFight(
+            prediction=Prediction(winner="", method=""),
+            result=None,
+            odds=_build_odds_scaffold(),
+        )
+
+    title, subtitle = utils.extract_title(event_data.event_name)
+    preview_card = Card(
+        id=card_id,
+        title=title,
+        subtitle=subtitle,
+        date=event_data.date,
+        rating=None,
+        poster=f"/mma/db/img/{card_id.replace('-', '_')}_poster.jpg",
+        recap_url=None,
+        preview_url=f"db/previews/{card_id}.html",
+        location=event_data.location,
+        event_time=event_data.date,
+        fights=fights,
+    )
+
+    with contextlib.closing(open_cards(db_path=args.card_db)) as store:
+        _update_json_with_preview(preview_card, store)
+        write_site_data(store, [card_id])
 
     preview_html = _generate_preview_template(event_data)
     preview_filename = f"./mma/db/previews/{card_id}.html"
@@ -121,6 +120,7 @@ def run(args: SimpleNamespace, event_scraper: EventScraper):
         f.write(preview_html)
 
     print(f"✓ JSON updated with preview URL")
+    print(f"✓ Site data updated: {constants.CARDS_SHARD_DIR}/{card_id}.json")
     print(f"✓ Preview template generated: {preview_filename}")
     print(f"✓ Poster filename: {card_id.replace('-', '_')}_poster.jpg")
     print(f"\n📋 Next steps:")
@@ -0,0 +1,245 @@
+"""
+Profiling — lightweight spans recording time, bytes and memory per stage.
+
+Code marks its stages with span() (or the traced() decorator); nothing is
+recorded until enable() is called, and a disabled span costs one global
+lookup. Each finished span records:
+
+  • wall time, and the thread it ran on
+  • bytes handled (added by the stage via Span.add_bytes)
+  • peak traced memory above the stage's starting point (tracemalloc),
+    for stages on the main thread when memory tracing is on; work done by
+    worker threads is counted in the enclosing main-thread stage
+  • free-form attributes (url, status, time-to-headers, ...)
+
+summary() aggregates spans by name into a per-stage table, and
+write_trace() writes them in the Chrome trace-event format, which opens
+in chrome://tracing or ui.perfetto.dev.
+
+Usage:
+    profiling.enable()
+    with profiling.span('fetch', url=url) as sp:
+        body = download(url)
+        sp.add_bytes(len(body))
+
+    @profiling.traced('wikipedia.scrape_event')
+    def scrape_event(...): ...
+
+    profiling.print_summary()
+    profiling.write_trace('profile.json')
+
+Public API:
+    span(name, **attrs)      — context manager yielding a Span
+    traced(name)             — decorator form of span()
+    enable(trace_memory=True), disable(), enabled()
+    summary()                — [{stage, calls, total_ms, mean_ms, bytes, peak_kb}]
+    print_summary(file=None)
+    write_trace(path)
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'start', 'duration', 'bytes', 'peak_memory', 'thread',
+                 '_mem_start', '_child_peak')
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.bytes = 0
+        self.peak_memory: int | None = None
+        self.thread = threading.get_ident()
+        self._mem_start = 0
+        self._child_peak = 0
+
+    def add_bytes(self, n: int) -> None:
+        self.bytes += n
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    """Stands in for a Span while profiling is disabled."""
+
+    def add_bytes(self, n: int) -> None:
+        pass
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Recorder:
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._main_thread = threading.main_thread().ident
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stack(self) -> list[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def measures_memory(self, sp: Span) -> bool:
+        return self.trace_memory and sp.thread == self._main_thread
+
+    def finish(self, sp: Span) -> None:
+        with self._lock:
+            self.spans.append(sp)
+
+
+_recorder: _Recorder | None = None
+
+
+class _ActiveSpan:
+    __slots__ = ('_span',)
+
+    def __init__(self, name: str, attrs: dict):
+        self._span = Span(name, attrs)
+
+    def __enter__(self) -> Span:
+        rec = _recorder
+        sp = self._span
+        stack = rec.stack()
+        if rec.measures_memory(sp):
+            current, peak = tracemalloc.get_traced_memory()
+            # tracemalloc has one global peak: fold the running peak into the
+            # parent before resetting it for this stage
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+            sp._mem_start = current
+        stack.append(sp)
+        sp.start = time.perf_counter()
+        return sp
+
+    def __exit__(self, *exc) -> None:
+        rec = _recorder
+        sp = self._span
+        sp.duration = time.perf_counter() - sp.start
+        stack = rec.stack()
+        if stack and stack[-1] is sp:
+            stack.pop()
+        if rec.measures_memory(sp):
+            peak = max(tracemalloc.get_traced_memory()[1], sp._child_peak)
+            sp.peak_memory = max(0, peak - sp._mem_start)
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        rec.finish(sp)
+
+
+def enable(trace_memory: bool = True) -> None:
+    """Start recording spans; with trace_memory, also start tracemalloc."""
+    global _recorder
+    _recorder = _Recorder(trace_memory)
+
+
+def disable() -> None:
+    """Stop recording and drop recorded spans."""
+    global _recorder
+    if _recorder is not None and _recorder.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _recorder = None
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def span(name: str, **attrs):
+    """Context manager timing one stage; yields a Span (a no-op stand-in when disabled)."""
+    if _recorder is None:
+        return _NULL_SPAN
+    return _ActiveSpan(name, attrs)
+
+
+def traced(name: str):
+    """Decorator recording every call of the wrapped function as a span called name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _ActiveSpan(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary() -> list[dict]:
+    """Aggregate recorded spans by name, in order of first appearance."""
+    if _recorder is None:
+        return []
+    rows: dict[str, dict] = {}
+    for sp in sorted(_recorder.spans, key=lambda s: s.start):
+        row = rows.setdefault(sp.name, {
+            'stage': sp.name, 'calls': 0, 'total_ms': 0.0, 'bytes': 0, 'peak_kb': None,
+        })
+        row['calls'] += 1
+        row['total_ms'] += sp.duration * 1000
+        row['bytes'] += sp.bytes
+        if sp.peak_memory is not None:
+            row['peak_kb'] = max(row['peak_kb'] or 0, sp.peak_memory // 1024)
+    for row in rows.values():
+        row['mean_ms'] = row['total_ms'] / row['calls']
+    return list(rows.values())
+
+
+def print_summary(file=None) -> None:
+    """Print the per-stage summary table."""
+    file = file or sys.stdout
+    print(f'\n{"stage":<40} {"calls":>6} {"total ms":>10} {"mean ms":>9} {"bytes":>11} {"peak KB":>9}', file=file)
+    for row in summary():
+        peak = '-' if row['peak_kb'] is None else f'{row["peak_kb"]:,}'
+        print(
+            f'{row["stage"]:<40} {row["calls"]:>6} {row["total_ms"]:>10.1f} {row["mean_ms"]:>9.1f} '
+            f'{row["bytes"]:>11,} {peak:>9}',
+            file=file,
+        )
+
+
+def write_trace(path: str) -> None:
+    """Write recorded spans as Chrome trace events ('X' complete events, times in µs)."""
+    if _recorder is None:
+        return
+    events = []
+    for sp in sorted(_recorder.spans, key=lambda s: s.start):
+        args = {k: v if isinstance(v, (int, float, bool, type(None))) else str(v) for k, v in sp.attrs.items()}
+        args['bytes'] = sp.bytes
+        if sp.peak_memory is not None:
+            args['peak_memory'] = sp.peak_memory
+        events.append({
+            'name': sp.name,
+            'ph':   'X',
+            'ts':   round((sp.start - _recorder.origin) * 1e6, 1),
+            'dur':  round(sp.duration * 1e6, 1),
+            'pid':  os.getpid(),
+            'tid':  sp.thread,
+            'args': args,
+        })
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,128 @@
+"""
+RateLimiter — per-source token buckets that pace outgoing requests.
+
+Each host gets its own TokenBucket with a sustained `rate` (requests per
+second) and a `burst` allowance, configured in constants.RATE_LIMITS.
+A request takes one token before it goes out; cache hits never reach the
+limiter, so they cost nothing.
+
+Buckets adapt to throttling. A 429 (or any response carrying Retry-After)
+halves the bucket's current rate, empties it, and blocks it until the
+Retry-After deadline. Each later success recovers a tenth of the configured
+rate, until the bucket is back to its configured pace.
+
+Public API:
+    RateLimiter(limits)             — limits: {host: (rate, burst)}
+    RateLimiter.acquire(url)        — block until a request to url may go out
+    RateLimiter.throttled(url, retry_after)
+    RateLimiter.succeeded(url)
+    TokenBucket(rate, burst)
+    parse_retry_after(value)        — Retry-After header → seconds, or None
+"""
+import datetime
+import threading
+import time
+from urllib.parse import urlsplit
+
+from scraping import constants
+
+# Throttling never slows a bucket below this fraction of its configured rate
+_MIN_RATE_FRACTION = 0.1
+_RECOVERY_FRACTION = 0.1
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Convert a Retry-After header to seconds from now.
+
+      '120'                            → 120.0
+      'Wed, 21 Oct 2026 07:28:00 GMT'  → seconds until that time (>= 0)
+      None / unparseable               → None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    import email.utils  # only HTTP-date values need it; keeps the module cheap to import
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._current_rate = rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self._current_rate)
+            time.sleep(wait)
+            waited += wait
+
+    def throttle(self, retry_after: float | None) -> None:
+        """Slow down after a 429: halve the rate and block until retry_after elapses."""
+        with self._lock:
+            self._current_rate = max(self.rate * _MIN_RATE_FRACTION, self._current_rate / 2)
+            self._tokens = 0.0
+            delay = retry_after if retry_after is not None else 1 / self._current_rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    def recover(self) -> None:
+        """Step the rate back toward its configured value after a successful request."""
+        with self._lock:
+            self._current_rate = min(self.rate, self._current_rate + self.rate * _RECOVERY_FRACTION)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._current_rate)
+        self._updated = now
+
+
+class RateLimiter:
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None):
+        self._limits: dict[str, tuple[float, int]] = dict(constants.RATE_LIMITS)
+        if limits:
+            self._limits.update(limits)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to url's host may be sent. Returns seconds waited."""
+        return self._bucket(url).acquire()
+
+    def throttled(self, url: str, retry_after: float | None = None) -> None:
+        """Record a 429 / Retry-After response from url's host."""
+        self._bucket(url).throttle(retry_after)
+
+    def succeeded(self, url: str) -> None:
+        """Record a successful response from url's host."""
+        self._bucket(url).recover()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._limits.get(host, constants.DEFAULT_RATE_LIMIT)
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
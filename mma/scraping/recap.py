@@ -5,33 +5,43 @@ Scrapes result data, merges it with any existing predictions and odds in
 cards.json, and writes a populated HTML template to mma/db/recaps/.
 
 Public API:
-    run(args, event_scraper)  — args.url, args.rating
+    run(args, event_scraper)  — args.url, args.rating, args.card_db (SQLite card database path or None)
 """
-import json
-import os
+import contextlib
 import re
 from types import SimpleNamespace
 
 from scraping import constants
+from scraping import profiling
 from scraping import utils
+from scraping.card_store import open_cards
 from scraping.event_scraper import EventScraper
-
-
-def _find_fight(fights, fighter1, fighter2):
+from scraping.models import ABSENT
+from scraping.models import Card
+from scraping.models import CardFight
+from scraping.models import Event
+from scraping.models import Fight
+from scraping.models import Prediction
+from scraping.models import Result
+from scraping.site_data import write_site_data
+
+
+def _find_fight(fights: dict[str, CardFight], fighter1: str, fighter2: str) -> tuple[CardFight | None, bool]:
+    """The card fight between fighter1 and fighter2, and whether its matchup key names fighter2 first."""
     key1 = f"{fighter1} vs. {fighter2}"
     key2 = f"{fighter2} vs. {fighter1}"
     if key1 in fights:
-        return fights[key1]
+        return fights[key1], False
     if key2 in fights:
-        return fights[key2]
+        return fights[key2], True
     for matchup, fight in fights.items():
         if fighter1.lower() in matchup.lower() and fighter2.lower() in matchup.lower():
-            return fight
-    return None
+            return fight, fighter1.lower() not in matchup.split(" vs. ", 1)[0].lower()
+    return None, False
 
 
-def _update_json_metadata(event_data, card_id, rating, fights=None, json_path=constants.JSON_PATH):
-    event_name = event_data['event_name']
+def _update_json_metadata(event_data: Event, card_id, rating, store, fights: dict[str, CardFight] | None = None):
+    event_name = event_data.event_name
 
     if 'fight night' in event_name.lower():
         title = "UFC Fight Night"
@@ -45,61 +55,76 @@ def _update_json_metadata(event_data, card_id, rating, fights=None, json_path=co
             title = event_name
             subtitle = None
 
-    new_card = {
-        "id": card_id,
-        "title": title,
-        "subtitle": subtitle,
-        "date": event_data['date'],
-        "rating": float(rating),
-        "poster": f"/mma/db/img/{card_id.replace('-', '_')}_poster.jpg",
-        "recapUrl": f"db/recaps/{card_id}.html",
-        "previewUrl": None,
-        "location": event_data['location'],
-        "eventTime": event_data['date'],
-        "fights": fights or {},
-    }
-
-    if os.path.exists(json_path):
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    else:
-        data = {"cards": []}
-
-    existing_card = None
-    for i, card in enumerate(data['cards']):
-        if card['id'] == card_id:
-            existing_card = i
-            break
+    new_card = Card(
+        id=card_id,
+        title=title,
+        subtitle=subtitle,
+        date=event_data.date,
+        rating=float(rating),
+        poster=f"/mma/db/img/{card_id.replace('-', '_')}_poster.jpg",
+        recap_url=f"db/recaps/{card_id}.html",
+        preview_url=None,
+        location=event_data.location,
+        event_time=event_data.date,
+        fights=fights or {},
+    )
+
+    existing_card = store.get(card_id)
 
     if existing_card is not None:
         print(f"Updating existing card: {card_id}")
-        if not fights and data['cards'][existing_card].get('fights'):
-            new_card['fights'] = data['cards'][existing_card]['fights']
-        if data['cards'][existing_card]['previewUrl'] is not None:
-            new_card['previewUrl'] = data['cards'][existing_card]['previewUrl']
-        data['cards'][existing_card] = new_card
+        existing_card = Card.from_json(existing_card)
+        if not fights and existing_card.fights:
+            new_card.fights = existing_card.fights
+        if existing_card.preview_url is not None:
+            new_card.preview_url = existing_card.preview_url
     else:
         print(f"Adding new card: {card_id}")
-        data['cards'].insert(0, new_card)
-
-    data['cards'].sort(key=lambda x: x['date'], reverse=True)
+    store.put(new_card.to_json())
+    store.save()
 
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    print(f"Updated JSON metadata at {json_path}")
+    print(f"Updated JSON metadata at {store.json_path}")
     return new_card
 
 
-def _generate_recap_template(event_data):
+def _merge_results(scraped_fights: list[Fight], existing_fights: dict[str, CardFight]) -> dict[str, CardFight]:
+    """Card fights for the scraped results, keeping each bout's existing prediction and odds."""
+    fights = {}
+    for fight in scraped_fights:
+        existing, reversed_key = _find_fight(existing_fights, fight.fighter1, fight.fighter2)
+        prediction = existing.prediction if existing else Prediction(winner="", method="")
+        existing_odds = existing.odds if existing else None
+        if existing_odds and reversed_key:
+            # The odds columns follow the matchup key, which is rewritten in the scraped order
+            existing_odds = existing_odds.swapped()
+        existing_best_odds = existing.best_odds if existing else None
+        method = fight.method_of_victory
+        if method and 'draw' in method.lower():
+            winner = 'draw'
+        elif method and 'no contest' in method.lower():
+            winner = 'no contest'
+        else:
+            winner = fight.fighter1
+        result = Result(winner=winner, method=method, time=fight.time_of_victory) if method else None
+        fights[fight.matchup] = CardFight(
+            prediction=prediction,
+            result=result,
+            odds=existing_odds or ABSENT,
+            best_odds=existing_best_odds or ABSENT,
+        )
+    return fights
+
+
+@profiling.traced('recap.render')
+def _generate_recap_template(event_data: Event):
     sections = {}
-    for fight in event_data['fights']:
-        section = fight['card_placement']
+    for fight in event_data.fights:
+        section = fight.card_placement
         if section not in sections:
             sections[section] = []
         sections[section].append(fight)
 
-    html = constants.HTML_HEAD.format(title=f"{event_data['event_name']} Recap", js_file='recap.js')
+    html = constants.HTML_HEAD.format(title=f"{event_data.event_name} Recap", js_file='recap.js')
     html += '''\
     <div class="rating-container event-rating">
       <div class="rating-bar">
@@ -118,8 +143,8 @@ def _generate_recap_template(event_data):
     for section, fights in sections.items():
         html += f'        <li><strong>{section}</strong>\n          <ul>\n'
         for fight in fights:
-            fight_id = f"{fight['fighter1'].lower().replace(' ', '-')}-vs-{fight['fighter2'].lower().replace(' ', '-')}"
-            html += f'            <li><a href="#{fight_id}">{fight["fighter1"]} vs. {fight["fighter2"]}</a></li>\n'
+            fight_id = f"{fight.fighter1.lower().replace(' ', '-')}-vs-{fight.fighter2.lower().replace(' ', '-')}"
+            html += f'            <li><a href="#{fight_id}">{fight.matchup}</a></li>\n'
         html += '          </ul>\n        </li>\n'
     html += '        <li><a href="#betting-results">Betting Results</a></li>\n'
     html += '      </ul>\n      <br>\n\n'
@@ -128,13 +153,13 @@ def _generate_recap_template(event_data):
     for section, fights in sections.items():
         html += f'      <h2 id="{section.lower().replace(" ", "-")}">{section}</h2>\n      \n'
         for fight in fights:
-            fight_id = f"{fight['fighter1'].lower().replace(' ', '-')}-vs-{fight['fighter2'].lower().replace(' ', '-')}"
+            fight_id = f"{fight.fighter1.lower().replace(' ', '-')}-vs-{fight.fighter2.lower().replace(' ', '-')}"
             html += constants.RECAP_FIGHT_DIV.format(
                 fight_id=fight_id,
-                fighter1=fight['fighter1'],
-                fighter2=fight['fighter2'],
-                method=fight['method_of_victory'],
-                time=fight['time_of_victory'],
+                fighter1=fight.fighter1,
+                fighter2=fight.fighter2,
+                method=fight.method_of_victory,
+                time=fight.time_of_victory,
             )
     html += constants.RECAP_BETTING
     return html
@@ -145,51 +170,25 @@ def run(args: SimpleNamespace, event_scraper: EventScraper):
     print("Scraping event data...")
     event_data = event_scraper.scrape_event(args.url, mode='recap')
 
-    print(f"\nEvent: {event_data['event_name']}")
-    print(f"Date: {event_data['date']}")
-    print(f"Location: {event_data['location']}")
-    print(f"Fights found: {len(event_data['fights'])}\n")
+    print(f"\nEvent: {event_data.event_name}")
+    print(f"Date: {event_data.date}")
+    print(f"Location: {event_data.location}")
+    print(f"Fights found: {len(event_data.fights)}\n")
 
-    card_id = utils.generate_card_id(event_data['event_name'])
+    card_id = utils.generate_card_id(event_data.event_name)
     print(f"Generated card ID: {card_id}\n")
 
-    existing_fights = {}
-    if os.path.exists(constants.JSON_PATH):
-        with open(constants.JSON_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        for card in data['cards']:
-            if card['id'] == card_id:
-                existing_fights = card.get('fights', {})
-                break
-
-    fights = {}
-    for fight in event_data['fights']:
-        matchup = f"{fight['fighter1']} vs. {fight['fighter2']}"
-        existing = _find_fight(existing_fights, fight['fighter1'], fight['fighter2'])
-        prediction = existing['prediction'] if existing else {"winner": "", "method": ""}
-        existing_odds = existing.get('odds') if existing else None
-        existing_best_odds = existing.get('bestOdds') if existing else None
-        method = fight.get('method_of_victory')
-        if method and 'draw' in method.lower():
-            winner = 'draw'
-        elif method and 'no contest' in method.lower():
-            winner = 'no contest'
-        else:
-            winner = fight['fighter1']
-        result = {
-            "winner": winner,
-            "method": method,
-            "time": fight['time_of_victory'],
-        } if method else None
-        entry = {"prediction": prediction, "result": result}
-        if existing_odds:
-            entry['odds'] = existing_odds
-        if existing_best_odds:
-            entry['bestOdds'] = existing_best_odds
-        fights[matchup] = entry
-
-    _update_json_metadata(event_data, card_id, args.rating, fights)
+    with contextlib.closing(open_cards(db_path=args.card_db)) as store:
+        # Read the existing predictions and odds under the lock, so a concurrent
+        # --fightodds cannot update them between this read and the write
+        with store.transaction():
+            existing_card = store.get(card_id)
+            existing_fights = Card.from_json(existing_card).fights if existing_card else {}
+            fights = _merge_results(event_data.fights, existing_fights or {})
+            _update_json_metadata(event_data, card_id, args.rating, store, fights)
+        write_site_data(store, [card_id])
     print(f"✓ JSON metadata updated")
+    print(f"✓ Site data updated: {constants.CARDS_SHARD_DIR}/{card_id}.json")
 
     html_content = _generate_recap_template(event_data)
     filename = f"./mma/db/recaps/{card_id}.html"
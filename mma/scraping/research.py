@@ -5,15 +5,30 @@ For each fighter on the card, fetches record, current streak, and last 5 fights
 from their profile page. Saves the result to ./mma/notes/<card-id>.json and
 prints the file path.
 
+Research is incremental. When a notes file for the card already exists,
+each fighter's current page revision is looked up (one cheap metadata
+query per 50 fighters, see EventScraper.fighter_revisions) and compared
+with the revision recorded in the notes. Only fighters who are new to the
+card, whose page changed, or whose last scrape failed are refetched; the
+rest keep their stored profile. args.full_refresh refetches everyone.
+
+With a FighterStore, profiles scraped for any earlier card are reused too,
+under the store's staleness policy (FighterStore.is_current), and every
+freshly scraped profile is saved back to it.
+
 Public API:
-    run(args, event_scraper)  — args.url
+    run(args, event_scraper, store=None)  — args.url, args.full_refresh (optional)
 """
-import json
 import os
 from types import SimpleNamespace
 
+from scraping import codec
+from scraping import profiling
 from scraping import utils
 from scraping.event_scraper import EventScraper
+from scraping.fighter_store import FighterStore
+from scraping.models import FighterProfile
+from scraping.models import ModelError
 
 
 def _bout_key(f1: str, f2: str) -> str:
@@ -21,49 +36,122 @@ def _bout_key(f1: str, f2: str) -> str:
     return f'{camel(f1)}Vs{camel(f2)}'
 
 
-def run(args: SimpleNamespace, event_scraper: EventScraper):
+def _load_notes(notes_path: str) -> dict | None:
+    try:
+        with open(notes_path, 'rb') as f:
+            return codec.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _reusable_profiles(
+    notes: dict | None,
+    revisions: dict[str, int],
+    urls: list[str],
+    store: FighterStore | None,
+) -> dict[str, FighterProfile]:
+    """
+    Profiles from earlier runs that are still current, keyed by profile URL.
+
+    From the card's notes, a profile is reusable when it scraped cleanly and
+    its page's recorded revision equals the current one (and it still reads
+    as a FighterProfile). Fighters without a
+    page are cheap to rebuild and are never reused. The store fills in
+    the remaining URLs under its own staleness policy.
+    """
+    reusable = {}
+    if notes:
+        previous = notes.get('revisions', {})
+        for bout in notes.get('bouts', {}).values():
+            for profile in (bout.get('fighter1'), bout.get('fighter2')):
+                url = (profile or {}).get('profile_url')
+                if not url or profile.get('error'):
+                    continue
+                if url in revisions and previous.get(url) == revisions[url]:
+                    try:
+                        reusable[url] = FighterProfile.from_json(profile)
+                    except ModelError:
+                        continue
+    if store is not None:
+        missing = [url for url in urls if url not in reusable]
+        for url, stored in store.get_many(missing).items():
+            if store.is_current(stored, revisions.get(url)):
+                reusable[url] = stored.profile
+    return reusable
+
+
+def run(args: SimpleNamespace, event_scraper: EventScraper, store: FighterStore | None = None):
     """Scrape fighter profiles and save structured research notes for a UFC event."""
     event_name, bouts = event_scraper.scrape_event_research(args.url)
     if not bouts:
         raise RuntimeError('No bouts found on event page.')
 
+    card_id = utils.generate_card_id(event_name)
+    notes_dir = './mma/notes'
+    notes_path = f'{notes_dir}/{card_id}.json'
+
     seen: set[str] = set()
     fighters_to_fetch: list[tuple[str, str]] = []
     for bout in bouts:
         for name, url in (
-            (bout['fighter1_name'], bout['fighter1_url']),
-            (bout['fighter2_name'], bout['fighter2_url']),
+            (bout.fighter1_name, bout.fighter1_url),
+            (bout.fighter2_name, bout.fighter2_url),
         ):
             if name not in seen:
                 fighters_to_fetch.append((name, url))
                 seen.add(name)
 
-    print(f'\nScraping {len(fighters_to_fetch)} fighter profiles...')
+    urls = [url for _, url in fighters_to_fetch if url]
+    try:
+        revisions = event_scraper.fighter_revisions(urls)
+    except Exception as exc:
+        print(f'\nWarning: could not look up page revisions ({exc}); refetching every fighter')
+        revisions = {}
+
+    reusable = {}
+    if not getattr(args, 'full_refresh', False):
+        reusable = _reusable_profiles(_load_notes(notes_path), revisions, urls, store)
+    # The card's spelling of the name wins over the one stored with the profile
     profiles = {
-        name: event_scraper.scrape_fighter(name, url)
+        name: reusable[url].replace(name=name)
         for name, url in fighters_to_fetch
+        if url in reusable
     }
+    fighters_to_fetch = [(name, url) for name, url in fighters_to_fetch if name not in profiles]
 
-    card_id = utils.generate_card_id(event_name)
+    if profiles:
+        print(f'\n{len(profiles)} fighter profiles unchanged since they were last scraped')
+    print(f'\nScraping {len(fighters_to_fetch)} fighter profiles...')
+    scraped = event_scraper.scrape_fighters(fighters_to_fetch)
+    profiles.update(zip((name for name, _ in fighters_to_fetch), scraped))
+    if store is not None:
+        store.put_many(scraped, event_scraper.source, revisions)
+
+    failed = [p for p in profiles.values() if p.error]
+    if failed:
+        print(f'\nWarning: {len(failed)} fighter profile(s) could not be scraped:')
+        for profile in failed:
+            print(f'  {profile.name}: {profile.error}')
 
     output = {
         'event_name': event_name,
         'card_id': card_id,
         'bouts': {
-            _bout_key(bout['fighter1_name'], bout['fighter2_name']): {
-                'card_placement': bout['card_placement'],
-                'weight_class': bout['weight_class'],
-                'fighter1': profiles[bout['fighter1_name']],
-                'fighter2': profiles[bout['fighter2_name']],
+            _bout_key(bout.fighter1_name, bout.fighter2_name): {
+                'card_placement': bout.card_placement,
+                'weight_class': bout.weight_class,
+                'fighter1': profiles[bout.fighter1_name].to_json(),
+                'fighter2': profiles[bout.fighter2_name].to_json(),
             }
             for bout in bouts
         },
     }
+    if revisions:
+        output['revisions'] = {url: revisions[url] for url in urls if url in revisions}
 
-    notes_dir = './mma/notes'
     os.makedirs(notes_dir, exist_ok=True)
-    notes_path = f'{notes_dir}/{card_id}.json'
-    with open(notes_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    with profiling.span('notes.dump', path=notes_path) as sp:
+        with open(notes_path, 'wb') as f:
+            sp.add_bytes(codec.write_stream(f, output, indent=2))
 
     print(f'\nNotes saved to {notes_path}')
@@ -0,0 +1,186 @@
+"""
+Resilience — shared retry / backoff / circuit-breaker layer for outgoing requests.
+
+Resilience.call(url, send) runs `send` (one request attempt) and retries it
+when the attempt fails transiently:
+
+  • the attempt raised an OSError — requests' ConnectionError / Timeout
+    and friends are OSError subclasses
+  • the attempt returned a response with a retryable status (429, 5xx)
+  • the caller's retry_if(result) predicate says the result is unusable
+
+Between attempts it sleeps with full-jitter exponential backoff
+(uniform(0, min(max_delay, base_delay * 2**attempt))). A Retry-After header
+sets a floor on the sleep.
+
+Each host has a CircuitBreaker. After `failure_threshold` consecutive
+failed attempts the circuit opens, and calls to that host fail fast with
+CircuitOpenError for `reset_timeout` seconds. Then a single trial request
+is let through (half-open); its outcome closes or re-opens the circuit.
+One flaky host therefore cannot stall a concurrent run. A call whose own
+failure opens the circuit stops retrying and ends as its last attempt did
+(response returned, exception re-raised); only a call that never got to
+send fails with CircuitOpenError.
+
+Public API:
+    Resilience(policy, failure_threshold, reset_timeout)
+    Resilience.call(url, send, retry_if=None)
+    RetryPolicy(max_attempts, base_delay, max_delay)
+    CircuitBreaker(failure_threshold, reset_timeout)
+    CircuitOpenError
+    describe_failure(exc)   — short failure reason for output records
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from scraping import constants
+from scraping.ratelimit import parse_retry_after
+
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def describe_failure(exc: BaseException) -> str:
+    """
+    Short, human-readable failure reason.
+
+      HTTPError('503 Server Error: ...')  → 'HTTPError: 503 Server Error: ...'
+      CircuitOpenError('...')             → 'CircuitOpenError: ...'
+    """
+    message = str(exc).splitlines()[0] if str(exc) else ''
+    return f'{type(exc).__name__}: {message}' if message else type(exc).__name__
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = constants.RETRY_MAX_ATTEMPTS
+    base_delay: float = constants.RETRY_BASE_DELAY
+    max_delay: float = constants.RETRY_MAX_DELAY
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to sleep before retry number `attempt` (0-based)."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = constants.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = constants.CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Whether the circuit is open or half-open, i.e. requests are currently being held back."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (closed, or half-open trial slot free)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class Resilience:
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        failure_threshold: int = constants.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = constants.CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.policy = policy or RetryPolicy()
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def call(self, url: str, send, retry_if=None):
+        """
+        Run send() with retries for url's host and return its last result.
+
+        Transient exceptions from the final attempt are re-raised; a final
+        retryable response is returned so the caller can raise_for_status().
+        An attempt that leaves the circuit open is final, and so is an
+        attempt after which another caller opened it.
+        """
+        host = urlsplit(url).hostname or ''
+        breaker = self._breaker(host)
+        result = None
+        error = None
+        for attempt in range(self.policy.max_attempts):
+            if not breaker.allow():
+                if error is not None:
+                    raise error
+                if attempt:
+                    return result
+                raise CircuitOpenError(f'circuit open for {host}: too many recent failures')
+
+            retry_after = None
+            error = None
+            try:
+                result = send()
+            except OSError as exc:
+                breaker.record_failure()
+                if attempt == self.policy.max_attempts - 1 or breaker.is_open():
+                    raise
+                error = exc
+            except Exception:
+                # Not transient: count it against the host, but don't retry
+                breaker.record_failure()
+                raise
+            else:
+                status = getattr(result, 'status_code', None)
+                if status in _RETRYABLE_STATUSES:
+                    breaker.record_failure()
+                    retry_after = parse_retry_after(result.headers.get('Retry-After'))
+                elif retry_if is not None and retry_if(result):
+                    # The host answered; the payload just wasn't usable yet
+                    breaker.record_success()
+                else:
+                    breaker.record_success()
+                    return result
+                if attempt == self.policy.max_attempts - 1 or breaker.is_open():
+                    return result
+
+            time.sleep(self.policy.delay(attempt, retry_after))
+        return result
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self._failure_threshold, self._reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
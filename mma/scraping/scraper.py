@@ -2,31 +2,96 @@
 Scraper — fetch web pages and return BeautifulSoup objects.
 
 Uses cloudscraper when available (Cloudflare bypass), otherwise falls back
-to a plain requests session. Optionally drives a headless Firefox browser
-via Selenium for JavaScript-heavy pages.
+to a plain requests session. Optionally drives a pool of headless Firefox
+browsers via Selenium for JavaScript-heavy pages (see driver_pool.py); in
+that mode fetch() can pull just the regions a scraper needs instead of the
+whole DOM.
+
+An optional HttpCache stores response bodies on disk keyed by URL. Fresh
+entries are served without a request; stale ones are revalidated with
+If-None-Match / If-Modified-Since. In offline mode only the cache is used.
+
+fetch_many() runs a batch of fetches on an asyncio event loop. Each host
+gets its own pooled session and a semaphore capping how many requests are
+in flight against it (constants.HOST_CONCURRENCY); results come back in
+input order.
+
+Fetched pages are parsed by a pluggable backend (constants.HTML_PARSER):
+
+  'html.parser' — bs4's pure-Python parser (slowest; always available)
+  'lxml'        — bs4 on the lxml tree builder
+  'selectolax'  — the lexbor engine cuts the requested regions out of the
+                  page, and only those are built into a bs4 tree (lxml
+                  builder); whole-page fetches fall back to 'lxml'
+  'auto'        — the fastest of the above that is installed
+
+Every backend returns a bs4.BeautifulSoup, so scrapers are backend-agnostic.
+
+Targeted parsing (on by default) builds only the regions a scraper declares
+for a page: the bs4 backends filter the token stream through a SoupStrainer,
+so navboxes, references and prose never become Tag objects. Region
+selectors are restricted to 'tag.class' / '.class' so that both a CSS engine
+and a SoupStrainer can evaluate them.
+
+Every request that actually goes out takes a token from the host's bucket
+in the RateLimiter (constants.RATE_LIMITS). Cache hits skip the limiter.
+429 responses throttle the bucket. Failed attempts (connection errors,
+429 / 5xx) are retried with jittered exponential backoff by the shared
+Resilience layer, which also fails fast on hosts whose circuit is open.
+
+With an Archive attached, every exchange that goes out is recorded to it,
+or, in replay mode, served from it without touching the network (see
+archive.py).
+
+Fetching, HTTP requests, driver loads and parsing are recorded as
+profiling spans (see profiling.py) when profiling is enabled.
 
 Usage:
     s = Scraper()            # cloudscraper or requests (auto-detected)
     s = Scraper(use_driver=True)  # Selenium headless Firefox
+    s = Scraper(use_driver=True, driver_pool_size=3)  # three pooled drivers
+    s = Scraper(parser='lxml')                    # lxml tree builder
+    s = Scraper(targeted=False)                   # always build the whole page
+    s = Scraper(cache=HttpCache())                # on-disk cache, revalidating
+    s = Scraper(cache=HttpCache(offline=True))    # cache-only, no network
+    s = Scraper(archive=Archive('runs/ufc-329', 'record'))  # save every exchange
+    s = Scraper(archive=Archive('runs/ufc-329', 'replay'))  # serve them back offline
 
     soup = s.fetch('https://example.com')
+    soup = s.fetch('https://example.com', regions='table.infobox')  # driver: only the infobox
+    data = s.fetch_json('https://example.com/api?format=json')   # always over HTTP, never the driver
+    data = s.fetch_json('https://example.com/api?format=json', fresh=True)  # skip a fresh cache entry
+    data = s.post_json('https://example.com/api', {'q': '...'})  # form POST, cached by body
+    soups = s.fetch_many(['https://example.com/a', 'https://example.com/b'])
     s.close()
 """
+import hashlib
+import importlib.util
+import re
+import threading
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
 import bs4
 
-try:
-    import cloudscraper as _cloudscraper_mod
-    _HAS_CLOUDSCRAPER = True
-except ImportError:
-    _HAS_CLOUDSCRAPER = False
+from scraping import codec
+from scraping import constants
+from scraping import profiling
+from scraping.archive import Archive
+from scraping.cache import CacheMiss
+from scraping.cache import HttpCache
+from scraping.driver_pool import DriverPool
+from scraping.ratelimit import RateLimiter
+from scraping.ratelimit import parse_retry_after
+from scraping.resilience import Resilience
 
-try:
-    from selenium import webdriver
-    from selenium.webdriver.firefox.options import Options
-    from selenium.webdriver.firefox.service import Service
-    _HAS_SELENIUM = True
-except ImportError:
-    _HAS_SELENIUM = False
+# Optional backends are probed here but only imported on first use, so
+# importing this module stays cheap
+_HAS_LXML = importlib.util.find_spec('lxml') is not None
+_HAS_SELECTOLAX = importlib.util.find_spec('selectolax') is not None
+_HAS_CLOUDSCRAPER = importlib.util.find_spec('cloudscraper') is not None
+
+PARSER_BACKENDS = constants.PARSER_BACKENDS
 
 _DEFAULT_HEADERS = {
     'User-Agent': (
@@ -36,8 +101,76 @@ _DEFAULT_HEADERS = {
     )
 }
 
-_FIREFOX_BINARY = '/snap/firefox/current/usr/lib/firefox/firefox'
-_GECKODRIVER_PATH = '/snap/bin/geckodriver'
+
+def resolve_parser(backend: str) -> str:
+    """Map 'auto' to the fastest installed backend and check that backend is usable."""
+    if backend == 'auto':
+        if _HAS_SELECTOLAX:
+            return 'selectolax'
+        return 'lxml' if _HAS_LXML else 'html.parser'
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f'unknown parser backend {backend!r}; expected one of {PARSER_BACKENDS}')
+    if backend == 'lxml' and not _HAS_LXML:
+        raise RuntimeError('lxml is not installed; cannot use --parser lxml')
+    if backend == 'selectolax' and not _HAS_SELECTOLAX:
+        raise RuntimeError('selectolax is not installed; cannot use --parser selectolax')
+    return backend
+
+
+def region_strainer(regions: str) -> bs4.SoupStrainer:
+    """
+    Build a SoupStrainer keeping every element matched by a region selector list.
+
+      'table.infobox, table.toccolours' → <table> elements with either class
+      '.wins, .loses, table.new_table'  → any tag with one of those classes
+
+    Tags and classes are matched independently, so the strainer may keep a
+    superset of the selector list (e.g. a div.new_table). Scrapers look
+    elements up by tag and class anyway, so the extra elements are harmless.
+    """
+    names: set[str] = set()
+    classes: set[str] = set()
+    any_tag = False
+    for selector in regions.split(','):
+        tag, dot, cls = selector.strip().partition('.')
+        if not dot or not cls or not re.fullmatch(r'[\w-]*', tag) or not re.fullmatch(r'[\w-]+', cls):
+            raise ValueError(f"region selector {selector.strip()!r} must be 'tag.class' or '.class'")
+        if tag:
+            names.add(tag)
+        else:
+            any_tag = True
+        classes.add(cls)
+
+    def _has_region_class(value) -> bool:
+        # While parsing, the class attribute is still the raw space-separated string
+        if not value:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return not classes.isdisjoint(values)
+
+    return bs4.SoupStrainer(name=None if any_tag else sorted(names), class_=_has_region_class)
+
+
+def parse_html(markup: bytes | str, backend: str = 'html.parser', regions: str | None = None) -> bs4.BeautifulSoup:
+    """
+    Parse markup with the given (resolved) backend and return a BeautifulSoup.
+
+    regions is the selector list of the only elements the caller reads. When
+    given, just those subtrees are built: selectolax cuts them out with
+    lexbor, the bs4 backends filter through a SoupStrainer.
+    """
+    builder = 'lxml' if _HAS_LXML else 'html.parser'
+    if backend == 'selectolax':
+        if regions is None:
+            return bs4.BeautifulSoup(markup, builder)
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(markup)
+        fragments = '\n'.join(node.html for node in tree.css(regions))
+        return bs4.BeautifulSoup(f'<html><body>{fragments}</body></html>', builder)
+    if regions is not None:
+        return bs4.BeautifulSoup(markup, backend, parse_only=region_strainer(regions))
+    return bs4.BeautifulSoup(markup, backend)
 
 
 class Scraper:
@@ -45,39 +178,274 @@ class Scraper:
         self,
         use_driver: bool = False,
         headers: dict = None,
+        cache: HttpCache | None = None,
+        host_concurrency: dict[str, int] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        resilience: Resilience | None = None,
+        archive: Archive | None = None,
+        driver_pool_size: int = constants.DRIVER_POOL_SIZE,
+        parser: str = constants.HTML_PARSER,
+        targeted: bool = constants.TARGETED_PARSING,
     ):
         self._headers: dict = headers or _DEFAULT_HEADERS
-        self._driver = None
-        self._session = None
+        self._parser = resolve_parser(parser)
+        self._targeted = targeted
+        self._cache = cache
+        self._rate_limiter = rate_limiter or RateLimiter()
+        self._resilience = resilience or Resilience()
+        self._archive = archive
+        self._host_concurrency: dict[str, int] = dict(constants.HOST_CONCURRENCY)
+        if host_concurrency:
+            self._host_concurrency.update(host_concurrency)
+        self._drivers: DriverPool | None = None
+        self._sessions: dict[str, object] = {}
+        self._sessions_lock = threading.Lock()
 
+        if cache is not None and cache.offline:
+            return
         if use_driver:
-            if not _HAS_SELENIUM:
-                raise RuntimeError('selenium is not installed; cannot use --driver')
-            opts = Options()
-            opts.add_argument('--headless')
-            opts.binary_location = _FIREFOX_BINARY
-            self._driver = webdriver.Firefox(
-                service=Service(_GECKODRIVER_PATH),
-                options=opts,
-            )
-        elif _HAS_CLOUDSCRAPER:
-            self._session = _cloudscraper_mod.create_scraper()
-        else:
-            import requests
-            self._session = requests.Session()
-            self._session.headers.update(self._headers)
-
-    def fetch(self, url: str) -> bs4.BeautifulSoup:
-        """Fetch url and return a BeautifulSoup object."""
-        if self._driver is not None:
-            self._driver.get(url)
-            return bs4.BeautifulSoup(self._driver.page_source, 'html.parser')
-        resp = self._session.get(url, headers=self._headers, timeout=15)
+            self._drivers = DriverPool(driver_pool_size)
+
+    def fetch(self, url: str, regions: str | None = None) -> bs4.BeautifulSoup:
+        """
+        Fetch url and return a BeautifulSoup object.
+
+        regions is an optional CSS selector list naming the only parts of the
+        page the caller reads. In driver mode just those elements are pulled
+        from the browser; otherwise, with targeted parsing on, only those
+        subtrees are built.
+        """
+        if not self._targeted:
+            regions = None
+        with profiling.span('scraper.fetch', url=url) as sp:
+            body = self._fetch_bytes(url, regions)
+            sp.add_bytes(len(body))
+            # Driver-mode bodies are already trimmed to the requested regions
+            if self._drivers is not None:
+                regions = None
+            with profiling.span('scraper.parse', backend=self._parser) as parse_sp:
+                parse_sp.add_bytes(len(body))
+                return parse_html(body, self._parser, regions)
+
+    def fetch_json(self, url: str, fresh: bool = False):
+        """
+        Fetch url over HTTP (even in driver mode) and decode its JSON body.
+
+        With fresh=True a cached entry is revalidated even if it is within
+        its TTL (offline mode still serves it), for metadata that must be current.
+        """
+        with profiling.span('scraper.fetch_json', url=url) as sp:
+            body = self._fetch_bytes(url, via_driver=False, fresh=fresh)
+            sp.add_bytes(len(body))
+            return codec.loads(body)
+
+    def post_json(self, url: str, data: dict):
+        """
+        POST data as a form to url and decode the JSON response.
+
+        Responses are cached under the URL plus a digest of the form body;
+        POSTs carry no validators, so a stale entry is simply refetched.
+        """
+        with profiling.span('scraper.post_json', url=url):
+            return self._post_json(url, urlencode(sorted(data.items())))
+
+    def parse(self, markup: bytes | str, regions: str | None = None) -> bs4.BeautifulSoup:
+        """Parse already-fetched markup with this scraper's backend and targeting settings."""
+        with profiling.span('scraper.parse', backend=self._parser) as sp:
+            sp.add_bytes(len(markup))
+            return parse_html(markup, self._parser, regions if self._targeted else None)
+
+    def fetch_many(
+        self,
+        urls: list[str],
+        regions: str | None = None,
+    ) -> list[bs4.BeautifulSoup | Exception]:
+        """
+        Fetch urls concurrently and return their soups in input order.
+
+        In-flight requests are capped per host by the concurrency limits.
+        A failed fetch yields its exception in place of a soup, so one bad
+        page never discards the rest of the batch.
+        """
+        return self._gather(urls, lambda url: self.fetch(url, regions))
+
+    def fetch_json_many(self, urls: list[str]) -> list[object]:
+        """Concurrent fetch_json over urls; same ordering and error rules as fetch_many."""
+        return self._gather(urls, self.fetch_json)
+
+    def host_limit(self, host: str) -> int:
+        """Maximum concurrent requests allowed against host."""
+        return max(1, self._host_concurrency.get(host, constants.DEFAULT_HOST_CONCURRENCY))
+
+    def _gather(self, urls: list[str], fetch_one) -> list:
+        """Run fetch_one over urls on an event loop, bounded per host; results in input order."""
+        if not urls:
+            return []
+        import asyncio
+
+        return asyncio.run(self._gather_async(urls, fetch_one))
+
+    async def _gather_async(self, urls: list[str], fetch_one) -> list:
+        import asyncio
+
+        semaphores: dict[str, asyncio.Semaphore] = {}
+
+        async def _fetch_one(url: str):
+            host = urlsplit(url).hostname or ''
+            if host not in semaphores:
+                semaphores[host] = asyncio.Semaphore(self.host_limit(host))
+            async with semaphores[host]:
+                return await asyncio.to_thread(fetch_one, url)
+
+        return await asyncio.gather(*(_fetch_one(url) for url in urls), return_exceptions=True)
+
+    def _fetch_bytes(
+        self,
+        url: str,
+        regions: str | None = None,
+        via_driver: bool = True,
+        fresh: bool = False,
+    ) -> bytes:
+        """Return the raw page body for url, going through the cache if one is set."""
+        use_driver = via_driver and self._drivers is not None
+        if self._cache is not None and self._cache.offline:
+            # Offline runs launch no drivers, so look for a driver run's region extract
+            # before the full page
+            entry = self._cache.get(f'{url} [{regions}]') if via_driver and regions else None
+            entry = entry or self._cache.get(url)
+            if entry is None:
+                raise CacheMiss(f'{url} is not cached (offline mode)')
+            return entry.body
+        if not use_driver:
+            regions = None
+        if self._cache is None:
+            return self._download(url, regions, use_driver)
+
+        # Region-only driver extracts are cached apart from the full page
+        key = f'{url} [{regions}]' if regions else url
+        entry = self._cache.get(key)
+        if entry is not None and entry.is_fresh(self._cache.ttl) and not fresh:
+            return entry.body
+
+        # Selenium cannot send conditional requests; refetch and re-store
+        if use_driver:
+            return self._cache.put(key, self._download(url, regions, use_driver)).body
+
+        headers = dict(self._headers)
+        if entry is not None:
+            headers.update(entry.conditional_headers())
+        resp = self._get(url, headers)
+        if resp.status_code == 304 and entry is not None:
+            return self._cache.touch(entry).body
         resp.raise_for_status()
-        return bs4.BeautifulSoup(resp.content, 'html.parser')
+        return self._cache.put(
+            url,
+            resp.content,
+            etag=resp.headers.get('ETag'),
+            last_modified=resp.headers.get('Last-Modified'),
+        ).body
+
+    def _download(self, url: str, regions: str | None = None, use_driver: bool = False) -> bytes:
+        """Unconditionally fetch url over the network."""
+        if use_driver:
+            if self._archive is not None and self._archive.replaying:
+                return self._archive.replay('DRIVER', url, regions).content
+
+            def _load() -> bytes:
+                self._rate_limiter.acquire(url)
+                return self._drivers.get_html(url, regions).encode('utf-8')
+            with profiling.span('driver.load', url=url, regions=regions) as sp:
+                content = self._resilience.call(url, _load)
+                sp.add_bytes(len(content))
+            if self._archive is not None:
+                self._archive.record_content('DRIVER', url, regions, content)
+            return content
+        resp = self._get(url, self._headers)
+        resp.raise_for_status()
+        return resp.content
+
+    def _post_json(self, url: str, body: str):
+        """post_json() body: go through the cache, keyed by URL and form-body digest."""
+        if self._cache is None:
+            return codec.loads(self._post(url, body))
+
+        key = f'POST {url} {hashlib.sha256(body.encode("utf-8")).hexdigest()}'
+        entry = self._cache.get(key)
+        if entry is not None and (self._cache.offline or entry.is_fresh(self._cache.ttl)):
+            return codec.loads(entry.body)
+        if self._cache.offline:
+            raise CacheMiss(f'POST {url} is not cached (offline mode)')
+        return codec.loads(self._cache.put(key, self._post(url, body)).body)
+
+    def _post(self, url: str, body: str) -> bytes:
+        headers = {**self._headers, 'Content-Type': 'application/x-www-form-urlencoded'}
+        resp = self._request('POST', url, headers, body)
+        resp.raise_for_status()
+        return resp.content
+
+    def _get(self, url: str, headers: dict):
+        return self._request('GET', url, headers)
+
+    def _request(self, method: str, url: str, headers: dict, body: str | None = None):
+        """Send a request under the host's rate limit, with retries from the resilience layer."""
+        if self._archive is not None and self._archive.replaying:
+            return self._archive.replay(method, url, body)
+        session = self._session_for(url)
+
+        def _send():
+            self._rate_limiter.acquire(url)
+            resp = session.request(method, url, headers=headers, data=body, timeout=15)
+            retry_after = resp.headers.get('Retry-After')
+            if resp.status_code == 429 or (resp.status_code == 503 and retry_after):
+                self._rate_limiter.throttled(url, parse_retry_after(retry_after))
+            else:
+                self._rate_limiter.succeeded(url)
+            return resp
+
+        with profiling.span('http.request', method=method, url=url) as sp:
+            resp = self._resilience.call(url, _send)
+            # elapsed runs to the end of the headers (connect + server time);
+            # the rest of the span is the body transfer
+            sp.set(status=resp.status_code, headers_ms=round(resp.elapsed.total_seconds() * 1000, 1))
+            sp.add_bytes(len(resp.content))
+        if self._archive is not None:
+            self._archive.record(method, url, body, resp)
+        return resp
+
+    def _session_for(self, url: str):
+        """Return the pooled session for url's host, creating it on first use."""
+        host = urlsplit(url).hostname or ''
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._new_session(self.host_limit(host))
+                self._sessions[host] = session
+            return session
+
+    def _new_session(self, pool_size: int):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if _HAS_CLOUDSCRAPER:
+            import cloudscraper
+
+            # cloudscraper mounts its own TLS adapter; its default pool of 10
+            # connections already covers the per-host limits
+            return cloudscraper.create_scraper()
+        session = requests.Session()
+        session.headers.update(self._headers)
+        # Keep enough connections alive to serve every concurrent slot for the host
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
     def close(self) -> None:
-        """Quit the Selenium driver if one was created."""
-        if self._driver is not None:
-            self._driver.quit()
-            self._driver = None
+        """Close pooled sessions and quit any Selenium drivers that were launched."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        if self._drivers is not None:
+            self._drivers.close()
+            self._drivers = None
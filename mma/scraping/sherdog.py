@@ -9,15 +9,33 @@ Main Card / Prelims / Early Prelims explicitly:
     match >= MAIN_CARD_THRESHOLD  → Main Card
     match >= EARLY_PRELIM_THRESHOLD → Prelims
     otherwise                     → Early Prelims
+
+Fighter profiles come from one walk over the fight-history table, which
+yields the streak, the last five fights and the fighter's whole history.
+The whole history is kept in the profile as compact rows under one field list:
+
+    'history': {
+        'fields': ['result', 'opponent', 'method', 'date', 'event', 'round', 'time'],
+        'rows':   [['Win', 'Opp 0', 'KO (Punches)', '2010-12-01', 'UFC 0', '2', '3:21'], ...],
+    }
+
+one row per bout, most recent first, with ISO dates (the raw text when a
+date cannot be parsed) and None for cells missing from the page.
 """
 import bs4
 import datetime
+import functools
 import re
 import sys
-import time
 
-from scraping import constants
+from scraping import profiling
 from scraping.event_scraper import EventScraper
+from scraping.models import Bout
+from scraping.models import Event
+from scraping.models import Fight
+from scraping.models import FighterProfile
+from scraping.models import RecentFight
+from scraping.resilience import describe_failure
 from scraping.scraper import Scraper
 
 SHERDOG_BASE = 'https://www.sherdog.com'
@@ -25,6 +43,10 @@ SHERDOG_BASE = 'https://www.sherdog.com'
 MAIN_CARD_THRESHOLD = 8   # matches >= this are Main Card (typical Fight Night: 5 main card)
 EARLY_PRELIM_THRESHOLD = 3  # matches < this are Early Prelims
 
+# Fighter-page regions read by the record / streak / history parsers; in
+# driver mode only these elements are pulled from the browser.
+_FIGHTER_REGIONS = '.wins, .loses, .draws, table.new_table'
+
 _STATUS_MAP = {
     'win':  'Win',
     'loss': 'Loss',
@@ -32,6 +54,9 @@ _STATUS_MAP = {
     'nc':   'NC',
 }
 
+# Column order of the rows in a profile's compact 'history'
+HISTORY_FIELDS = ('result', 'opponent', 'method', 'date', 'event', 'round', 'time')
+
 
 def _name_from_slug(href: str) -> str:
     """'/fighter/Ion-Cutelaba-101427' → 'Ion Cutelaba'"""
@@ -40,13 +65,24 @@ def _name_from_slug(href: str) -> str:
     return slug.replace('-', ' ')
 
 
-def _parse_date_display(raw: str) -> str:
-    """'Dec / 13 / 2025' → 'December 13, 2025'"""
+@functools.lru_cache(maxsize=4096)
+def _parse_fight_date(raw: str) -> datetime.date | None:
+    """'Dec / 13 / 2025' → date(2025, 12, 13); None when unparseable."""
     try:
-        dt = datetime.datetime.strptime(raw.replace(' ', ''), '%b/%d/%Y')
-        return dt.strftime('%B %d, %Y')
+        return datetime.datetime.strptime(raw.replace(' ', ''), '%b/%d/%Y').date()
     except ValueError:
-        return raw
+        return None
+
+
+def _first(tag: bs4.Tag, name: str, cls: str | None = None) -> bs4.Tag | None:
+    """
+    First descendant named name (and carrying class cls) — tag.find without
+    building a search filter, which dominates the cost of small lookups.
+    """
+    for element in tag.descendants:
+        if element.name == name and (cls is None or cls in (element.get('class') or ())):
+            return element
+    return None
 
 
 def _card_placement(match_num: int) -> str:
@@ -57,7 +93,13 @@ def _card_placement(match_num: int) -> str:
     return 'Prelims'
 
 
+def _empty_profile(name: str, url: str | None, error: str | None = None) -> FighterProfile:
+    return FighterProfile(name, url, error=error or None)
+
+
 class SherdogEventScraper(EventScraper):
+    source = 'sherdog'
+
     def __init__(self, scraper: Scraper):
         self._scraper = scraper
 
@@ -65,9 +107,11 @@ class SherdogEventScraper(EventScraper):
     # scrape_event — used by preview.py and recap.py
     # ------------------------------------------------------------------
 
-    def scrape_event(self, url: str, mode: str = 'both') -> dict:
-        soup = self._scraper.fetch(url)
+    @profiling.traced('sherdog.scrape_event')
+    def scrape_event(self, url: str, mode: str = 'both') -> Event:
+        return self._parse_event(self._scraper.fetch(url), mode)
 
+    def _parse_event(self, soup: bs4.BeautifulSoup, mode: str) -> Event:
         event_name = self._parse_event_name(soup)
         date = self._parse_date(soup)
         location = self._parse_location(soup)
@@ -87,9 +131,9 @@ class SherdogEventScraper(EventScraper):
                 if fight:
                     fights.append(fight)
 
-        return {'event_name': event_name, 'date': date, 'location': location, 'fights': fights}
+        return Event(event_name, date, location, fights)
 
-    def _parse_main_event_fight(self, sub: bs4.Tag, mode: str) -> dict | None:
+    def _parse_main_event_fight(self, sub: bs4.Tag, mode: str) -> Fight | None:
         left = sub.find('div', class_='left_side')
         right = sub.find('div', class_='right_side')
         if not left or not right:
@@ -122,15 +166,9 @@ class SherdogEventScraper(EventScraper):
                 elif method and time_str:
                     time_val = time_str
 
-        return {
-            'card_placement': 'Main Card',
-            'fighter1': f1_h3.get_text(strip=True),
-            'fighter2': f2_h3.get_text(strip=True),
-            'method_of_victory': method,
-            'time_of_victory': time_val,
-        }
+        return Fight('Main Card', f1_h3.get_text(strip=True), f2_h3.get_text(strip=True), method, time_val)
 
-    def _parse_table_fight(self, row: bs4.Tag, mode: str) -> dict | None:
+    def _parse_table_fight(self, row: bs4.Tag, mode: str) -> Fight | None:
         cols = row.find_all('td')
         if len(cols) < 4:
             return None
@@ -158,19 +196,14 @@ class SherdogEventScraper(EventScraper):
             if method and time_str:
                 time_val = f'R{round_num} {time_str}' if round_num else time_str
 
-        return {
-            'card_placement': _card_placement(match_num),
-            'fighter1': f1_name,
-            'fighter2': f2_name,
-            'method_of_victory': method,
-            'time_of_victory': time_val,
-        }
+        return Fight(_card_placement(match_num), f1_name, f2_name, method, time_val)
 
     # ------------------------------------------------------------------
     # scrape_event_research — used by research.py
     # ------------------------------------------------------------------
 
-    def scrape_event_research(self, url: str) -> tuple[str, list[dict]]:
+    @profiling.traced('sherdog.scrape_event_research')
+    def scrape_event_research(self, url: str) -> tuple[str, list[Bout]]:
         print(f'Fetching event page: {url}', file=sys.stderr)
         soup = self._scraper.fetch(url)
 
@@ -198,7 +231,7 @@ class SherdogEventScraper(EventScraper):
         print(f'Found {len(bouts)} bouts.', file=sys.stderr)
         return event_name, bouts
 
-    def _parse_main_event_research(self, sub: bs4.Tag) -> dict | None:
+    def _parse_main_event_research(self, sub: bs4.Tag) -> Bout | None:
         left = sub.find('div', class_='left_side')
         right = sub.find('div', class_='right_side')
         if not left or not right:
@@ -217,16 +250,16 @@ class SherdogEventScraper(EventScraper):
         weight_el = sub.find('span', class_='weight_class')
         weight_class = weight_el.get_text(strip=True) if weight_el else 'Unknown'
 
-        return {
-            'fighter1_name': f1_name,
-            'fighter1_url': SHERDOG_BASE + f1_link['href'],
-            'fighter2_name': f2_name,
-            'fighter2_url': SHERDOG_BASE + f2_link['href'],
-            'weight_class': weight_class,
-            'card_placement': 'Main Card',
-        }
+        return Bout(
+            fighter1_name=f1_name,
+            fighter1_url=SHERDOG_BASE + f1_link['href'],
+            fighter2_name=f2_name,
+            fighter2_url=SHERDOG_BASE + f2_link['href'],
+            weight_class=weight_class,
+            card_placement='Main Card',
+        )
 
-    def _parse_table_row_research(self, row: bs4.Tag) -> dict | None:
+    def _parse_table_row_research(self, row: bs4.Tag) -> Bout | None:
         cols = row.find_all('td')
         if len(cols) < 4:
             return None
@@ -244,39 +277,68 @@ class SherdogEventScraper(EventScraper):
         weight_el = cols[2].find('span', class_='weight_class')
         weight_class = weight_el.get_text(strip=True) if weight_el else cols[2].get_text(strip=True)
 
-        return {
-            'fighter1_name': _name_from_slug(f1_link['href']),
-            'fighter1_url': SHERDOG_BASE + f1_link['href'],
-            'fighter2_name': _name_from_slug(f2_link['href']),
-            'fighter2_url': SHERDOG_BASE + f2_link['href'],
-            'weight_class': weight_class,
-            'card_placement': _card_placement(match_num),
-        }
+        return Bout(
+            fighter1_name=_name_from_slug(f1_link['href']),
+            fighter1_url=SHERDOG_BASE + f1_link['href'],
+            fighter2_name=_name_from_slug(f2_link['href']),
+            fighter2_url=SHERDOG_BASE + f2_link['href'],
+            weight_class=weight_class,
+            card_placement=_card_placement(match_num),
+        )
 
     # ------------------------------------------------------------------
     # scrape_fighter — used by research.py
     # ------------------------------------------------------------------
 
-    def scrape_fighter(self, name: str, url: str) -> dict:
+    @profiling.traced('sherdog.scrape_fighter')
+    def scrape_fighter(self, name: str, url: str | None) -> FighterProfile:
         print(f'  {name} ...', file=sys.stderr, end=' ', flush=True)
+        if not url:
+            print('no Sherdog page', file=sys.stderr)
+            return _empty_profile(name, None)
         try:
-            soup = self._scraper.fetch(url)
-            record = self._parse_record(soup)
-            streak = self._parse_streak(soup)
-            recent_fights = self._parse_fight_history(soup)
-            print(f'record={record}, streak={streak}, fights={len(recent_fights)}', file=sys.stderr)
-            return {
-                'name': name,
-                'profile_url': url,
-                'record': record,
-                'streak': streak,
-                'recent_fights': recent_fights,
-            }
+            return self._profile_from_page(name, url, self._scraper.fetch(url, regions=_FIGHTER_REGIONS))
         except Exception as exc:
-            print(f'ERROR: {exc}', file=sys.stderr)
-            return {'name': name, 'profile_url': url, 'record': None, 'streak': None, 'recent_fights': []}
-        finally:
-            time.sleep(constants.REQUEST_DELAY)
+            reason = describe_failure(exc)
+            print(f'ERROR: {reason}', file=sys.stderr)
+            return _empty_profile(name, url, error=reason)
+
+    @profiling.traced('sherdog.scrape_fighters')
+    def scrape_fighters(self, fighters: list[tuple[str, str | None]]) -> list[FighterProfile]:
+        pages = iter(self._scraper.fetch_many(
+            [url for _, url in fighters if url],
+            regions=_FIGHTER_REGIONS,
+        ))
+        profiles = []
+        for name, url in fighters:
+            print(f'  {name} ...', file=sys.stderr, end=' ', flush=True)
+            if not url:
+                print('no Sherdog page', file=sys.stderr)
+                profiles.append(_empty_profile(name, None))
+                continue
+            page = next(pages)
+            try:
+                if isinstance(page, Exception):
+                    raise page
+                profiles.append(self._profile_from_page(name, url, page))
+            except Exception as exc:
+                reason = describe_failure(exc)
+                print(f'ERROR: {reason}', file=sys.stderr)
+                profiles.append(_empty_profile(name, url, error=reason))
+        return profiles
+
+    def _profile_from_page(self, name: str, url: str, soup: bs4.BeautifulSoup) -> FighterProfile:
+        record = self._parse_record(soup)
+        streak, recent_fights, history = self._parse_fight_table(soup)
+        print(f'record={record}, streak={streak}, fights={len(recent_fights)}', file=sys.stderr)
+        return FighterProfile(
+            name=name,
+            profile_url=url,
+            record=record,
+            streak=streak,
+            recent_fights=recent_fights,
+            history={'fields': list(HISTORY_FIELDS), 'rows': history},
+        )
 
     def _parse_record(self, soup: bs4.BeautifulSoup) -> str | None:
         def _stat(cls: str) -> str:
@@ -293,64 +355,82 @@ class SherdogEventScraper(EventScraper):
             return None
         return f'{wins}-{losses}-{draws}'
 
-    def _parse_streak(self, soup: bs4.BeautifulSoup) -> str | None:
+    @profiling.traced('sherdog.parse_fight_table')
+    def _parse_fight_table(
+        self,
+        soup: bs4.BeautifulSoup,
+        limit: int = 5,
+    ) -> tuple[str | None, list[RecentFight], list[list]]:
+        """
+        Walk the fight-history table once and return (streak, recent_fights, history).
+
+          • streak        — consecutive identical results from the most recent
+                            bout, read from each row's first cell
+          • recent_fights — the first `limit` bouts, as RecentFights
+          • history       — every bout, as rows in HISTORY_FIELDS order
+        """
         table = soup.find('table', class_='new_table')
         if not table:
-            return None
-
-        results = []
-        for row in table.find_all('tr')[1:]:
-            td = row.find('td')
-            if td:
-                r = td.get_text(strip=True).lower()
-                if r in _STATUS_MAP:
-                    results.append(r)
-
-        if not results:
-            return None
-
-        first = results[0]
-        count = 0
-        for r in results:
-            if r == first:
-                count += 1
-            else:
-                break
-        return f'{count} {first.capitalize()}'
+            return None, [], []
 
-    def _parse_fight_history(self, soup: bs4.BeautifulSoup, limit: int = 5) -> list[dict]:
-        table = soup.find('table', class_='new_table')
-        if not table:
-            return []
+        streak_result: str | None = None
+        streak_count = 0
+        streak_broken = False
+        recent_fights: list[RecentFight] = []
+        history: list[list] = []
 
-        fights = []
         for row in table.find_all('tr')[1:]:
-            if len(fights) >= limit:
-                break
+            cols = [c for c in row.children if c.name == 'td']
+            if not cols:
+                continue
+
+            if not streak_broken:
+                r = cols[0].get_text(strip=True).lower()
+                if r in _STATUS_MAP:
+                    if streak_result is None:
+                        streak_result = r
+                    if r == streak_result:
+                        streak_count += 1
+                    else:
+                        streak_broken = True
 
-            cols = row.find_all('td')
             if len(cols) < 6:
                 continue
-
-            result_span = cols[0].find('span', class_='final_result')
+            result_span = _first(cols[0], 'span', 'final_result')
             if not result_span:
                 continue
             result = _STATUS_MAP.get(result_span.get_text(strip=True).lower())
             if result is None:
                 continue
 
-            opp_link = cols[1].find('a')
+            opp_link = _first(cols[1], 'a')
+            event_link = _first(cols[2], 'a')
+            date_span = _first(cols[2], 'span', 'sub_line')
+            method_b = _first(cols[3], 'b')
             opponent = opp_link.get_text(strip=True) if opp_link else None
-
-            date_span = cols[2].find('span', class_='sub_line')
-            date = _parse_date_display(date_span.get_text(strip=True)) if date_span else None
-
-            method_b = cols[3].find('b')
             method = method_b.get_text(strip=True) if method_b else None
-
-            fights.append({'result': result, 'opponent': opponent, 'method': method, 'date': date})
-
-        return fights
+            raw_date = date_span.get_text(strip=True) if date_span else None
+            date = _parse_fight_date(raw_date) if raw_date else None
+
+            history.append([
+                result,
+                opponent,
+                method,
+                date.isoformat() if date else raw_date,
+                event_link.get_text(strip=True) if event_link else None,
+                cols[4].get_text(strip=True) or None,
+                cols[5].get_text(strip=True) or None,
+            ])
+            if len(recent_fights) < limit:
+                recent_fights.append(RecentFight(
+                    result=result,
+                    opponent=opponent,
+                    method=method,
+                    date=date.strftime('%B %d, %Y') if date else raw_date,
+                ))
+
+        streak = f'{streak_count} {streak_result.capitalize()}' if streak_result else None
+        return streak, recent_fights, history
 
     # ------------------------------------------------------------------
     # Shared helpers
@@ -0,0 +1,138 @@
+"""
+SiteData — the minified, precompressed card files the site reads instead of cards.json.
+
+    db/cards-index.json  — {"cards": [summary, ...]}, newest first: every
+                           card field except fights, for the home page's
+                           lists, top-rated table and search
+    db/cards/<id>.json   — one card in full, fights and odds included, for
+                           that card's preview and recap pages
+    db/cards.min.json    — all of cards.json, for anything that still needs
+                           the whole archive
+
+cards.json itself stays pretty-printed as the readable source of truth;
+these files are derived from it and written minified (no indentation, no
+spaces after separators), each with a gzip sibling (<file>.gz) for servers
+that serve precompressed files. Brotli siblings (<file>.br) are opt-in:
+brotli is not a dependency, and they are only written when it is installed. Output is deterministic (keys in
+cards.json's order, gzip mtime fixed at 0), so files only change in git
+when their content does.
+
+A page therefore downloads its own card (or the slim index) however large
+the archive grows. Files are replaced atomically and only when their
+minified bytes changed; after an update of one card only that card's file,
+the index and cards.min.json are touched. Files are published under the
+cards.json lock from the current file, so the last process to publish
+always writes the newest archive.
+
+Public API:
+    write_site_data(store, card_ids=None, index_path, shard_dir)  → files written
+    publish_json(path, document)          → files written (path and its siblings)
+    minify_json(document)                 → bytes
+    artifact_sizes(path)                  → {'json': n, 'gz': n, 'br': n or None}
+    minified_path(json_path)              → 'cards.json' → 'cards.min.json'
+    card_summary(card)                    → card without its fights
+"""
+import gzip
+import importlib.util
+import os
+
+from scraping import codec
+from scraping import constants
+from scraping import profiling
+
+_HAS_BROTLI = importlib.util.find_spec('brotli') is not None
+
+
+def card_summary(card: dict) -> dict:
+    return {key: value for key, value in card.items() if key != 'fights'}
+
+
+def minified_path(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + '.min.json'
+
+
+def minify_json(document) -> bytes:
+    return codec.dumpb(document)
+
+
+def publish_json(path: str, document) -> int:
+    """Write document minified to path with its .gz (and .br) siblings, unless all are already current."""
+    data = minify_json(document)
+    siblings = {path + '.gz': lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+    if _HAS_BROTLI:
+        import brotli
+
+        siblings[path + '.br'] = lambda: brotli.compress(data, quality=11)
+    elif os.path.exists(path + '.br'):
+        # A sibling left by a run that had brotli would go stale
+        os.remove(path + '.br')
+
+    if _read(path) == data and all(os.path.exists(p) for p in siblings):
+        return 0
+    with profiling.span('site_data.publish', path=path) as sp:
+        _write_atomic(path, data)
+        for sibling, compress in siblings.items():
+            _write_atomic(sibling, compress())
+        sp.add_bytes(len(data))
+    return 1 + len(siblings)
+
+
+def artifact_sizes(path: str) -> dict:
+    """On-disk sizes of a published file and its compressed siblings (None when absent)."""
+    def size(p):
+        return os.path.getsize(p) if os.path.exists(p) else None
+
+    return {'json': size(path), 'gz': size(path + '.gz'), 'br': size(path + '.br')}
+
+
+def write_site_data(
+    store,
+    card_ids: list[str] | None = None,
+    index_path: str = constants.CARDS_INDEX_PATH,
+    shard_dir: str = constants.CARDS_SHARD_DIR,
+) -> int:
+    """
+    Bring cards.min.json, the index and the shards of card_ids up to date
+    with store (a CardStore or CardDatabase). card_ids=None rebuilds every
+    shard and removes the shards of cards no longer in the store.
+
+    Runs as a store transaction: under the cards.json lock, after catching
+    up with whatever other processes saved. Publishing from this process's
+    copy without the lock could overwrite newer site data with an older
+    snapshot of the archive.
+    """
+    with store.transaction(), profiling.span('site_data.write', path=shard_dir):
+        cards = store.cards()
+        os.makedirs(shard_dir, exist_ok=True)
+        written = publish_json(minified_path(store.json_path), {'cards': cards})
+        written += publish_json(index_path, {'cards': [card_summary(c) for c in cards]})
+
+        if card_ids is None:
+            shards = cards
+            keep = {f'{card["id"]}.json' for card in cards}
+            for name in os.listdir(shard_dir):
+                if name.split('.json')[0] + '.json' not in keep:
+                    os.remove(os.path.join(shard_dir, name))
+        else:
+            shards = [card for card in map(store.get, card_ids) if card is not None]
+
+        for card in shards:
+            written += publish_json(os.path.join(shard_dir, f'{card["id"]}.json'), card)
+        return written
+
+
+def _read(path: str) -> bytes | None:
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
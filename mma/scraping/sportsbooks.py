@@ -0,0 +1,39 @@
+"""
+Sportsbooks — the registry of books odds are quoted by: canonical IDs, names and aliases.
+
+The registry itself is constants.SPORTSBOOKS. Every book has a small
+integer ID, which is what cards.json's odds columns store, and one
+canonical name, which is what bestOdds and the pages show. fightodds.io and
+older cards.json files spell some books differently ('HardRocketBet',
+'BookMaker'); those spellings are listed as aliases, and every lookup
+ignores case, so they all resolve to the same ID.
+
+Public API:
+    book_id(name)       → registry ID, or None for a book the registry does not know
+    book_name(id)       → canonical name (KeyError for an unknown ID)
+    unknown_books(ids)  → the entries of ids that are not registry IDs
+"""
+from scraping import constants
+
+_IDS = {
+    spelling.casefold(): book
+    for book, (name, aliases) in constants.SPORTSBOOKS.items()
+    for spelling in (name, *aliases)
+}
+
+_KNOWN = frozenset(constants.SPORTSBOOKS)
+
+
+def book_id(name: str) -> int | None:
+    return _IDS.get(name.casefold())
+
+
+def book_name(book: int) -> str:
+    return constants.SPORTSBOOKS[book][0]
+
+
+def unknown_books(books: list) -> list:
+    # Set operations first: a card's odds are checked on every read
+    if _KNOWN.issuperset(books) and set(map(type, books)) <= {int}:
+        return []
+    return [book for book in books if type(book) is not int or book not in _KNOWN]
@@ -11,6 +11,11 @@ def _strip_diacritics(text: str) -> str:
     return ''.join(c for c in normalized if not unicodedata.combining(c))
 
 
+def normalize_name(name: str) -> str:
+    """Lookup key for a fighter name: 'Jiří  Procházka' -> 'jiri prochazka'."""
+    return ' '.join(_strip_diacritics(name).lower().split())
+
+
 def generate_card_id(event_name: str) -> str:
     """
     Derive a URL-slug card ID from a UFC event name.
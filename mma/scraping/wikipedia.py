@@ -16,16 +16,52 @@ Wikipedia fight-card tables (class="toccolours") contain a mix of:
 Wikipedia fighter pages contain an MMA record table (class="wikitable")
 under the "Mixed martial arts record" h2, with columns:
   Res. | Record | Opponent | Method | Event | Date | Round | Time | Location | Notes
+
+API mode (use_api=True) skips the rendered article. It asks the MediaWiki
+parse API (/w/api.php on the page's own host) for the section list, then
+fetches only the HTML of the sections the parsers need:
+  • event pages   — the lead (section 0, holding the infobox) plus the
+                    "Results" / "Fight card" section
+  • fighter pages — the "Mixed martial arts record" section
+If the wanted section is missing, the whole parsed article text is used.
+
+Batch mode (batch=True) covers a whole card's fighters in a few round trips:
+  1. one action=query request per 50 titles resolves redirects, normalizes
+     titles and returns every page's wikitext
+  2. each page's "Mixed martial arts record" section is cut out locally,
+     and all sections are rendered together by a single action=parse POST
+     (split by size if the card is very large), each wrapped in its own
+     div.mma-batch so the rendered HTML can be handed back per fighter
+
+All modes feed the same parsers and return the same models (models.py). Each fetched
+page is indexed once (_PageIndex: headings → tables, cached header
+signatures, infobox fields), and the parsers look their tables up there.
+
+fighter_revisions() looks up the current revision ID of many fighter pages
+with one uncached action=query (rvprop=ids) per 50 titles. Once a page's
+revision is known, its fetches are pinned to that revision: index.php
+?oldid= in page mode, parse-API oldid= in API mode, and action=query
+revids= in batch mode. A pinned URL always names the same content, so a
+cached copy of it is never stale.
 """
 import datetime
+import functools
 import re
 import sys
-import time
+from urllib.parse import unquote
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
 
 import bs4
 
-from scraping import constants
+from scraping import profiling
 from scraping.event_scraper import EventScraper
+from scraping.models import Bout
+from scraping.models import Event
+from scraping.models import Fight
+from scraping.models import FighterProfile
+from scraping.models import RecentFight
+from scraping.resilience import describe_failure
 from scraping.scraper import Scraper
 
 WIKI_BASE = 'https://en.wikipedia.org'
@@ -40,6 +76,24 @@ _CARD_SECTION_LABELS = [
     ('prelim',            'Prelims'),
 ]
 
+# Page regions each parser reads. In driver mode only these elements are
+# pulled from the browser (see Scraper.fetch); headings come along so the
+# record-table lookup can still walk from its section heading.
+_EVENT_REGIONS = 'table.infobox, table.toccolours'
+_FIGHTER_REGIONS = 'div.mw-heading2, table.wikitable'
+
+# Section titles (level-2 headings) fetched in API mode, matched by substring
+_EVENT_CARD_SECTIONS = ('results', 'fight card')
+_FIGHTER_RECORD_SECTIONS = ('mixed martial arts record',)
+
+# Batch mode limits: titles per action=query, wikitext chars per action=parse
+_QUERY_MAX_TITLES = 50
+_PARSE_MAX_CHARS = 500_000
+_BATCH_REGIONS = 'div.mma-batch'
+
+# A level-2 wikitext heading: '== Title ==' (but not '=== Sub ===')
+_WIKITEXT_H2 = re.compile(r'^==(?!=)\s*(.*?)\s*(?<!=)==\s*$', re.MULTILINE)
+
 _STATUS_MAP = {
     'win':        'Win',
     'loss':       'Loss',
@@ -107,17 +161,243 @@ def _parse_record_str(raw: str) -> str:
     return raw
 
 
+def _title_from_url(url: str) -> str:
+    """'https://en.wikipedia.org/wiki/Jon_Jones_(fighter)' → 'Jon_Jones_(fighter)'"""
+    path = urlsplit(url).path
+    if '/wiki/' in path:
+        return unquote(path.split('/wiki/', 1)[1])
+    return unquote(path.rstrip('/').rsplit('/', 1)[-1])
+
+
+def _api_endpoint(page_url: str) -> str:
+    """'https://en.wikipedia.org/wiki/UFC_329' → 'https://en.wikipedia.org/w/api.php'"""
+    parts = urlsplit(page_url)
+    return f'{parts.scheme}://{parts.netloc}/w/api.php'
+
+
+def _revision_url(page_url: str, revision: int) -> str:
+    """'https://en.wikipedia.org/wiki/Jon_Jones', 123 → '.../w/index.php?title=Jon_Jones&oldid=123'"""
+    parts = urlsplit(page_url)
+    query = urlencode({'title': _title_from_url(page_url), 'oldid': revision})
+    return f'{parts.scheme}://{parts.netloc}/w/index.php?{query}'
+
+
+def _api_url(page_url: str, revision: int | None = None, **params: str) -> str:
+    """Build a parse-API URL for page_url's article (or one revision of it) on the same host."""
+    query = {
+        'action':        'parse',
+        'format':        'json',
+        'formatversion': '2',
+        'redirects':     '1',
+        'page':          _title_from_url(page_url),
+        **params,
+    }
+    if revision is not None:
+        del query['page']
+        query['oldid'] = str(revision)
+    return f'{_api_endpoint(page_url)}?{urlencode(query)}'
+
+
+def _query_url(page_url: str, **params: str) -> str:
+    """action=query URL returning the wikitext and revision ID of the given titles= / revids=."""
+    query = {
+        'action':        'query',
+        'format':        'json',
+        'formatversion': '2',
+        'redirects':     '1',
+        'prop':          'revisions',
+        'rvprop':        'ids|content',
+        'rvslots':       'main',
+        **params,
+    }
+    return f'{_api_endpoint(page_url)}?{urlencode(query)}'
+
+
+def _sections_url(page_url: str, revision: int | None = None) -> str:
+    return _api_url(page_url, revision, prop='sections')
+
+
+def _section_text_url(page_url: str, section: str | None, revision: int | None = None) -> str:
+    """Parse-API URL for one section's HTML, or the whole article when section is None."""
+    params = {'prop': 'text', 'disableeditsection': '1', 'disabletoc': '1'}
+    if section is not None:
+        params['section'] = section
+    return _api_url(page_url, revision, **params)
+
+
+def _api_payload(data: dict, key: str = 'parse') -> dict:
+    """Return the `key` object ('parse' / 'query') of an API response, raising on API errors."""
+    if 'error' in data:
+        error = data['error']
+        raise RuntimeError(f"Wikipedia API error: {error.get('code')}: {error.get('info')}")
+    return data[key]
+
+
+def _find_section(sections: list[dict], titles: tuple[str, ...]) -> str | None:
+    """Index of the first level-2 section whose heading contains one of titles."""
+    for section in sections:
+        if str(section.get('level')) != '2' or not str(section.get('index', '')).isdigit():
+            continue
+        heading = re.sub(r'<[^>]+>', '', section.get('line', '')).lower()
+        if any(title in heading for title in titles):
+            return str(section['index'])
+    return None
+
+
+def _wikitext_section(wikitext: str, titles: tuple[str, ...]) -> str:
+    """Cut the first level-2 section whose heading contains one of titles; whole text if none does."""
+    headings = list(_WIKITEXT_H2.finditer(wikitext))
+    for i, heading in enumerate(headings):
+        if any(title in heading.group(1).lower() for title in titles):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(wikitext)
+            return wikitext[heading.start():end]
+    return wikitext
+
+
+def _resolve_title(title: str, aliases: dict[str, str]) -> str:
+    """Follow normalization / redirect hops (from → to) to the final page title."""
+    seen = {title}
+    while title in aliases and aliases[title] not in seen:
+        title = aliases[title]
+        seen.add(title)
+    return title
+
+
+def _empty_profile(name: str, url: str | None, error: str | None = None) -> FighterProfile:
+    return FighterProfile(name, url, error=error or None)
+
+
+def _last_descendant(tag: bs4.Tag) -> bs4.PageElement | None:
+    """The last element inside tag in document order, or None when it is empty."""
+    element = None
+    while tag.name is not None and tag.contents:
+        element = tag = tag.contents[-1]
+    return element
+
+
+class _PageIndex:
+    """
+    One-pass index of a Wikipedia page (or page fragment) for the parsers.
+
+    A single walk over the document records the infobox, the fight-card
+    table (class="toccolours") and every wikitable, grouped under the
+    lowercased text of the level-2 heading it follows.
+    The parsers then look their targets up instead of searching the tree:
+
+      • header signatures — the lowercased first-row cell texts of a table,
+                            computed once per table and cached
+      • record_table      — the fight-by-fight MMA record table
+      • infobox_fields    — infobox label → value
+
+    Works on whole pages, region-only documents from driver mode, parse-API
+    sections and batch-mode divs alike, since it relies only on the order of
+    headings and tables.
+    """
+
+    @profiling.traced('wikipedia.index_page')
+    def __init__(self, soup: bs4.Tag):
+        self.infobox: bs4.Tag | None = None
+        self.fight_card: bs4.Tag | None = None
+        self.wikitables: list[bs4.Tag] = []
+        # Heading text → wikitables in that section; '' holds those before the first heading
+        self.sections: dict[str, list[bs4.Tag]] = {'': []}
+        self._signatures: dict[int, tuple[str, ...]] = {}
+
+        # The walk follows next_element from the first child (a BeautifulSoup
+        # root has no next_element) and jumps over the subtrees of the headings
+        # and tables it records: their rows make up most of a page and hold
+        # nothing the index needs
+        section = self.sections['']
+        last = _last_descendant(soup)
+        element = soup.contents[0] if last is not None else None
+        while element is not None:
+            name = element.name
+            end = element
+            if name == 'h2':
+                section = self.sections.setdefault(element.get_text(strip=True).lower(), [])
+                end = _last_descendant(element) or element
+            elif name == 'table':
+                classes = element.get('class') or []
+                recorded = True
+                if 'wikitable' in classes:
+                    self.wikitables.append(element)
+                    section.append(element)
+                elif 'infobox' in classes:
+                    self.infobox = self.infobox or element
+                elif 'toccolours' in classes:
+                    self.fight_card = self.fight_card or element
+                else:
+                    recorded = False
+                if recorded:
+                    end = _last_descendant(element) or element
+            if end is last:
+                break
+            element = end.next_element
+
+    def section_tables(self, titles: tuple[str, ...]) -> list[bs4.Tag]:
+        """Wikitables under the first level-2 heading containing one of titles."""
+        for title in titles:
+            if title in self.sections:
+                return self.sections[title]
+        for heading, tables in self.sections.items():
+            if heading and any(title in heading for title in titles):
+                return tables
+        return []
+
+    def signature(self, table: bs4.Tag) -> tuple[str, ...]:
+        """Lowercased texts of the table's first-row cells; () when it has no rows."""
+        signature = self._signatures.get(id(table))
+        if signature is None:
+            header = table.find('tr')
+            signature = tuple(
+                c.get_text(strip=True).lower() for c in header.find_all(['th', 'td'])
+            ) if header else ()
+            self._signatures[id(table)] = signature
+        return signature
+
+    @functools.cached_property
+    def record_table(self) -> bs4.Tag | None:
+        """
+        The fight-by-fight MMA record table: the first wikitable with 'Res.'
+        as its first column header, preferring the "Mixed martial arts record"
+        section (which also holds a collapsible summary table) over the rest
+        of the page.
+        """
+        for tables in (self.section_tables(_FIGHTER_RECORD_SECTIONS), self.wikitables):
+            for table in tables:
+                if self.signature(table)[:1] == ('res.',):
+                    return table
+        return None
+
+    @functools.cached_property
+    def infobox_fields(self) -> dict[str, str]:
+        """Infobox rows with a label and a value, label → value (the last row wins)."""
+        fields = {}
+        for row in self.infobox.find_all('tr') if self.infobox else ():
+            cells = row.find_all(['th', 'td'])
+            if len(cells) >= 2:
+                fields[cells[0].get_text(strip=True)] = cells[1].get_text(strip=True)
+        return fields
+
+
 class WikipediaEventScraper(EventScraper):
-    def __init__(self, scraper: Scraper):
+    source = 'wikipedia'
+
+    def __init__(self, scraper: Scraper, use_api: bool = False, batch: bool = False):
         self._scraper = scraper
+        self._use_api = use_api
+        self._batch = batch
+        # Fighter page URL → revision ID, filled by fighter_revisions()
+        self._revisions: dict[str, int] = {}
 
     # ------------------------------------------------------------------
     # scrape_event — used by preview.py and recap.py
     # ------------------------------------------------------------------
 
-    def scrape_event(self, url: str, mode: str = 'both') -> dict:
+    @profiling.traced('wikipedia.scrape_event')
+    def scrape_event(self, url: str, mode: str = 'both') -> Event:
         """
-        Scrape a Wikipedia UFC event page and return structured event data.
+        Scrape a Wikipedia UFC event page and return it as an Event.
 
         Args:
             url:  Wikipedia URL for the event
@@ -126,32 +406,25 @@ class WikipediaEventScraper(EventScraper):
                   'recap' or 'both' — include them for completed bouts.
 
         Returns:
-            {
-                event_name: str,          # e.g. 'UFC 329: McGregor vs. Holloway 2'
-                date:       str,          # ISO YYYY-MM-DD
-                location:   str,          # 'Venue, City'
-                fights: [{
-                    card_placement:    str,        # 'Main Card' | 'Prelims' | 'Early Prelims'
-                    fighter1:          str,
-                    fighter2:          str,
-                    method_of_victory: str | None, # None when mode == 'preview'
-                    time_of_victory:   str | None, # e.g. 'R2 0:15'
-                }]
-            }
+            Event(event_name, date, location, fights) — location is
+            'Venue, City'; each Fight's method_of_victory / time_of_victory
+            are None when mode == 'preview'.
         """
-        soup = self._scraper.fetch(url)
-        return {
-            'event_name': self._parse_event_name(soup),
-            'date':       self._parse_date(soup),
-            'location':   self._parse_location(soup),
-            'fights':     self._parse_fights(soup, mode=mode, research=False),
-        }
+        soup = self._fetch_event_page(url)
+        page = _PageIndex(soup)
+        return Event(
+            event_name=self._parse_event_name(page),
+            date=self._parse_date(soup),
+            location=self._parse_location(page),
+            fights=self._parse_fights(page, mode=mode, research=False),
+        )
 
     # ------------------------------------------------------------------
     # scrape_event_research — used by research.py
     # ------------------------------------------------------------------
 
-    def scrape_event_research(self, url: str) -> tuple[str, list[dict]]:
+    @profiling.traced('wikipedia.scrape_event_research')
+    def scrape_event_research(self, url: str) -> tuple[str, list[Bout]]:
         """
         Scrape a Wikipedia UFC event page for research, including fighter
         Wikipedia profile URLs needed by the subsequent scrape_fighter calls.
@@ -161,23 +434,16 @@ class WikipediaEventScraper(EventScraper):
                  (e.g. 'https://en.wikipedia.org/wiki/UFC_329').
 
         Returns:
-            (event_name, bouts) where each bout dict contains:
-            {
-                fighter1_name:  str,
-                fighter1_url:   str | None,   # Wikipedia URL, or None if not linked
-                fighter2_name:  str,
-                fighter2_url:   str | None,
-                weight_class:   str,
-                card_placement: str,          # 'Main Card' | 'Prelims' | 'Early Prelims'
-            }
+            (event_name, bouts) — each Bout's fighter URLs are Wikipedia
+            URLs, or None where the fighter is not linked.
         """
         print(f'Fetching event page: {url}', file=sys.stderr)
-        soup = self._scraper.fetch(url)
+        page = _PageIndex(self._fetch_event_page(url))
 
-        event_name = self._parse_event_name(soup)
+        event_name = self._parse_event_name(page)
         print(f'Event: {event_name}', file=sys.stderr)
 
-        bouts = self._parse_fights(soup, mode='preview', research=True)
+        bouts = self._parse_fights(page, mode='preview', research=True)
         if not bouts:
             raise RuntimeError('No bouts found on event page.')
 
@@ -188,7 +454,8 @@ class WikipediaEventScraper(EventScraper):
     # scrape_fighter — used by research.py
     # ------------------------------------------------------------------
 
-    def scrape_fighter(self, name: str, url: str | None) -> dict:
+    @profiling.traced('wikipedia.scrape_fighter')
+    def scrape_fighter(self, name: str, url: str | None) -> FighterProfile:
         """
         Scrape a fighter's Wikipedia page and return their MMA record,
         current streak, and last five fights.
@@ -200,56 +467,287 @@ class WikipediaEventScraper(EventScraper):
                   or None if the fighter has no Wikipedia page.
 
         Returns:
-            {
-                name:          str,
-                profile_url:   str | None,
-                record:        str | None,  # 'W-L-D', e.g. '22-7-0'
-                streak:        str | None,  # e.g. '3 Win' or '2 Loss'
-                recent_fights: [{
-                    result:   str,   # 'Win' | 'Loss' | 'Draw' | 'NC'
-                    opponent: str,
-                    method:   str,
-                    date:     str,   # e.g. 'June 27, 2026'
-                }]
-            }
+            FighterProfile with record, streak and up to five RecentFights
+            (dates as the page writes them, e.g. 'June 27, 2026'); no history.
         """
         if not url:
             print(f'  {name} ... no Wikipedia page', file=sys.stderr)
-            return {'name': name, 'profile_url': None, 'record': None, 'streak': None, 'recent_fights': []}
+            return _empty_profile(name, None)
 
         print(f'  {name} ...', file=sys.stderr, end=' ', flush=True)
         try:
-            soup = self._scraper.fetch(url)
-            record, streak, recent_fights = self._parse_fighter_profile(soup)
-            print(f'record={record}, streak={streak}, fights={len(recent_fights)}', file=sys.stderr)
-            return {
-                'name':          name,
-                'profile_url':   url,
-                'record':        record,
-                'streak':        streak,
-                'recent_fights': recent_fights,
-            }
+            page = self._fetch_fighter_pages([url])[0]
+            if isinstance(page, Exception):
+                raise page
+            return self._profile_from_page(name, url, page)
         except Exception as exc:
-            print(f'ERROR: {exc}', file=sys.stderr)
-            return {'name': name, 'profile_url': url, 'record': None, 'streak': None, 'recent_fights': []}
-        finally:
-            time.sleep(constants.REQUEST_DELAY)
+            reason = describe_failure(exc)
+            print(f'ERROR: {reason}', file=sys.stderr)
+            return _empty_profile(name, url, error=reason)
+
+    @profiling.traced('wikipedia.scrape_fighters')
+    def scrape_fighters(self, fighters: list[tuple[str, str | None]]) -> list[FighterProfile]:
+        """
+        Scrape a batch of fighter profiles, fetching their pages concurrently.
+
+        Pages are fetched through Scraper.fetch_many, which bounds in-flight
+        requests per host; profiles are returned in input order.
+        """
+        pages = iter(self._fetch_fighter_pages([url for _, url in fighters if url]))
+        profiles = []
+        for name, url in fighters:
+            if not url:
+                print(f'  {name} ... no Wikipedia page', file=sys.stderr)
+                profiles.append(_empty_profile(name, None))
+                continue
+            print(f'  {name} ...', file=sys.stderr, end=' ', flush=True)
+            page = next(pages)
+            try:
+                if isinstance(page, Exception):
+                    raise page
+                profiles.append(self._profile_from_page(name, url, page))
+            except Exception as exc:
+                reason = describe_failure(exc)
+                print(f'ERROR: {reason}', file=sys.stderr)
+                profiles.append(_empty_profile(name, url, error=reason))
+        return profiles
+
+    @profiling.traced('wikipedia.fighter_revisions')
+    def fighter_revisions(self, urls: list[str]) -> dict[str, int]:
+        """
+        Current revision ID of each fighter page, one uncached query per 50 titles.
+
+        Later fetches of these pages are pinned to the returned revisions.
+        Missing pages are left out of the result.
+        """
+        by_host: dict[str, list[str]] = {}
+        for url in dict.fromkeys(urls):
+            by_host.setdefault(urlsplit(url).netloc, []).append(url)
+
+        revisions: dict[str, int] = {}
+        for host_urls in by_host.values():
+            titles = {url: _title_from_url(url).replace('_', ' ') for url in host_urls}
+            unique = sorted(set(titles.values()))
+            for start in range(0, len(unique), _QUERY_MAX_TITLES):
+                batch = unique[start:start + _QUERY_MAX_TITLES]
+                aliases: dict[str, str] = {}
+                revids: dict[str, int] = {}
+                for query in self._query(host_urls[0], fresh=True, titles='|'.join(batch), rvprop='ids'):
+                    for hop in query.get('normalized', []) + query.get('redirects', []):
+                        aliases[hop['from']] = hop['to']
+                    for page in query.get('pages', []):
+                        if not page.get('missing') and page.get('revisions'):
+                            revids[page['title']] = page['revisions'][0]['revid']
+                for url, title in titles.items():
+                    if title in batch and _resolve_title(title, aliases) in revids:
+                        revisions[url] = revids[_resolve_title(title, aliases)]
+
+        self._revisions.update(revisions)
+        return revisions
+
+    def _profile_from_page(self, name: str, url: str, soup: bs4.Tag) -> FighterProfile:
+        record, streak, recent_fights = self._parse_fighter_profile(_PageIndex(soup))
+        print(f'record={record}, streak={streak}, fights={len(recent_fights)}', file=sys.stderr)
+        return FighterProfile(
+            name=name,
+            profile_url=url,
+            record=record,
+            streak=streak,
+            recent_fights=recent_fights,
+        )
+
+    # ------------------------------------------------------------------
+    # Page fetching (rendered article or parse-API sections)
+    # ------------------------------------------------------------------
+
+    def _fetch_event_page(self, url: str) -> bs4.BeautifulSoup:
+        if not self._use_api:
+            return self._scraper.fetch(url, regions=_EVENT_REGIONS)
+        sections = _api_payload(self._scraper.fetch_json(_sections_url(url)))['sections']
+        card_section = _find_section(sections, _EVENT_CARD_SECTIONS)
+        if card_section is None:
+            html = _api_payload(self._scraper.fetch_json(_section_text_url(url, None)))['text']
+        else:
+            lead, card = self._scraper.fetch_json_many([
+                _section_text_url(url, '0'),
+                _section_text_url(url, card_section),
+            ])
+            for data in (lead, card):
+                if isinstance(data, Exception):
+                    raise data
+            html = _api_payload(lead)['text'] + _api_payload(card)['text']
+        return self._scraper.parse(html, regions=_EVENT_REGIONS)
+
+    def _fetch_fighter_pages(self, urls: list[str]) -> list[bs4.BeautifulSoup | Exception]:
+        """
+        Fetch fighter pages concurrently, in input order; a failed page yields its exception.
+
+        In API mode this is two concurrent rounds — every fighter's section
+        list, then every fighter's record section. Batch mode takes
+        precedence and uses _fetch_fighter_pages_batched.
+        """
+        if self._batch:
+            return self._fetch_fighter_pages_batched(urls)
+        if not self._use_api:
+            pinned = [
+                _revision_url(u, self._revisions[u]) if u in self._revisions else u
+                for u in urls
+            ]
+            return self._scraper.fetch_many(pinned, regions=_FIGHTER_REGIONS)
+
+        text_urls: list[str | Exception] = []
+        section_urls = [_sections_url(u, self._revisions.get(u)) for u in urls]
+        for url, data in zip(urls, self._scraper.fetch_json_many(section_urls)):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                section = _find_section(_api_payload(data)['sections'], _FIGHTER_RECORD_SECTIONS)
+                text_urls.append(_section_text_url(url, section, self._revisions.get(url)))
+            except Exception as exc:
+                text_urls.append(exc)
+
+        texts = iter(self._scraper.fetch_json_many([u for u in text_urls if isinstance(u, str)]))
+        pages: list[bs4.BeautifulSoup | Exception] = []
+        for text_url in text_urls:
+            if isinstance(text_url, Exception):
+                pages.append(text_url)
+                continue
+            try:
+                data = next(texts)
+                if isinstance(data, Exception):
+                    raise data
+                pages.append(self._scraper.parse(_api_payload(data)['text'], regions=_FIGHTER_REGIONS))
+            except Exception as exc:
+                pages.append(exc)
+        return pages
+
+    def _fetch_fighter_pages_batched(self, urls: list[str]) -> list[bs4.Tag | Exception]:
+        """
+        Batch-mode fighter fetch: one query per 50 titles plus one parse POST.
+
+        Returns, per URL, the div.mma-batch element holding that fighter's
+        rendered record section (the parsers accept any Tag), or an exception.
+        """
+        pages: list[bs4.Tag | Exception | None] = [None] * len(urls)
+        by_host: dict[str, list[int]] = {}
+        for i, url in enumerate(urls):
+            by_host.setdefault(urlsplit(url).netloc, []).append(i)
+
+        for indices in by_host.values():
+            try:
+                self._fetch_batch(urls, indices, pages)
+            except Exception as exc:
+                for i in indices:
+                    if pages[i] is None:
+                        pages[i] = exc
+        return pages
+
+    def _fetch_batch(self, urls: list[str], indices: list[int], pages: list) -> None:
+        page_url = urls[indices[0]]
+        titles = {i: _title_from_url(urls[i]).replace('_', ' ') for i in indices}
+        pinned = {i: self._revisions.get(urls[i]) for i in indices}
+        if all(pinned.values()):
+            by_revision = self._revision_wikitext(page_url, sorted(set(pinned.values())))
+            wikitexts = {titles[i]: by_revision.get(pinned[i]) for i in indices}
+        else:
+            wikitexts = self._query_wikitext(page_url, sorted(set(titles.values())))
+
+        sections: list[tuple[int, str]] = []
+        for i in indices:
+            wikitext = wikitexts.get(titles[i])
+            if wikitext is None:
+                pages[i] = RuntimeError(f'no Wikipedia page for {titles[i]!r}')
+            else:
+                sections.append((i, _wikitext_section(wikitext, _FIGHTER_RECORD_SECTIONS)))
+
+        chunk: list[tuple[int, str]] = []
+        size = 0
+        for i, section in sections + [(None, None)]:
+            if chunk and (i is None or size + len(section) > _PARSE_MAX_CHARS):
+                self._render_batch(page_url, chunk, pages)
+                chunk, size = [], 0
+            if i is not None:
+                chunk.append((i, section))
+                size += len(section)
+
+    def _query_wikitext(self, page_url: str, titles: list[str]) -> dict[str, str | None]:
+        """Map each requested title to its page's current wikitext (None if missing)."""
+        result: dict[str, str | None] = {}
+        for start in range(0, len(titles), _QUERY_MAX_TITLES):
+            batch = titles[start:start + _QUERY_MAX_TITLES]
+            aliases: dict[str, str] = {}
+            content: dict[str, str] = {}
+            for query in self._query(page_url, titles='|'.join(batch)):
+                for hop in query.get('normalized', []) + query.get('redirects', []):
+                    aliases[hop['from']] = hop['to']
+                for page in query.get('pages', []):
+                    revisions = page.get('revisions')
+                    if not page.get('missing') and revisions:
+                        content[page['title']] = revisions[0]['slots']['main']['content']
+            for title in batch:
+                result[title] = content.get(_resolve_title(title, aliases))
+        return result
+
+    def _revision_wikitext(self, page_url: str, revids: list[int]) -> dict[int, str]:
+        """Map each revision ID to that revision's wikitext (missing revisions are left out)."""
+        result: dict[int, str] = {}
+        for start in range(0, len(revids), _QUERY_MAX_TITLES):
+            batch = revids[start:start + _QUERY_MAX_TITLES]
+            for query in self._query(page_url, revids='|'.join(map(str, batch))):
+                for page in query.get('pages', []):
+                    for revision in page.get('revisions', []):
+                        result[revision['revid']] = revision['slots']['main']['content']
+        return result
+
+    def _query(self, page_url: str, fresh: bool = False, **params: str) -> list[dict]:
+        """Run one action=query to completion; returns the 'query' object of every response."""
+        queries = []
+        resume: dict[str, str] = {}
+        while True:
+            data = self._scraper.fetch_json(_query_url(page_url, **params, **resume), fresh=fresh)
+            queries.append(_api_payload(data, 'query'))
+            # Large responses are split; 'continue' carries the resume token
+            if 'continue' not in data:
+                return queries
+            resume = data['continue']
+
+    def _render_batch(self, page_url: str, chunk: list[tuple[int, str]], pages: list) -> None:
+        """Render several record sections in one parse POST and hand each its own div."""
+        wikitext = ''.join(
+            f'<div class="mma-batch" id="mma-batch-{i}">\n{section}\n</div>\n'
+            for i, section in chunk
+        )
+        data = self._scraper.post_json(_api_endpoint(page_url), {
+            'action':             'parse',
+            'format':             'json',
+            'formatversion':      '2',
+            'contentmodel':       'wikitext',
+            'prop':               'text',
+            'disableeditsection': '1',
+            'disablelimitreport': '1',
+            'text':               wikitext,
+        })
+        soup = self._scraper.parse(_api_payload(data)['text'], regions=_BATCH_REGIONS)
+        for i, _ in chunk:
+            div = soup.find('div', id=f'mma-batch-{i}')
+            pages[i] = div if div is not None else RuntimeError('record section missing from batch render')
 
     # ------------------------------------------------------------------
     # Fight-card parsing (shared by scrape_event and scrape_event_research)
     # ------------------------------------------------------------------
 
+    @profiling.traced('wikipedia.parse_fights')
     def _parse_fights(
         self,
-        soup: bs4.BeautifulSoup,
+        page: _PageIndex,
         mode: str,
         research: bool,
-    ) -> list[dict]:
-        table = soup.find('table', class_='toccolours')
+    ) -> list[Fight] | list[Bout]:
+        table = page.fight_card
         if not table:
             return []
 
-        fights: list[dict] = []
+        fights: list = []
         current_placement = 'Main Card'
 
         for row in table.find_all('tr'):
@@ -293,22 +791,16 @@ class WikipediaEventScraper(EventScraper):
             if research:
                 f1_link = cells[1].find('a')
                 f2_link = cells[3].find('a')
-                fights.append({
-                    'fighter1_name': f1_name,
-                    'fighter1_url':  _normalize_href(f1_link['href']) if f1_link else None,
-                    'fighter2_name': f2_name,
-                    'fighter2_url':  _normalize_href(f2_link['href']) if f2_link else None,
-                    'weight_class':  weight_class,
-                    'card_placement': current_placement,
-                })
+                fights.append(Bout(
+                    fighter1_name=f1_name,
+                    fighter1_url=_normalize_href(f1_link['href']) if f1_link else None,
+                    fighter2_name=f2_name,
+                    fighter2_url=_normalize_href(f2_link['href']) if f2_link else None,
+                    weight_class=weight_class,
+                    card_placement=current_placement,
+                ))
             else:
-                fights.append({
-                    'card_placement':    current_placement,
-                    'fighter1':          f1_name,
-                    'fighter2':          f2_name,
-                    'method_of_victory': method,
-                    'time_of_victory':   time_val,
-                })
+                fights.append(Fight(current_placement, f1_name, f2_name, method, time_val))
 
         return fights
 
@@ -316,11 +808,12 @@ class WikipediaEventScraper(EventScraper):
     # Fighter-profile parsing
     # ------------------------------------------------------------------
 
+    @profiling.traced('wikipedia.parse_fighter_profile')
     def _parse_fighter_profile(
         self,
-        soup: bs4.BeautifulSoup,
+        page: _PageIndex,
         limit: int = 5,
-    ) -> tuple[str | None, str | None, list[dict]]:
+    ) -> tuple[str | None, str | None, list[RecentFight]]:
         """
         Parse the MMA record table once and return (record, streak, recent_fights).
 
@@ -332,14 +825,11 @@ class WikipediaEventScraper(EventScraper):
         Streak counting stops at the first result that differs from the most
         recent one, but row iteration continues until `limit` fights are collected.
         """
-        table = self._find_mma_record_table(soup)
+        table = page.record_table
         if not table:
             return None, None, []
 
-        header_row = table.find('tr')
-        if not header_row:
-            return None, None, []
-        header = [c.get_text(strip=True).lower() for c in header_row.find_all(['th', 'td'])]
+        header = page.signature(table)
 
         try:
             idx_res    = header.index('res.')
@@ -356,7 +846,7 @@ class WikipediaEventScraper(EventScraper):
         streak_status: str | None = None
         streak_count: int = 0
         streak_broken = False
-        recent_fights: list[dict] = []
+        recent_fights: list[RecentFight] = []
 
         for row in table.find_all('tr')[1:]:
             cells = row.find_all(['th', 'td'])
@@ -385,12 +875,12 @@ class WikipediaEventScraper(EventScraper):
 
             # Recent fights: collect up to `limit` rows
             if len(recent_fights) < limit:
-                recent_fights.append({
-                    'result':   status,
-                    'opponent': cells[idx_opp].get_text(strip=True),
-                    'method':   cells[idx_method].get_text(strip=True),
-                    'date':     cells[idx_date].get_text(strip=True),
-                })
+                recent_fights.append(RecentFight(
+                    result=status,
+                    opponent=cells[idx_opp].get_text(strip=True),
+                    method=cells[idx_method].get_text(strip=True),
+                    date=cells[idx_date].get_text(strip=True),
+                ))
 
             # Stop iterating once we have enough fights and the streak is settled
             if len(recent_fights) >= limit and streak_broken:
@@ -399,68 +889,14 @@ class WikipediaEventScraper(EventScraper):
         streak = f'{streak_count} {streak_status}' if streak_status else None
         return record, streak, recent_fights
 
-    @staticmethod
-    def _find_mma_record_table(soup: bs4.BeautifulSoup) -> bs4.Tag | None:
-        """
-        Locate the fight-by-fight MMA record table on a Wikipedia fighter page.
-
-        Wikipedia Parsoid HTML wraps headings in a div.mw-heading; the tables
-        that belong to the section are siblings of that div within a <section>:
-
-          <section>
-            <div class="mw-heading mw-heading2">
-              <h2>Mixed martial arts record</h2>
-            </div>
-            <table class="wikitable mw-collapsible">…summary…</table>   ← skip
-            <table class="wikitable">…fight-by-fight list…</table>       ← want this
-          </section>
-
-        The fight list is identified by 'Res.' as its first column header.
-        Falls back to a document-wide search for any wikitable with that header.
-        """
-        content = soup.find(id='mw-content-text')
-        if not content:
-            return None
-
-        for h2 in content.find_all('h2'):
-            if 'mixed martial arts record' not in h2.get_text(strip=True).lower():
-                continue
-
-            # h2 lives inside a div.mw-heading; siblings of that div are the tables
-            heading_div = h2.parent
-            sibling = heading_div.find_next_sibling()
-            while sibling:
-                if sibling.name == 'table' and 'wikitable' in (sibling.get('class') or []):
-                    header = sibling.find('tr')
-                    if header:
-                        cols = [c.get_text(strip=True).lower() for c in header.find_all(['th', 'td'])]
-                        if cols and cols[0] == 'res.':
-                            return sibling
-                # Stop when the next major section heading is reached
-                if sibling.name == 'div' and 'mw-heading2' in (sibling.get('class') or []):
-                    break
-                sibling = sibling.find_next_sibling()
-            break
-
-        # Fallback: first wikitable anywhere in the page with 'Res.' as first header
-        for table in content.find_all('table', class_='wikitable'):
-            header = table.find('tr')
-            if header:
-                cols = [c.get_text(strip=True).lower() for c in header.find_all(['th', 'td'])]
-                if cols and cols[0] == 'res.':
-                    return table
-
-        return None
-
     # ------------------------------------------------------------------
     # Infobox helpers
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _parse_event_name(soup: bs4.BeautifulSoup) -> str:
-        infobox = soup.find('table', class_='infobox')
-        if infobox:
-            first_row = infobox.find('tr')
+    def _parse_event_name(page: _PageIndex) -> str:
+        if page.infobox:
+            first_row = page.infobox.find('tr')
             if first_row:
                 return first_row.get_text(strip=True)
         return 'UFC Event'
@@ -473,20 +909,9 @@ class WikipediaEventScraper(EventScraper):
         return datetime.date.today().isoformat()
 
     @staticmethod
-    def _parse_location(soup: bs4.BeautifulSoup) -> str:
-        infobox = soup.find('table', class_='infobox')
-        if not infobox:
-            return ''
-        venue, city = '', ''
-        for row in infobox.find_all('tr'):
-            cells = row.find_all(['th', 'td'])
-            if len(cells) >= 2:
-                label = cells[0].get_text(strip=True)
-                value = cells[1].get_text(strip=True)
-                if label == 'Venue':
-                    venue = value
-                elif label == 'City':
-                    city = value
+    def _parse_location(page: _PageIndex) -> str:
+        venue = page.infobox_fields.get('Venue', '')
+        city = page.infobox_fields.get('City', '')
         if venue and city:
             return f'{venue}, {city}'
         return venue or city
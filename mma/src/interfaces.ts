@@ -14,9 +14,21 @@ export interface BestOdds {
   bestEv: number;
 }
 
+/**
+ * A bout's moneylines by column: books[i] (a sportsbook registry ID, see
+ * scraping/constants.py) quoted odds1[i] on the matchup's first fighter and
+ * odds2[i] on the second; null where a side was not offered.
+ */
+export interface OddsTable {
+  books: number[];
+  odds1: (number | null)[];
+  odds2: (number | null)[];
+}
+
 export interface FightEntry {
   prediction?: Prediction;
   result?: { winner: string };
+  odds?: OddsTable | null;
   bestOdds?: BestOdds | null;
 }
 
@@ -37,3 +49,10 @@ export interface Card {
 export interface CardsData {
   cards: Card[];
 }
+
+/** A card without its fights, as listed in db/cards-index.json. */
+export type CardSummary = Omit<Card, 'fights'>;
+
+export interface CardsIndex {
+  cards: CardSummary[];
+}
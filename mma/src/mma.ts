@@ -1,9 +1,9 @@
-import type { Card, CardsData } from './interfaces.js';
+import type { CardSummary, CardsIndex } from './interfaces.js';
 
 async function loadCards(): Promise<void> {
   try {
-    const response = await fetch('./db/cards.json');
-    const data: CardsData = await response.json();
+    const response = await fetch('./db/cards-index.json');
+    const data: CardsIndex = await response.json();
 
     displayTopRated(data.cards);
     displayRecapCards(data.cards);
@@ -14,7 +14,7 @@ async function loadCards(): Promise<void> {
   }
 }
 
-function setupSearch(cards: Card[]): void {
+function setupSearch(cards: CardSummary[]): void {
   const container = document.getElementById('search-container');
   const iconBtn = document.getElementById('search-icon-btn');
   const input = document.getElementById('mma-search') as HTMLInputElement | null;
@@ -122,7 +122,7 @@ function getRatingClass(rating: number): string {
   return 'poor';
 }
 
-function createCardHTML(card: Card, isPreview = false): string {
+function createCardHTML(card: CardSummary, isPreview = false): string {
   const isFightNight = card.title.toLowerCase().includes('fight night');
   const displayTitle = (isFightNight && card.subtitle) ? `${card.title}: ${card.subtitle}` : card.title;
 
@@ -152,7 +152,7 @@ function createCardHTML(card: Card, isPreview = false): string {
     </a>`;
 }
 
-function displayTopRated(cards: Card[]): void {
+function displayTopRated(cards: CardSummary[]): void {
   const topRated = [...cards]
     .filter(card => card.rating !== null && card.rating !== undefined)
     .sort((a, b) => b.rating! - a.rating!)
@@ -188,7 +188,7 @@ function displayTopRated(cards: Card[]): void {
   }
 }
 
-function displayRecapCards(cards: Card[]): void {
+function displayRecapCards(cards: CardSummary[]): void {
   const sortedCards = [...cards]
     .filter(card => card.recapUrl !== null && card.recapUrl !== undefined)
     .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime());
@@ -199,7 +199,7 @@ function displayRecapCards(cards: Card[]): void {
   }
 }
 
-function displayPreviewCards(cards: Card[]): void {
+function displayPreviewCards(cards: CardSummary[]): void {
   const sortedCards = [...cards]
     .filter(card => card.previewUrl !== null && card.previewUrl !== undefined)
     .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime());
@@ -1,4 +1,4 @@
-import type { Card, CardsData, FightEntry } from './interfaces.js';
+import type { Card, FightEntry } from './interfaces.js';
 
 interface PreviewRow {
   matchup: string;
@@ -17,10 +17,8 @@ async function loadPreviewHeader(): Promise<void> {
     const filename = pageUrl.split('/').pop() ?? '';
     const cardId = filename.replace('.html', '');
 
-    const response = await fetch('../cards.json');
-    const data: CardsData = await response.json();
-
-    const card = data.cards.find(c => c.id === cardId);
+    const response = await fetch(`../cards/${cardId}.json`);
+    const card: Card | undefined = response.ok ? await response.json() : undefined;
 
     if (card) {
       const titleElement = document.querySelector('h1');
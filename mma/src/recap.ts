@@ -1,4 +1,4 @@
-import type { Card, CardsData, FightEntry, Prediction } from './interfaces.js';
+import type { Card, FightEntry, Prediction } from './interfaces.js';
 
 interface BettingRow {
   matchup: string;
@@ -17,10 +17,8 @@ async function loadRecapHeader(): Promise<void> {
     const filename = pageUrl.split('/').pop() ?? '';
     const cardId = filename.replace('.html', '').toLowerCase().replace(/_/g, '-');
 
-    const response = await fetch('../cards.json');
-    const data: CardsData = await response.json();
-
-    const card = data.cards.find(c => c.id === cardId);
+    const response = await fetch(`../cards/${cardId}.json`);
+    const card: Card | undefined = response.ok ? await response.json() : undefined;
 
     if (card) {
       const titleElement = document.querySelector('h1');
@@ -0,0 +1,191 @@
+"""HttpCache on its own and behind Scraper: revalidation, TTL, LRU eviction, offline mode."""
+import datetime
+import os
+import threading
+
+import pytest
+
+from scraping import cache as cache_module
+from scraping.cache import CacheMiss
+from scraping.cache import HttpCache
+from scraping.ratelimit import RateLimiter
+from scraping.scraper import Scraper
+
+URL = 'https://example.com/page'
+PAGE = b'<html><body><table class="infobox"><tr><td>v1</td></tr></table><p>prose</p></body></html>'
+
+
+class _Response:
+    def __init__(self, status, content=b'', **headers):
+        self.status_code = status
+        self.content = content
+        self.headers = headers
+        self.elapsed = datetime.timedelta(0)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class _Session:
+    """Answers requests from a list of responses and keeps the request headers it saw."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+class _Clock:
+    """Stands in for the time module in cache.py."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+def _scraper(cache, session=None):
+    scraper = Scraper(cache=cache, parser='html.parser', rate_limiter=RateLimiter({'example.com': (1000.0, 100)}))
+    scraper._session_for = lambda url: session
+    return scraper
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'http')
+
+
+# ----------------------------------------------------------------------
+# Revalidation and TTL
+# ----------------------------------------------------------------------
+
+def test_304_reuses_the_cached_body(cache_dir):
+    cache = HttpCache(cache_dir, ttl=0)
+    session = _Session(
+        _Response(200, PAGE, ETag='"v1"', **{'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'}),
+        _Response(304),
+    )
+    scraper = _scraper(cache, session)
+
+    assert scraper._fetch_bytes(URL) == PAGE
+    fetched_at = cache.get(URL).fetched_at
+    assert scraper._fetch_bytes(URL) == PAGE
+
+    assert session.requests[1]['If-None-Match'] == '"v1"'
+    assert session.requests[1]['If-Modified-Since'] == 'Sat, 17 Oct 2026 10:00:00 GMT'
+    assert 'If-None-Match' not in session.requests[0]
+    assert cache.get(URL).body == PAGE
+    assert cache.get(URL).fetched_at >= fetched_at
+
+
+def test_changed_page_replaces_the_entry(cache_dir):
+    cache = HttpCache(cache_dir, ttl=0)
+    session = _Session(_Response(200, b'old', ETag='"v1"'), _Response(200, b'new', ETag='"v2"'))
+    scraper = _scraper(cache, session)
+
+    scraper._fetch_bytes(URL)
+
+    assert scraper._fetch_bytes(URL) == b'new'
+    assert cache.get(URL).etag == '"v2"'
+
+
+def test_fresh_entries_skip_the_network_until_the_ttl_passes(cache_dir, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    cache = HttpCache(cache_dir, ttl=60)
+    session = _Session(_Response(200, b'v1', ETag='"v1"'), _Response(304), _Response(304))
+    scraper = _scraper(cache, session)
+
+    scraper._fetch_bytes(URL)
+    clock.now += 59
+    assert scraper._fetch_bytes(URL) == b'v1'
+    assert len(session.requests) == 1
+
+    # fresh=True revalidates even within the TTL
+    scraper._fetch_bytes(URL, fresh=True)
+    assert len(session.requests) == 2
+
+    clock.now += 61
+    assert not cache.get(URL).is_fresh(cache.ttl)
+    assert scraper._fetch_bytes(URL) == b'v1'
+    assert len(session.requests) == 3
+
+
+# ----------------------------------------------------------------------
+# Eviction and concurrent writes
+# ----------------------------------------------------------------------
+
+def test_least_recently_used_entries_are_evicted(cache_dir):
+    cache = HttpCache(cache_dir, max_bytes=250)
+    for i, url in enumerate(('https://example.com/a', 'https://example.com/b')):
+        cache.put(url, b'x' * 100)
+        os.utime(cache._paths(url)[0], (1000 + i, 1000 + i))
+
+    # Reading /a makes /b the least recently used
+    assert cache.get('https://example.com/a') is not None
+    cache.put('https://example.com/c', b'x' * 100)
+
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a') is not None
+    assert cache.get('https://example.com/c') is not None
+
+
+def test_concurrent_writes_of_one_url(cache_dir):
+    cache = HttpCache(cache_dir)
+    errors = []
+
+    def store(n):
+        try:
+            for i in range(50):
+                cache.put(URL, f'{n}-{i}'.encode() * 100, etag=f'"{n}-{i}"')
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=store, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
+    assert cache.get(URL) is not None
+
+
+# ----------------------------------------------------------------------
+# Offline mode
+# ----------------------------------------------------------------------
+
+def test_offline_serves_stale_entries_and_misses_without_the_network(cache_dir):
+    HttpCache(cache_dir).put(URL, PAGE)
+    offline = HttpCache(cache_dir, ttl=0, offline=True)
+    scraper = _scraper(offline, _Session())
+
+    assert scraper._fetch_bytes(URL) == PAGE
+    with pytest.raises(CacheMiss):
+        scraper._fetch_bytes('https://example.com/other')
+
+
+def test_offline_region_fetch_falls_back_to_the_full_page(cache_dir):
+    HttpCache(cache_dir).put(URL, PAGE)
+    scraper = _scraper(HttpCache(cache_dir, offline=True), _Session())
+
+    soup = scraper.fetch(URL, regions='table.infobox')
+
+    assert soup.find('table', class_='infobox').get_text() == 'v1'
+    assert soup.find('p') is None
+
+
+def test_offline_region_fetch_prefers_a_driver_runs_extract(cache_dir):
+    cache = HttpCache(cache_dir)
+    cache.put(URL, PAGE)
+    cache.put(f'{URL} [table.infobox]', b'<table class="infobox"><tr><td>extract</td></tr></table>')
+    scraper = _scraper(HttpCache(cache_dir, offline=True), _Session())
+
+    assert scraper.fetch(URL, regions='table.infobox').find('td').get_text() == 'extract'
+    assert scraper._fetch_bytes(URL, via_driver=False) == PAGE
@@ -0,0 +1,111 @@
+"""Concurrent cards.json writers: three-way merges, the lock, and site data publishing."""
+import json
+
+import pytest
+
+from scraping.card_store import CardStore
+from scraping.card_store import CardsLock
+from scraping.card_store import merge_cards
+from scraping.site_data import write_site_data
+
+
+def _card(card_id, date, **fields):
+    card = {
+        'id': card_id, 'title': card_id.upper(), 'subtitle': None, 'date': date, 'rating': None,
+        'poster': None, 'recapUrl': None, 'previewUrl': None, 'location': None, 'eventTime': None,
+        'fights': {'A vs. B': {'prediction': {'winner': 'A', 'method': 'KO/TKO'}, 'result': None}},
+    }
+    card.update(fields)
+    return card
+
+
+@pytest.fixture
+def cards_path(tmp_path):
+    path = tmp_path / 'cards.json'
+    path.write_text(json.dumps({'cards': [_card('ufc-2', '2026-02-01'), _card('ufc-1', '2026-01-01')]}, indent=2))
+    return str(path)
+
+
+def _read(path):
+    with open(path) as f:
+        return {card['id']: card for card in json.load(f)['cards']}
+
+
+def test_merge_keeps_changes_made_on_one_side():
+    base = [_card('ufc-1', '2026-01-01')]
+    ours = [_card('ufc-1', '2026-01-01', rating=8.0)]
+    theirs = [_card('ufc-1', '2026-01-01')]
+    theirs[0]['fights']['A vs. B']['result'] = {'winner': 'A', 'method': 'KO'}
+
+    merged, conflicts = merge_cards(base, ours, theirs)
+
+    assert conflicts == []
+    assert merged[0]['rating'] == 8.0
+    assert merged[0]['fights']['A vs. B']['result'] == {'winner': 'A', 'method': 'KO'}
+
+
+def test_merge_conflict_keeps_ours_and_reports_the_path():
+    base = [_card('ufc-1', '2026-01-01')]
+    ours = [_card('ufc-1', '2026-01-01')]
+    theirs = [_card('ufc-1', '2026-01-01')]
+    ours[0]['fights']['A vs. B']['prediction'] = {'winner': 'A', 'method': 'Decision'}
+    theirs[0]['fights']['A vs. B']['prediction'] = {'winner': 'B', 'method': 'Submission'}
+
+    merged, conflicts = merge_cards(base, ours, theirs)
+
+    assert conflicts == ['ufc-1/fights/A vs. B/prediction']
+    assert merged[0]['fights']['A vs. B']['prediction'] == {'winner': 'A', 'method': 'Decision'}
+
+
+def test_stale_store_merges_a_card_edited_by_another_store(cards_path):
+    stale = CardStore(cards_path)
+    other = CardStore(cards_path)
+    other.upsert('ufc-1', {'rating': 7.5})
+    assert other.save()
+
+    # stale was read before other saved; its own edit is to a different card
+    stale.upsert('ufc-2', {'location': 'Las Vegas'})
+    assert stale.save()
+
+    cards = _read(cards_path)
+    assert cards['ufc-1']['rating'] == 7.5
+    assert cards['ufc-2']['location'] == 'Las Vegas'
+
+
+def test_stale_store_wins_a_true_conflict_and_warns(cards_path, capsys):
+    stale = CardStore(cards_path)
+    other = CardStore(cards_path)
+    other.upsert('ufc-1', {'rating': 7.5})
+    other.save()
+
+    stale.upsert('ufc-1', {'rating': 9.0})
+    stale.save()
+
+    assert _read(cards_path)['ufc-1']['rating'] == 9.0
+    assert 'ufc-1/rating' in capsys.readouterr().out
+
+
+def test_site_data_from_a_stale_store_includes_newer_saves(cards_path, tmp_path):
+    index_path, shard_dir = str(tmp_path / 'cards-index.json'), str(tmp_path / 'cards')
+    stale = CardStore(cards_path)
+    other = CardStore(cards_path)
+    other.upsert('ufc-1', {'rating': 7.5})
+    other.save()
+
+    write_site_data(stale, ['ufc-2'], index_path, shard_dir)
+
+    with open(index_path) as f:
+        index = {card['id']: card for card in json.load(f)['cards']}
+    assert index['ufc-1']['rating'] == 7.5
+
+
+def test_lock_is_reentrant_and_excludes_other_holders(cards_path):
+    lock = CardsLock(cards_path)
+    with lock:
+        with lock:
+            pass
+        with pytest.raises(TimeoutError):
+            with CardsLock(cards_path, timeout=0.05):
+                pass
+    with CardsLock(cards_path, timeout=0.05):
+        pass
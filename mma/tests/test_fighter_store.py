@@ -0,0 +1,22 @@
+"""FighterStore bulk lookups."""
+import sqlite3
+
+from scraping.fighter_store import FighterStore
+from scraping.models import FighterProfile
+
+
+def test_find_chunks_lookups_past_the_parameter_limit(tmp_path):
+    store = FighterStore(str(tmp_path / 'fighters.sqlite3'))
+    # SQLite builds before 3.32 allow 999 parameters per statement
+    store._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    profiles = [FighterProfile(f'Fighter {i:04d}', f'https://example.com/f/{i}') for i in range(2500)]
+    store.put_many(profiles, 'wikipedia')
+
+    names = [p.name for p in profiles[:2000]] + ['Nobody Stored']
+    found = store.find(names=names, source='wikipedia')
+    assert [s.profile.name for s in found] == [p.name for p in profiles[:2000]]
+
+    urls = [p.profile_url for p in profiles[1000:]]
+    assert len(store.find(names=names[:1200], urls=urls)) == 2500
+    assert len(store.get_many(urls)) == 1500
+    store.close()
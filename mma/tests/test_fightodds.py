@@ -0,0 +1,36 @@
+"""fightodds.io responses: resolving sportsbooks to registry IDs."""
+from scraping.fightodds import _parse_offers
+
+
+def _offer(book, odds1, odds2):
+    return {'node': {'sportsbook': {'shortName': book}, 'outcome1': {'odds': odds1}, 'outcome2': {'odds': odds2}}}
+
+
+def _table(*offers):
+    bout = {
+        'fighter1': {'firstName': 'Alex', 'lastName': 'Pereira'},
+        'fighter2': {'firstName': 'Jiri', 'lastName': 'Prochazka'},
+        'straightOffers': {'edges': list(offers)},
+    }
+    return {'fightOffers': {'edges': [{'node': bout}]}}
+
+
+def test_books_resolve_to_registry_ids_through_aliases():
+    quotes = _parse_offers(_table(_offer('BookMaker', -150, 130), _offer('HardRocketBet', -145, 125)), 1)
+
+    assert len(quotes) == 1
+    assert quotes[0].odds.books == [6, 13]
+    assert quotes[0].odds.odds1 == [-150, -145]
+    assert quotes[0].odds.odds2 == [130, 125]
+
+
+def test_unknown_books_are_skipped_with_a_warning(capsys):
+    table = _table(_offer('Pinnacle', -150, 130), _offer('NewBook', -140, 120), _offer('OtherBook', -160, 140))
+
+    quotes = _parse_offers(table, 1)
+
+    assert quotes[0].odds.books == [18]
+    assert quotes[0].odds.odds1 == [-150]
+    out = capsys.readouterr().out
+    assert "skipped 2 quotes" in out
+    assert "'NewBook', 'OtherBook'" in out
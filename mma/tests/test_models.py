@@ -0,0 +1,98 @@
+"""The cards.json schema boundary: models read and write it unchanged, and reject what it does not allow."""
+import os
+import re
+
+import pytest
+
+from scraping import codec
+from scraping.card_store import dump_cards_json
+from scraping.models import ABSENT
+from scraping.models import Card
+from scraping.models import CardFight
+from scraping.models import ModelError
+from scraping.models import OddsTable
+
+MATCHUP = 'Alex Pereira vs. Jiri Prochazka'
+CARDS_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'db', 'cards.json')
+
+
+def _card(**fields):
+    card = {
+        'id': 'ufc-1', 'title': 'UFC 1', 'subtitle': None, 'date': '2026-01-01', 'rating': None,
+        'poster': None, 'recapUrl': None, 'previewUrl': None, 'location': None, 'eventTime': None,
+        'fights': {MATCHUP: {'prediction': None, 'result': None}},
+    }
+    card.update(fields)
+    return card
+
+
+def test_cards_json_round_trips_byte_for_byte():
+    with open(CARDS_JSON, 'rb') as f:
+        raw = f.read()
+    text = raw.decode('utf-8')
+    document = codec.loads(raw)
+
+    document['cards'] = [Card.from_json(card).to_json() for card in document['cards']]
+
+    assert dump_cards_json(document, text.endswith('\n')) == text
+
+
+def test_missing_key_names_its_path():
+    card = _card()
+    del card['fights'][MATCHUP]['result']
+
+    with pytest.raises(ModelError, match=rf"^card/ufc-1/fights/{re.escape(MATCHUP)}: missing 'result'$"):
+        Card.from_json(card)
+    with pytest.raises(ModelError, match=r"^card: missing 'eventTime'$"):
+        Card.from_json({key: value for key, value in _card().items() if key != 'eventTime'})
+
+
+def test_unknown_key_names_its_path():
+    prediction = {'winner': 'Alex Pereira', 'method': 'KO/TKO', 'note': 'x'}
+    fights = {MATCHUP: {'prediction': prediction, 'result': None}}
+
+    with pytest.raises(ModelError, match=rf"^card/ufc-1/fights/{re.escape(MATCHUP)}/prediction: unknown key 'note'$"):
+        Card.from_json(_card(fights=fights))
+    with pytest.raises(ModelError, match=r"^card: unknown key 'venue'$"):
+        Card.from_json(_card(venue='T-Mobile Arena'))
+
+
+def test_optional_keys_stay_absent():
+    card = _card()
+    del card['fights']
+
+    model = Card.from_json(card)
+
+    assert model.fights is ABSENT
+    assert model.to_json() == card
+
+
+def test_legacy_book_keyed_odds_convert_to_columns():
+    fight = {
+        'prediction': None,
+        'result': None,
+        'odds': {
+            'BookMaker': {'Alex Pereira': -150, 'Jiri Prochazka': 130},
+            'Pinnacle': {'Jiri Prochazka': 125, 'Alex Pereira': -145},
+            # One name spelt differently: the other value goes to the other fighter
+            'HardRocketBet': {'Alex Pereira': -160, 'Jiří Procházka': 135},
+            # About another bout altogether
+            'DraftKings': {'Someone Else': -200, 'Another Fighter': 170},
+        },
+    }
+
+    model = CardFight.from_json(fight, matchup=MATCHUP)
+
+    assert model.odds.to_json() == {'books': [6, 18, 13], 'odds1': [-150, -145, -160], 'odds2': [130, 125, 135]}
+    assert model.to_json()['odds'] == model.odds.to_json()
+    by_book = model.odds.by_book('Alex Pereira', 'Jiri Prochazka')
+    assert by_book['Bookmaker'] == {'Alex Pereira': -150, 'Jiri Prochazka': 130}
+
+
+def test_unknown_sportsbooks_are_rejected():
+    fight = {'prediction': None, 'result': None, 'odds': {'NewBook': {'A': -110, 'B': -110}}}
+
+    with pytest.raises(ModelError, match=r"^fight/odds: unknown sportsbook 'NewBook'"):
+        CardFight.from_json(fight, matchup='A vs. B')
+    with pytest.raises(ModelError, match=r'^odds: unknown sportsbook ID 999$'):
+        OddsTable.from_json({'books': [18, 999], 'odds1': [-110, -110], 'odds2': [-110, -110]})
@@ -0,0 +1,62 @@
+"""Parser backends and targeted parsing: every combination reads the corpus as html.parser does."""
+import gzip
+import os
+
+import pytest
+
+from scraping import scraper
+from scraping import sherdog
+from scraping import wikipedia
+
+CORPUS_DIR = os.path.join(os.path.dirname(scraper.__file__), 'corpus')
+
+_ws = wikipedia.WikipediaEventScraper(None)
+_ss = sherdog.SherdogEventScraper(None)
+
+# corpus kind → (regions the scraper builds, what it reads from the tree)
+_PARSERS = {
+    'wikipedia_event': (
+        wikipedia._EVENT_REGIONS,
+        lambda soup: _ws._parse_fights(wikipedia._PageIndex(soup), mode='recap', research=False),
+    ),
+    'wikipedia_fighter': (
+        wikipedia._FIGHTER_REGIONS,
+        lambda soup: _ws._parse_fighter_profile(wikipedia._PageIndex(soup)),
+    ),
+    'sherdog_event': (None, lambda soup: _ss._parse_event(soup, 'recap')),
+    'sherdog_fighter': (
+        sherdog._FIGHTER_REGIONS,
+        lambda soup: (_ss._parse_record(soup), _ss._parse_fight_table(soup)),
+    ),
+}
+
+_BACKENDS = [
+    'html.parser',
+    pytest.param('lxml', marks=pytest.mark.skipif(not scraper._HAS_LXML, reason='lxml is not installed')),
+    pytest.param(
+        'selectolax', marks=pytest.mark.skipif(not scraper._HAS_SELECTOLAX, reason='selectolax is not installed'),
+    ),
+]
+
+
+def _pages():
+    return [
+        pytest.param(kind, os.path.join(CORPUS_DIR, kind, name), id=f'{kind}/{name.split(".", 1)[0]}')
+        for kind in sorted(_PARSERS)
+        for name in sorted(os.listdir(os.path.join(CORPUS_DIR, kind)))
+    ]
+
+
+@pytest.mark.parametrize('targeted', [True, False], ids=['targeted', 'full'])
+@pytest.mark.parametrize('backend', _BACKENDS)
+@pytest.mark.parametrize('kind, path', _pages())
+def test_backend_matches_html_parser(kind, path, backend, targeted):
+    regions, parse = _PARSERS[kind]
+    with gzip.open(path, 'rb') as f:
+        markup = f.read()
+
+    baseline = parse(scraper.parse_html(markup, 'html.parser'))
+    result = parse(scraper.parse_html(markup, backend, regions if targeted else None))
+
+    assert baseline
+    assert result == baseline
@@ -0,0 +1,89 @@
+"""Incremental research: fighters whose page revision is unchanged are not refetched."""
+from types import SimpleNamespace
+
+import pytest
+
+from scraping import research
+from scraping.event_scraper import EventScraper
+from scraping.fighter_store import FighterStore
+from scraping.models import Bout
+from scraping.models import FighterProfile
+from scraping.models import RecentFight
+
+EVENT_URL = 'https://en.wikipedia.org/wiki/UFC_329'
+FIGHTERS = [
+    ('Alex Pereira', 'https://en.wikipedia.org/wiki/Alex_Pereira'),
+    ('Jiri Prochazka', 'https://en.wikipedia.org/wiki/Ji%C5%99%C3%AD_Proch%C3%A1zka'),
+    ('Kai Asakura', None),
+    ('Tatsuro Taira', 'https://en.wikipedia.org/wiki/Tatsuro_Taira'),
+]
+
+
+class _FakeScraper(EventScraper):
+    """Serves one card; revisions are set by the test and every profile fetch is recorded."""
+
+    source = 'wikipedia'
+
+    def __init__(self, revisions):
+        self.revisions = revisions
+        self.fetched = []
+
+    def scrape_event(self, url, mode='both'):
+        raise NotImplementedError
+
+    def scrape_event_research(self, url):
+        (n1, u1), (n2, u2), (n3, u3), (n4, u4) = FIGHTERS
+        return 'UFC 329', [
+            Bout(n1, u1, n2, u2, 'Light Heavyweight', 'Main Card'),
+            Bout(n3, u3, n4, u4, 'Flyweight', 'Main Card'),
+        ]
+
+    def scrape_fighter(self, name, url):
+        self.fetched.append(name)
+        return FighterProfile(name, url, '10-1-0', '2 Win', [RecentFight('Win', 'Someone', 'KO', 'June 1, 2026')])
+
+    def fighter_revisions(self, urls):
+        return {url: self.revisions[url] for url in urls if url in self.revisions}
+
+
+def _args(**fields):
+    return SimpleNamespace(url=EVENT_URL, **fields)
+
+
+@pytest.fixture
+def revisions(tmp_path, monkeypatch):
+    # research writes to ./mma/notes
+    monkeypatch.chdir(tmp_path)
+    return {url: 100 + i for i, (_, url) in enumerate(FIGHTERS) if url}
+
+
+def test_unchanged_revisions_skip_the_fetch(revisions):
+    first = _FakeScraper(revisions)
+    research.run(_args(), first)
+    assert first.fetched == [name for name, _ in FIGHTERS]
+
+    again = _FakeScraper(revisions)
+    research.run(_args(), again)
+    # Only the fighter without a page (no revision to compare) is rebuilt
+    assert again.fetched == ['Kai Asakura']
+
+    changed = _FakeScraper({**revisions, FIGHTERS[3][1]: 999})
+    research.run(_args(), changed)
+    assert changed.fetched == ['Kai Asakura', 'Tatsuro Taira']
+
+    refresh = _FakeScraper(revisions)
+    research.run(_args(full_refresh=True), refresh)
+    assert refresh.fetched == [name for name, _ in FIGHTERS]
+
+
+def test_store_reuses_profiles_at_their_revision(revisions, tmp_path):
+    store = FighterStore(str(tmp_path / 'fighters.sqlite3'))
+    research.run(_args(), _FakeScraper(revisions), store)
+
+    # No notes for the card this time: the store alone knows the profiles are current
+    (tmp_path / 'mma' / 'notes' / 'ufc-329.json').unlink()
+    again = _FakeScraper(revisions)
+    research.run(_args(), again, store)
+
+    assert again.fetched == ['Kai Asakura']
+    store.close()
@@ -0,0 +1,178 @@
+"""Resilience.call: retries, backoff and the per-host circuit breaker, on a fake clock."""
+from types import SimpleNamespace
+
+import pytest
+
+from scraping import resilience
+from scraping.resilience import CircuitOpenError
+from scraping.resilience import Resilience
+from scraping.resilience import RetryPolicy
+
+URL = 'https://example.com/page'
+
+
+class _Clock:
+    """Stands in for the time module: sleep() advances monotonic() instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resilience, 'time', clock)
+    return clock
+
+
+def _response(status, **headers):
+    return SimpleNamespace(status_code=status, headers=headers)
+
+
+def _send(*outcomes):
+    """send() returning (or raising) outcomes in turn; .calls counts the attempts."""
+    remaining = list(outcomes)
+
+    def send():
+        send.calls += 1
+        outcome = remaining.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+    send.calls = 0
+    return send
+
+
+def _resilience(max_attempts=4, failure_threshold=5, reset_timeout=60.0):
+    return Resilience(RetryPolicy(max_attempts, base_delay=1.0, max_delay=30.0), failure_threshold, reset_timeout)
+
+
+# ----------------------------------------------------------------------
+# Retries
+# ----------------------------------------------------------------------
+
+def test_retryable_statuses_are_retried_with_retry_after_as_a_floor(clock):
+    send = _send(_response(503), _response(429, **{'Retry-After': '7'}), _response(200))
+
+    result = _resilience().call(URL, send)
+
+    assert result.status_code == 200
+    assert send.calls == 3
+    assert len(clock.sleeps) == 2
+    assert clock.sleeps[0] <= 1.0
+    assert clock.sleeps[1] >= 7.0
+
+
+def test_final_retryable_response_is_returned(clock):
+    send = _send(*[_response(502)] * 3)
+
+    result = _resilience(max_attempts=3).call(URL, send)
+
+    assert result.status_code == 502
+    assert send.calls == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_oserror_is_retried_and_the_last_one_reraised(clock):
+    send = _send(ConnectionError('reset'), _response(200))
+    assert _resilience().call(URL, send).status_code == 200
+    assert send.calls == 2
+
+    send = _send(*[TimeoutError(f'attempt {i}') for i in range(3)])
+    with pytest.raises(TimeoutError, match='attempt 2'):
+        _resilience(max_attempts=3).call(URL, send)
+    assert send.calls == 3
+
+
+def test_other_exceptions_are_not_retried(clock):
+    send = _send(ValueError('bad payload'), _response(200))
+
+    with pytest.raises(ValueError):
+        _resilience().call(URL, send)
+    assert send.calls == 1
+    assert clock.sleeps == []
+
+
+def test_retry_if_retries_unusable_results_without_tripping_the_breaker(clock):
+    policy = _resilience(max_attempts=3, failure_threshold=1)
+    send = _send(_response(200, body='empty'), _response(200, body='empty'), _response(200, body='ok'))
+
+    result = policy.call(URL, send, retry_if=lambda r: r.headers['body'] == 'empty')
+
+    assert result.headers['body'] == 'ok'
+    assert send.calls == 3
+    assert policy.call(URL, _send(_response(200))).status_code == 200
+
+
+# ----------------------------------------------------------------------
+# Circuit breaker
+# ----------------------------------------------------------------------
+
+def test_circuit_opens_then_half_opens_then_closes(clock):
+    policy = _resilience(max_attempts=1, failure_threshold=2, reset_timeout=60.0)
+    for _ in range(2):
+        policy.call(URL, _send(_response(503)))
+
+    # Open: fail fast without sending
+    send = _send(_response(200))
+    with pytest.raises(CircuitOpenError):
+        policy.call(URL, send)
+    assert send.calls == 0
+    # Other hosts have their own breaker
+    assert policy.call('https://other.example/', _send(_response(200))).status_code == 200
+
+    # Half-open once the reset timeout has passed: one trial goes through and closes the circuit
+    clock.now += 61.0
+    assert policy.call(URL, send).status_code == 200
+    assert send.calls == 1
+    assert policy.call(URL, _send(_response(200))).status_code == 200
+
+
+def test_half_open_allows_a_single_trial(clock):
+    policy = _resilience(max_attempts=1, failure_threshold=1, reset_timeout=60.0)
+    policy.call(URL, _send(_response(503)))
+    clock.now += 61.0
+
+    def send():
+        # While the trial is in flight, other calls to the host still fail fast
+        with pytest.raises(CircuitOpenError):
+            policy.call(URL, _send(_response(200)))
+        return _response(200)
+
+    assert policy.call(URL, send).status_code == 200
+
+
+def test_failed_half_open_trial_returns_its_response_and_reopens(clock):
+    policy = _resilience(max_attempts=4, failure_threshold=2, reset_timeout=60.0)
+    policy.call(URL, _send(_response(503), _response(503)))
+    clock.now += 61.0
+    clock.sleeps.clear()
+
+    # The trial fails: the call ends with that response, not CircuitOpenError, and does not back off
+    send = _send(_response(503), _response(200))
+    result = policy.call(URL, send)
+
+    assert result.status_code == 503
+    assert send.calls == 1
+    assert clock.sleeps == []
+    with pytest.raises(CircuitOpenError):
+        policy.call(URL, send)
+
+
+def test_failed_half_open_trial_reraises_its_exception(clock):
+    policy = _resilience(max_attempts=4, failure_threshold=1, reset_timeout=60.0)
+    policy.call(URL, _send(_response(503)))
+    clock.now += 61.0
+
+    send = _send(ConnectionError('refused'), _response(200))
+    with pytest.raises(ConnectionError):
+        policy.call(URL, send)
+    assert send.calls == 1
@@ -0,0 +1,103 @@
+"""--wiki-api mode against a local stand-in for Wikipedia: the parse API gives the same models as the pages."""
+import gzip
+import http.server
+import json
+import os
+import threading
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+import pytest
+
+from scraping import scraper
+from scraping.ratelimit import RateLimiter
+from scraping.resilience import Resilience
+from scraping.resilience import RetryPolicy
+from scraping.scraper import Scraper
+from scraping.wikipedia import WikipediaEventScraper
+
+CORPUS_DIR = os.path.join(os.path.dirname(scraper.__file__), 'corpus')
+# action=parse payloads (prop=sections, and prop=text for the sections the scraper asks for),
+# cut from the corpus pages below
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'wikipedia_api')
+
+# Article title → the corpus page served as its rendered article
+_PAGES = {
+    'Cody_Gibson': 'wikipedia_fighter/Cody_Gibson.html.gz',
+    'UFC_Fight_Night_du_Plessis_vs._Usman': 'wikipedia_event/ufc-fight-night-plessis-usman.html.gz',
+}
+
+
+class _WikipediaHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path.startswith('/wiki/'):
+            with gzip.open(os.path.join(CORPUS_DIR, _PAGES[unquote(parts.path[len('/wiki/'):])]), 'rb') as f:
+                self._send(f.read(), 'text/html; charset=UTF-8')
+        elif parts.path == '/w/api.php':
+            query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            with open(os.path.join(API_DIR, f'{query["page"].replace(" ", "_")}.json'), encoding='utf-8') as f:
+                recorded = json.load(f)
+            self.server.api_requests.append(query)
+            payload = recorded['sections'] if query['prop'] == 'sections' else recorded['text'][query['section']]
+            self._send(json.dumps(payload).encode('utf-8'), 'application/json; charset=utf-8')
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def wiki():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _WikipediaHandler)
+    server.api_requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _wikipedia(use_api: bool) -> WikipediaEventScraper:
+    http_scraper = Scraper(
+        rate_limiter=RateLimiter({'127.0.0.1': (1000.0, 100)}),
+        resilience=Resilience(RetryPolicy(max_attempts=1)),
+    )
+    return WikipediaEventScraper(http_scraper, use_api=use_api)
+
+
+def _url(server, title: str) -> str:
+    return f'http://127.0.0.1:{server.server_port}/wiki/{title}'
+
+
+def test_fighter_from_api_matches_page(wiki):
+    url = _url(wiki, 'Cody_Gibson')
+
+    from_page = _wikipedia(use_api=False).scrape_fighter('Cody Gibson', url)
+    from_api = _wikipedia(use_api=True).scrape_fighter('Cody Gibson', url)
+
+    assert from_page.recent_fights
+    assert from_api == from_page
+    assert [q['prop'] for q in wiki.api_requests] == ['sections', 'text']
+
+
+def test_event_from_api_matches_page(wiki):
+    url = _url(wiki, 'UFC_Fight_Night_du_Plessis_vs._Usman')
+
+    from_page = _wikipedia(use_api=False).scrape_event(url, mode='recap')
+    from_api = _wikipedia(use_api=True).scrape_event(url, mode='recap')
+
+    assert from_page.fights
+    assert from_api == from_page
+    assert sorted(q.get('section', '') for q in wiki.api_requests) == ['', '0', '2']